@@ -0,0 +1,96 @@
+"""
+Benchmark company extraction throughput.
+
+Builds a synthetic universe of N companies and a batch of articles, then
+compares the per-call path (headline and summary scanned separately, one
+article at a time) with ``extract_companies_batch`` inline and on a process
+pool. No database is needed.
+
+    python benchmarks/bench_company_parser.py --companies 10000 --articles 20000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.company_parser_service import CompanyParserService
+
+WORDS = ("shares", "rose", "after", "earnings", "beat", "guidance", "the", "market",
+         "investors", "said", "quarter", "revenue", "analysts", "deal", "report")
+
+
+def build_parser(companies: int, workers: int) -> CompanyParserService:
+    rng = random.Random(1)
+    parser = CompanyParserService(db=None, workers=workers, parallel_threshold=0)
+    for i in range(companies):
+        name = " ".join(
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))).title()
+            for _ in range(rng.randint(1, 3))
+        )
+        ticker = f"T{i:05d}"
+        parser.processor.add_keyword(name, ticker)
+        parser.processor.add_keyword(ticker, ticker)
+    return parser
+
+
+def build_articles(parser: CompanyParserService, articles: int):
+    rng = random.Random(2)
+    keywords = list(parser.processor.get_all_keywords())
+    items = []
+    for _ in range(articles):
+        def sentence(words: int, mentions: int) -> str:
+            tokens = rng.choices(WORDS, k=words) + rng.sample(keywords, mentions)
+            rng.shuffle(tokens)
+            return " ".join(tokens)
+        items.append({"headline": sentence(10, 1), "summary": sentence(60, 2)})
+    return items
+
+
+def per_call(parser: CompanyParserService, articles) -> None:
+    for a in articles:
+        companies = set()
+        companies |= set(parser.extract_companies(a["headline"]))
+        companies |= set(parser.extract_companies(a["summary"]))
+
+
+def main():
+    parser_args = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser_args.add_argument("--companies", type=int, default=10_000)
+    parser_args.add_argument("--articles", type=int, default=20_000)
+    parser_args.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser_args.parse_args()
+
+    parser = build_parser(args.companies, args.workers)
+    articles = build_articles(parser, args.articles)
+    texts = [f"{a['headline']}\n{a['summary']}" for a in articles]
+
+    def timed(fn):
+        started = time.perf_counter()
+        fn()
+        return args.articles / (time.perf_counter() - started)
+
+    # Warm the pool first so process start-up is not counted.
+    asyncio.run(parser.extract_companies_batch_async(texts[:args.workers * 4]))
+    results = [
+        ("per-call", timed(lambda: per_call(parser, articles))),
+        ("batch", timed(lambda: parser.extract_companies_batch(texts))),
+        (f"pool x{args.workers}",
+         timed(lambda: asyncio.run(parser.extract_companies_batch_async(texts)))),
+    ]
+    parser.close()
+
+    print(f"{args.companies} companies, {args.articles} articles")
+    print(f"{'path':<10} {'articles/s':>12}")
+    for name, rate in results:
+        print(f"{name:<10} {rate:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
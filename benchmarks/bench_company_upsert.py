@@ -0,0 +1,94 @@
+"""
+Benchmark CompanyRepository bulk seeding against SQL Server.
+
+Compares the old per-row ``IF NOT EXISTS ... INSERT`` loop with the staged
+``fast_executemany`` + MERGE path at each size. Needs the SQL_* settings from
+.env and writes to the Companies table, so point it at a scratch database.
+Benchmark rows are named ``__bench__ ...`` and deleted afterwards.
+
+    python benchmarks/bench_company_upsert.py --rows 10000 100000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+from src.datalayer.connection import Database
+from src.datalayer.company_repository import CompanyRepository, INSERT_IF_MISSING
+
+PREFIX = "__bench__"
+
+
+def per_row_insert(db: Database, companies):
+    with db.acquire() as conn, conn.cursor() as cursor:
+        for name, ticker in companies.items():
+            cursor.execute(INSERT_IF_MISSING, (name, name, ticker))
+        conn.commit()
+
+
+async def clean(repo: CompanyRepository):
+    await repo.execute("DELETE FROM Companies WHERE company_name LIKE ?", (f"{PREFIX}%",))
+
+
+async def bench(db: Database, rows: int, skip_per_row: bool):
+    repo = CompanyRepository(db)
+    companies = {f"{PREFIX} Company {i}": f"B{i}" for i in range(rows)}
+    changed = {name: ticker + "X" for name, ticker in list(companies.items())[: rows // 10]}
+    results = {}
+
+    if not skip_per_row:
+        await clean(repo)
+        started = time.perf_counter()
+        await db.run(per_row_insert, db, companies)
+        results["per-row insert"] = (time.perf_counter() - started, rows, None)
+
+    await clean(repo)
+    started = time.perf_counter()
+    counts = await repo.bulk_upsert(companies)
+    results["bulk upsert (new)"] = (time.perf_counter() - started, rows, counts)
+
+    started = time.perf_counter()
+    counts = await repo.bulk_upsert(changed)
+    results["bulk upsert (10% changed)"] = (
+        time.perf_counter() - started, len(changed), counts
+    )
+
+    await clean(repo)
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--skip-per-row", action="store_true",
+                        help="Skip the slow per-row baseline")
+    args = parser.parse_args()
+
+    load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent / ".env")
+    db = Database(
+        server=os.getenv("SQL_SERVER"),
+        database=os.getenv("SQL_DATABASE"),
+        username=os.getenv("SQL_USERNAME"),
+        password=os.getenv("SQL_PASSWORD"),
+        pool_size=1,
+    )
+    try:
+        print(f"{'rows':>7} {'path':<26} {'seconds':>8} {'rows/s':>9} counts")
+        for rows in args.rows:
+            for name, (seconds, staged, counts) in (
+                await bench(db, rows, args.skip_per_row)
+            ).items():
+                print(f"{rows:>7} {name:<26} {seconds:>8.2f} "
+                      f"{staged / seconds:>9.0f} {counts or ''}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
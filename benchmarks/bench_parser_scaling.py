@@ -0,0 +1,110 @@
+"""
+Benchmark the company parser as the universe grows.
+
+For each size, writes a synthetic symbol master (CSV, one alias per company),
+streams it through ``load_symbol_master`` into a CompanyParserService and
+reports keyword count, memory held by the keyword trie, build time and
+extraction throughput. No database is needed.
+
+    python benchmarks/bench_parser_scaling.py --keywords 1000 10000 100000
+"""
+
+import argparse
+import csv
+import asyncio
+import gc
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.datalayer.seed.symbol_master import load_symbol_master
+from src.services.company_parser_service import CompanyParserService
+
+WORDS = ("shares", "rose", "after", "earnings", "beat", "guidance", "the", "market",
+         "investors", "said", "quarter", "revenue", "analysts", "deal", "report")
+
+
+def write_symbol_master(path: Path, keywords: int):
+    """Write enough companies that name + alias + ticker give ``keywords`` keywords."""
+    rng = random.Random(keywords)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["ticker", "name", "aliases"])
+        for i in range(keywords // 3):
+            name = " ".join(
+                "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))).title()
+                for _ in range(rng.randint(1, 3))
+            )
+            writer.writerow([f"Q{i:06d}", f"{name} Holdings", name])
+
+
+def build(path: Path) -> CompanyParserService:
+    parser = CompanyParserService(db=None, workers=0)
+    asyncio.run(load_symbol_master(str(path), parser=parser))
+    return parser
+
+
+def articles(parser: CompanyParserService, count: int):
+    rng = random.Random(7)
+    keywords = list(parser.processor.get_all_keywords())
+    texts = []
+    for _ in range(count):
+        tokens = rng.choices(WORDS, k=70) + rng.sample(keywords, 3)
+        rng.shuffle(tokens)
+        texts.append(" ".join(tokens))
+    return texts
+
+
+def bench(keywords: int, article_count: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "symbols.csv"
+        write_symbol_master(path, keywords)
+
+        gc.collect()
+        started = time.perf_counter()
+        parser = build(path)
+        build_seconds = time.perf_counter() - started
+
+        # Measure memory in a second build, since tracemalloc slows allocation.
+        del parser
+        gc.collect()
+        tracemalloc.start()
+        parser = build(path)
+        memory, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    texts = articles(parser, article_count)
+    started = time.perf_counter()
+    parser.extract_companies_batch(texts)
+    extract_seconds = time.perf_counter() - started
+
+    return {
+        "keywords": len(parser.processor),
+        "memory_mb": memory / 1024 / 1024,
+        "peak_mb": peak / 1024 / 1024,
+        "build_s": build_seconds,
+        "articles_per_s": article_count / extract_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--keywords", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--articles", type=int, default=5_000)
+    args = parser.parse_args()
+
+    print(f"{'keywords':>9} {'trie MB':>8} {'peak MB':>8} {'build s':>8} {'articles/s':>11}")
+    for keywords in args.keywords:
+        r = bench(keywords, args.articles)
+        print(f"{r['keywords']:>9} {r['memory_mb']:>8.1f} {r['peak_mb']:>8.1f} "
+              f"{r['build_s']:>8.2f} {r['articles_per_s']:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
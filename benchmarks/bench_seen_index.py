@@ -0,0 +1,93 @@
+"""
+Benchmark the RedisCache seen indexes at scale.
+
+Loads N keys (default 1,000,000) into each seen mode against a live Redis
+(REDIS_HOST / REDIS_PORT / REDIS_DB) and reports memory footprint, insert
+throughput and batched lookup latency. The unbounded SET the cache used
+before is measured as a baseline.
+
+    python benchmarks/bench_seen_index.py --keys 1000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.cache.redis_cache import RedisCache
+
+
+def memory_usage(client, pattern: str) -> int:
+    total = 0
+    for key in client.scan_iter(match=pattern, count=1000):
+        total += client.memory_usage(key, samples=0) or 0
+    return total
+
+
+def bench_mode(mode: str, keys: int, batch: int, lookups: int):
+    namespace = f"bench_seen_{mode}"
+    if mode == "set":
+        cache = RedisCache(namespace=namespace)
+        client = cache.client
+        mark = lambda chunk: client.sadd(f"{namespace}:seen", *chunk)
+        check = lambda chunk: client.smismember(f"{namespace}:seen", chunk)
+    else:
+        cache = RedisCache(namespace=namespace, seen_mode=mode)
+        client = cache.client
+        mark = cache.mark_seen_many
+        check = cache.is_seen_many
+
+    for key in client.scan_iter(match=f"{namespace}:*"):
+        client.unlink(key)
+
+    started = time.perf_counter()
+    for start in range(0, keys, batch):
+        mark([f"news-{i}" for i in range(start, min(start + batch, keys))])
+    insert_seconds = time.perf_counter() - started
+
+    memory = memory_usage(client, f"{namespace}:*")
+
+    hits = [f"news-{i}" for i in range(0, keys, max(1, keys // batch))][:batch]
+    misses = [f"other-{i}" for i in range(batch)]
+    started = time.perf_counter()
+    false_positives = 0
+    for _ in range(lookups):
+        check(hits)
+        false_positives += sum(bool(v) for v in check(misses))
+    lookup_seconds = (time.perf_counter() - started) / (2 * lookups)
+
+    for key in client.scan_iter(match=f"{namespace}:*"):
+        client.unlink(key)
+
+    return {
+        "mode": mode,
+        "keys": keys,
+        "memory_mb": memory / 1024 / 1024,
+        "insert_keys_per_s": keys / insert_seconds,
+        "lookup_ms_per_batch": lookup_seconds * 1000,
+        "lookup_us_per_key": lookup_seconds * 1e6 / batch,
+        "false_positive_rate": false_positives / (lookups * batch),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--lookups", type=int, default=50)
+    parser.add_argument("--modes", nargs="+", default=["set", "zset", "bloom"])
+    args = parser.parse_args()
+
+    print(f"{'mode':<6} {'keys':>9} {'memory MB':>10} {'insert/s':>10} "
+          f"{'ms/batch':>9} {'us/key':>7} {'FP rate':>8}")
+    for mode in args.modes:
+        r = bench_mode(mode, args.keys, args.batch, args.lookups)
+        print(f"{r['mode']:<6} {r['keys']:>9} {r['memory_mb']:>10.1f} "
+              f"{r['insert_keys_per_s']:>10.0f} {r['lookup_ms_per_batch']:>9.2f} "
+              f"{r['lookup_us_per_key']:>7.2f} {r['false_positive_rate']:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
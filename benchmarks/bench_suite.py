@@ -0,0 +1,367 @@
+"""
+Micro-benchmark suite for the ingestion hot paths.
+
+Runs company extraction, NewsService.validate_news / validate_company, the
+Redis caches, repository calls and the upstream fetchers against synthetic
+corpora and the in-process stand-ins in ``benchmarks/fakes.py`` (fakeredis,
+a stub SQL Server, a local HTTP server), so no service needs to be running.
+
+Results are written as JSON (per benchmark: median, mean, p95 and min time
+per operation, plus ops/s) together with the commit they were measured on.
+Pass an earlier file to ``--compare`` to see the change per benchmark;
+``--fail-on-regression`` exits non-zero when any median got slower by more
+than ``--threshold``.
+
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --only parser news --compare benchmarks/results/<old>.json
+
+Redis timings measure our client code on top of fakeredis, not a Redis
+server; use bench_seen_index.py for server-side figures.
+"""
+
+import argparse
+import asyncio
+import inspect
+import itertools
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import fakes
+from src.api import finnhub_news_api, reddit_dd_api
+from src.api.http_client import close_http_client
+from src.cache.async_redis_cache import AsyncRedisCache
+from src.cache.local_cache import LocalCache
+from src.cache.redis_cache import RedisCache
+from src.datalayer.checkpoint_store import CheckpointStore
+from src.datalayer.company_repository import CompanyRepository
+from src.datalayer.data_checkpoint_repository import DataCheckpointRepository
+from src.services.news_service import NewsService
+
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+SIZES = {
+    # companies, articles per batch, cache keys per call, rounds
+    "full": {"companies": 10_000, "batch": 200, "keys": 100, "rounds": 30},
+    "quick": {"companies": 2_000, "batch": 50, "keys": 20, "rounds": 5},
+}
+
+
+def summarize(name: str, round_seconds: List[float], ops: int) -> Dict[str, Any]:
+    """Per-operation figures from the wall time of each round of ``ops`` operations."""
+    per_op = sorted(s / ops for s in round_seconds)
+    median = statistics.median(per_op)
+    return {
+        "name": name,
+        "rounds": len(per_op),
+        "ops_per_round": ops,
+        "median_us": median * 1e6,
+        "mean_us": statistics.fmean(per_op) * 1e6,
+        "p95_us": per_op[min(len(per_op) - 1, int(len(per_op) * 0.95))] * 1e6,
+        "min_us": per_op[0] * 1e6,
+        "ops_per_s": 1 / median if median else 0.0,
+    }
+
+
+async def measure(
+    name: str,
+    fn: Callable[[], Any],
+    rounds: int,
+    ops: int = 1,
+    warmup: int = 2,
+) -> Dict[str, Any]:
+    """Time ``fn`` (sync, or returning an awaitable) for ``warmup + rounds`` rounds."""
+    timings = []
+    for i in range(warmup + rounds):
+        started = time.perf_counter()
+        result = fn()
+        if inspect.isawaitable(result):
+            await result
+        elapsed = time.perf_counter() - started
+        if i >= warmup:
+            timings.append(elapsed)
+    return summarize(name, timings, ops)
+
+
+class Suite:
+    """Builds the fixtures once and runs the selected benchmarks."""
+
+    def __init__(self, size: Dict[str, int], db_latency: float = 0.0):
+        self.size = size
+        self.db_latency = db_latency
+        self.rounds = size["rounds"]
+        self.companies = fakes.company_universe(size["companies"])
+        self.parser = fakes.build_parser(self.companies)
+        self.articles = fakes.news_corpus(self.companies, size["batch"])
+        self.texts = [f"{a['headline']}\n{a['summary']}" for a in self.articles]
+        self._ids = itertools.count(1)
+
+    def _fresh_news(self) -> List[Dict[str, Any]]:
+        start = next(self._ids) * len(self.articles)
+        return [dict(a, id=start + i) for i, a in enumerate(self.articles)]
+
+    async def bench_parser(self) -> List[Dict[str, Any]]:
+        texts, rounds = self.texts, self.rounds
+
+        def per_text():
+            for text in texts:
+                self.parser.extract_companies(text)
+
+        return [
+            await measure("parser.extract_companies", per_text, rounds, len(texts)),
+            await measure(
+                "parser.extract_companies_batch",
+                lambda: self.parser.extract_companies_batch(texts),
+                rounds,
+                len(texts),
+            ),
+        ]
+
+    def _news_service(self, cache: AsyncRedisCache) -> NewsService:
+        return NewsService(
+            company_parser=self.parser,
+            db=None,
+            api_key="bench",
+            news_cache=cache,
+            company_cache=cache,
+            checkpoints=CheckpointStore(
+                DataCheckpointRepository(fakes.StubDatabase(latency=self.db_latency))
+            ),
+        )
+
+    async def bench_news(self) -> List[Dict[str, Any]]:
+        cache = AsyncRedisCache(
+            namespace="bench_news", local_cache=LocalCache(), pool=fakes.fake_redis_pool()
+        )
+        service = self._news_service(cache)
+        batch, rounds = len(self.articles), self.rounds
+        repeated = self._fresh_news()
+        await service.validate_news(repeated, last_seen_id=0)
+
+        return [
+            await measure(
+                "news.validate_news.new",
+                lambda: service.validate_news(self._fresh_news(), last_seen_id=0),
+                rounds,
+                batch,
+            ),
+            await measure(
+                "news.validate_news.seen",
+                lambda: service.validate_news(repeated, "finnhub_merger", 0),
+                rounds,
+                batch,
+            ),
+            await measure(
+                "news.validate_company",
+                lambda: service.validate_company([dict(a) for a in self.articles]),
+                rounds,
+                batch,
+            ),
+        ]
+
+    async def bench_redis(self) -> List[Dict[str, Any]]:
+        keys = [f"key-{i}" for i in range(self.size["keys"])]
+        values = {k: "v" * 64 for k in keys}
+        results = []
+        for label, local in (("redis", None), ("redis_l1", LocalCache())):
+            cache = AsyncRedisCache(
+                namespace=f"bench_{label}", local_cache=local, pool=fakes.fake_redis_pool()
+            )
+            await cache.set_many(values)
+            await cache.mark_seen_many(keys)
+            for op, call in (
+                ("get_many", lambda: cache.get_many(keys)),
+                ("set_many", lambda: cache.set_many(values, ex=3600)),
+                ("is_seen_many", lambda: cache.is_seen_many(keys)),
+                ("mark_seen_many", lambda: cache.mark_seen_many(keys)),
+            ):
+                results.append(
+                    await measure(f"{label}.{op}", call, self.rounds, len(keys))
+                )
+
+        # The synchronous client pings on construction; point it at fakeredis after.
+        logging.disable(logging.ERROR)
+        sync_cache = RedisCache(host="127.0.0.1", port=1, namespace="bench_sync")
+        logging.disable(logging.INFO)
+        sync_cache.client = fakes.fake_redis()
+        sync_cache.set_many(values)
+        results.append(
+            await measure(
+                "redis_sync.get_many",
+                lambda: sync_cache.get_many(keys),
+                self.rounds,
+                len(keys),
+            )
+        )
+        return results
+
+    async def bench_repository(self) -> List[Dict[str, Any]]:
+        db = fakes.StubDatabase(self.companies, latency=self.db_latency)
+        checkpoints = DataCheckpointRepository(db)
+        companies = CompanyRepository(db)
+        store = CheckpointStore(checkpoints)
+        rows = {f"source_{i}": str(i) for i in range(50)}
+        await checkpoints.update_many(rows)
+        try:
+            return [
+                await measure(
+                    "repo.checkpoint.get_last_id",
+                    lambda: checkpoints.get_last_id("source_1"),
+                    self.rounds,
+                ),
+                await measure(
+                    "repo.checkpoint.update_last_id",
+                    lambda: checkpoints.update_last_id("source_1", "2"),
+                    self.rounds,
+                ),
+                await measure(
+                    "repo.checkpoint.update_many",
+                    lambda: checkpoints.update_many(rows),
+                    self.rounds,
+                    len(rows),
+                ),
+                await measure(
+                    "repo.checkpoint_store.get_last_id",
+                    lambda: store.get_last_id("source_1"),
+                    self.rounds,
+                ),
+                await measure(
+                    "repo.company.get_all", companies.get_all, self.rounds
+                ),
+            ]
+        finally:
+            db.close()
+
+    async def bench_http(self) -> List[Dict[str, Any]]:
+        listing = fakes.reddit_listing(self.companies, 100)
+        upstream = fakes.FakeUpstream(self.articles, listing)
+        base = await upstream.start()
+        news_url, reddit_url = finnhub_news_api.BASE_URL, reddit_dd_api.SUBREDDIT_URL
+        finnhub_news_api.BASE_URL = f"{base}/api/v1/news"
+        reddit_dd_api.SUBREDDIT_URL = base + "/r/{subreddit}/{listing}.json"
+        try:
+            return [
+                await measure(
+                    "http.finnhub.fetch_news",
+                    lambda: finnhub_news_api.fetch_news("bench", max_items=None),
+                    self.rounds,
+                ),
+                await measure(
+                    "http.reddit.fetch_posts",
+                    lambda: reddit_dd_api.fetch_posts("wallstreetbets"),
+                    self.rounds,
+                ),
+            ]
+        finally:
+            finnhub_news_api.BASE_URL, reddit_dd_api.SUBREDDIT_URL = news_url, reddit_url
+            await close_http_client()
+            await upstream.stop()
+
+    GROUPS = ("parser", "news", "redis", "repository", "http")
+
+    async def run(self, groups: List[str]) -> List[Dict[str, Any]]:
+        results = []
+        for group in groups:
+            group_results = await getattr(self, f"bench_{group}")()
+            for r in group_results:
+                print(f"{r['name']:<36} {r['median_us']:>11.1f} {r['p95_us']:>11.1f} "
+                      f"{r['ops_per_s']:>12.0f}")
+            results.extend(group_results)
+        return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: List[Dict[str, Any]], baseline_path: str, threshold: float) -> List[str]:
+    """Print the change of every benchmark's median; returns the regressed names."""
+    baseline = json.loads(Path(baseline_path).read_text())
+    before = {r["name"]: r for r in baseline["results"]}
+    print(f"\nvs {baseline.get('commit')} ({baseline_path})")
+    print(f"{'benchmark':<36} {'before us':>11} {'after us':>11} {'change':>8}")
+    regressed = []
+    for r in current:
+        old = before.get(r["name"])
+        if old is None:
+            print(f"{r['name']:<36} {'-':>11} {r['median_us']:>11.1f} {'new':>8}")
+            continue
+        change = r["median_us"] / old["median_us"] - 1 if old["median_us"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressed.append(r["name"])
+            flag = "  REGRESSION"
+        print(f"{r['name']:<36} {old['median_us']:>11.1f} {r['median_us']:>11.1f} "
+              f"{change:>+8.1%}{flag}")
+    return regressed
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--only", nargs="+", choices=Suite.GROUPS, default=list(Suite.GROUPS))
+    parser.add_argument("--size", choices=sorted(SIZES), default="full")
+    parser.add_argument("--rounds", type=int, help="Override the rounds per benchmark")
+    parser.add_argument("--db-latency", type=float, default=0.0,
+                        help="Seconds the stub DB sleeps per statement (default 0)")
+    parser.add_argument("--output",
+                        help="Result file (default benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Median slowdown counted as a regression (default 0.10)")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    # Services log every fetch at INFO; keep the table readable.
+    logging.disable(logging.INFO)
+
+    size = dict(SIZES[args.size])
+    if args.rounds:
+        size["rounds"] = args.rounds
+    suite = Suite(size, args.db_latency)
+    print(f"{'benchmark':<36} {'median us':>11} {'p95 us':>11} {'ops/s':>12}")
+    results = await suite.run(args.only)
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "size": size,
+        "db_latency": args.db_latency,
+        "results": results,
+    }
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"{commit or 'unknown'}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        regressed = compare(results, args.compare, args.threshold)
+        if regressed and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,244 @@
+"""
+Synthetic corpora and local stand-ins used by the benchmark suite.
+
+Everything here runs in-process, so results depend on the code under test
+and not on Finnhub, Reddit, Redis or SQL Server:
+
+- ``FakeUpstream``: an aiohttp server answering like Finnhub's ``/news`` and
+  Reddit's listings, with full-size payloads
+- ``fake_redis_pool`` / ``fake_redis``: in-memory Redis (fakeredis)
+- ``StubDatabase``: the real connection pool and executor in front of
+  in-memory tables, with an optional per-statement latency
+"""
+
+import random
+import string
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from aiohttp import web
+from src.datalayer.connection import Database
+from src.services.company_parser_service import CompanyParserService
+
+WORDS = ("shares", "rose", "after", "earnings", "beat", "guidance", "the", "market",
+         "investors", "said", "quarter", "revenue", "analysts", "deal", "report")
+
+
+def company_universe(count: int, seed: int = 1) -> List[Tuple[str, str]]:
+    """``(name, ticker)`` rows with one to three word names."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        name = " ".join(
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))).title()
+            for _ in range(rng.randint(1, 3))
+        )
+        rows.append((name, f"T{i:05d}"))
+    return rows
+
+
+def build_parser(
+    companies: Sequence[Tuple[str, str]], workers: int = 0
+) -> CompanyParserService:
+    parser = CompanyParserService(db=None, workers=workers)
+    parser.add_companies(companies)
+    return parser
+
+
+def _sentence(rng: random.Random, names: Sequence[str], words: int, mentions: int) -> str:
+    tokens = rng.choices(WORDS, k=words) + rng.sample(names, mentions)
+    rng.shuffle(tokens)
+    return " ".join(tokens)
+
+
+def news_corpus(
+    companies: Sequence[Tuple[str, str]],
+    count: int,
+    start_id: int = 1,
+    seed: int = 2,
+) -> List[Dict[str, Any]]:
+    """Finnhub ``/news`` items, newest first, including the fields the client drops."""
+    rng = random.Random(seed)
+    names = [name for name, _ in companies]
+    now = int(time.time())
+    items = []
+    for news_id in range(start_id + count - 1, start_id - 1, -1):
+        items.append({
+            "id": news_id,
+            "datetime": now - (start_id + count - news_id) * 60,
+            "category": "top news",
+            "headline": _sentence(rng, names, 10, 1),
+            "summary": _sentence(rng, names, 60, 2),
+            "image": f"https://static.example.com/{news_id}.jpg",
+            "related": "",
+            "source": "Example Wire",
+            "url": f"https://news.example.com/{news_id}",
+        })
+    return items
+
+
+def reddit_listing(
+    companies: Sequence[Tuple[str, str]], count: int, seed: int = 3
+) -> Dict[str, Any]:
+    """A Reddit listing page with ``count`` posts padded to a realistic size."""
+    rng = random.Random(seed)
+    names = [name for name, _ in companies]
+    now = time.time()
+    children = []
+    for i in range(count):
+        post = {
+            "id": f"p{i}",
+            "name": f"t3_p{i}",
+            "created_utc": now - i * 30,
+            "title": _sentence(rng, names, 8, 1),
+            "selftext": _sentence(rng, names, 200, 3),
+            "permalink": f"/r/wallstreetbets/comments/p{i}/",
+            "author": f"user{i}",
+        }
+        # Reddit sends ~100 fields per post; the client keeps only a few.
+        post.update({f"unused_{k}": "x" * 20 for k in range(90)})
+        children.append({"kind": "t3", "data": post})
+    return {"kind": "Listing", "data": {"after": None, "children": children}}
+
+
+class FakeUpstream:
+    """Local HTTP server standing in for Finnhub and Reddit."""
+
+    def __init__(self, news: List[Dict[str, Any]], listing: Dict[str, Any]):
+        self.news = news
+        self.listing = listing
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url = ""
+
+    async def _news(self, request: web.Request) -> web.Response:
+        min_id = int(request.query.get("minId") or 0)
+        return web.json_response([n for n in self.news if n["id"] > min_id])
+
+    async def _listing(self, _request: web.Request) -> web.Response:
+        return web.json_response(self.listing)
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/api/v1/news", self._news)
+        app.router.add_get("/r/{subreddit}/{listing}.json", self._listing)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def fake_redis_pool():
+    """asyncio connection pool backed by an in-memory fakeredis server."""
+    import fakeredis
+    import redis.asyncio as aioredis
+
+    return aioredis.ConnectionPool(
+        connection_class=fakeredis.aioredis.FakeConnection,
+        server=fakeredis.FakeServer(),
+        decode_responses=True,
+    )
+
+
+def fake_redis():
+    """Synchronous in-memory Redis client."""
+    import fakeredis
+
+    return fakeredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+
+
+class StubCursor:
+    def __init__(self, db: "StubDatabase"):
+        self.db = db
+        self.fast_executemany = False
+        self._rows: List[Tuple] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query: str, params: Sequence[Any] = ()):
+        if self.db.latency:
+            time.sleep(self.db.latency)
+        self._rows = self.db.respond(" ".join(query.split()), list(params))
+        return self
+
+    def executemany(self, query: str, rows: Sequence[Sequence[Any]]):
+        if self.db.latency:
+            time.sleep(self.db.latency)
+        for row in rows:
+            self.db.respond(" ".join(query.split()), list(row))
+
+    def fetchall(self) -> List[Tuple]:
+        return self._rows
+
+    def fetchone(self) -> Optional[Tuple]:
+        return self._rows[0] if self._rows else None
+
+
+class StubConnection:
+    def __init__(self, db: "StubDatabase"):
+        self.db = db
+        self.closed = False
+
+    def cursor(self) -> StubCursor:
+        return StubCursor(self.db)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class StubDatabase(Database):
+    """
+    Database whose connections answer from dictionaries.
+
+    Pooling, checkout and the executor are the real ones; every statement can
+    sleep ``latency`` seconds to stand in for a SQL Server round trip.
+    Only the statements the benchmarked repositories issue are understood.
+    """
+
+    def __init__(
+        self,
+        companies: Sequence[Tuple[str, str]] = (),
+        latency: float = 0.0,
+        pool_size: int = 5,
+    ):
+        super().__init__("stub", "stub", "", "", pool_size=pool_size)
+        self.latency = latency
+        self.companies = dict(companies)
+        self.checkpoints: Dict[str, str] = {}
+
+    def connect(self):
+        self._bump("connects")
+        return StubConnection(self)
+
+    def respond(self, query: str, params: List[Any]) -> List[Tuple]:
+        if query.startswith("SELECT last_id FROM DataCheckpoint"):
+            value = self.checkpoints.get(params[0])
+            return [(value,)] if value is not None else []
+        if query.startswith("SELECT source_name, last_id FROM DataCheckpoint"):
+            return list(self.checkpoints.items())
+        if query.startswith("MERGE DataCheckpoint"):
+            for source_name, last_id in zip(params[::2], params[1::2]):
+                self.checkpoints[source_name] = last_id
+            return []
+        if query.startswith("SELECT company_name, ticker_symbol FROM Companies"):
+            return list(self.companies.items())
+        if query.startswith("SELECT ticker_symbol FROM Companies WHERE"):
+            ticker = self.companies.get(params[0])
+            return [(ticker,)] if ticker else []
+        raise NotImplementedError(f"StubDatabase does not understand: {query[:60]}")
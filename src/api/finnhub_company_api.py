@@ -4,26 +4,33 @@ finnhub_company_api.py
 Provides functions for interacting with Finnhub company profile endpoints.
 """
 
-import requests
+from typing import Dict, Optional
+from src.api.http_client import HttpError, HttpTimeout, get_http_client
 from src.logger import Logger
 
 logger = Logger.get("FinnhubCompanyAPI")
 
 
-def fetch_company_profile(symbol: str, api_key: str):
-    """Fetch company profile info for a given stock symbol."""
+async def fetch_company_profile(symbol: str, api_key: str) -> Optional[Dict]:
+    """
+    Fetch company profile info for a given stock symbol.
+
+    :return: The profile, ``{}`` when Finnhub has none for the symbol, or
+        None when the request failed
+    """
     url = "https://finnhub.io/api/v1/stock/profile2"
     params = {"symbol": symbol, "token": api_key}
     try:
-        res = requests.get(url, params=params, timeout=10)
-        res.raise_for_status()
-        data = res.json()
+        data = await get_http_client().get_json(
+            url, params=params, api="finnhub_profile"
+        )
         if not data or "name" not in data:
             logger.warning("No company profile found for symbol: %s", symbol)
+            return {}
         return data
-    except requests.Timeout:
+    except HttpTimeout:
         logger.warning("Timeout while fetching profile for %s", symbol)
-        return {}
-    except requests.RequestException as e:
+        return None
+    except HttpError as e:
         logger.error("Error fetching company profile for %s: %s", symbol, e)
-        return {}
+        return None
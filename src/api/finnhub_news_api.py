@@ -3,48 +3,101 @@ Finnhub API wrapper for fetching news.
 """
 
 from typing import Optional, List, Dict
-import requests
+from src.api.http_client import (
+    NOT_MODIFIED,
+    HttpError,
+    HttpTimeout,
+    get_http_client,
+    pick,
+)
 from src.logger import Logger
 
 logger = Logger.get("FinnhubAPI")
 
 BASE_URL = "https://finnhub.io/api/v1/news"
+COMPANY_NEWS_URL = "https://finnhub.io/api/v1/company-news"
 
+# Fields of a news item the services use; the rest is dropped after decoding.
+NEWS_FIELDS = ("id", "datetime", "headline", "summary", "url", "source", "category", "related")
 
-def fetch_news(
-    api_key: Optional[str], category: str = "general", max_items: int = 3
+
+async def fetch_news(
+    api_key: Optional[str],
+    category: str = "general",
+    max_items: Optional[int] = 3,
+    min_id: Optional[int] = None,
 ) -> List[Dict]:
     """
     Fetch the latest news from Finnhub.
 
     :param api_key: Finnhub API key
-    :param category: News category
-    :param max_items: Maximum number of news items to return
+    :param category: News category (general, forex, crypto, merger)
+    :param max_items: Maximum number of news items to return, or None for all
+    :param min_id: Only return items with an ID greater than this (Finnhub ``minId``)
     :return: List of news items (dictionaries)
+    :raises HttpError: The request failed, so callers can tell it from "no news"
     """
     if not api_key:
         logger.warning("API key not provided. Skipping news fetch.")
         return []
 
     params = {"category": category, "token": api_key}
+    if min_id:
+        params["minId"] = min_id
     try:
-        response = requests.get(BASE_URL, params=params, timeout=10)
-        response.raise_for_status()
-        news = response.json()[:max_items]
-        logger.info("Fetched %d news items.", len(news))
-        # for item in news:
-        #     logger.info(
-        #         "News: %s | URL: %s",
-        #         item.get("headline", "No title"),
-        #         item.get("url", "No URL"),
-        #     )
-        return news
-    except requests.Timeout:
+        news = await get_http_client().get_json(
+            BASE_URL, params=params, conditional=True, api="finnhub_news"
+        )
+        if news is NOT_MODIFIED:
+            logger.debug("No %s news changes since the last poll.", category)
+            return []
+        if max_items is not None:
+            news = news[:max_items]
+        logger.info("Fetched %d %s news items.", len(news), category)
+        return pick(news, NEWS_FIELDS)
+    except HttpTimeout:
         logger.warning("Request to Finnhub timed out.")
-        return []
-    except requests.RequestException as e:
+        raise
+    except HttpError as e:
         logger.error("Error fetching news: %s", e)
-        return []
+        raise
     except Exception as e:
         logger.error("Unexpected error fetching news: %s", e)
+        raise HttpError(f"Unexpected Finnhub news response: {e}") from e
+
+
+async def fetch_company_news(
+    api_key: Optional[str], symbol: str, from_date: str, to_date: str
+) -> List[Dict]:
+    """
+    Fetch news for one company from Finnhub's ``/company-news`` endpoint.
+
+    :param api_key: Finnhub API key
+    :param symbol: Ticker symbol
+    :param from_date: First day to include (YYYY-MM-DD)
+    :param to_date: Last day to include (YYYY-MM-DD)
+    :return: List of news items (dictionaries), newest first
+    :raises HttpError: The request failed, so callers can tell it from "no news"
+    """
+    if not api_key:
+        logger.warning("API key not provided. Skipping company news fetch.")
         return []
+
+    params = {"symbol": symbol, "from": from_date, "to": to_date, "token": api_key}
+    try:
+        news = await get_http_client().get_json(
+            COMPANY_NEWS_URL, params=params, conditional=True, api="finnhub_company_news"
+        )
+        if news is NOT_MODIFIED:
+            return []
+        logger.debug("Fetched %d news items for %s.", len(news), symbol)
+        return pick(news, NEWS_FIELDS)
+    except HttpTimeout:
+        logger.warning("Request to Finnhub timed out for %s.", symbol)
+        raise
+    except HttpError as e:
+        logger.error("Error fetching company news for %s: %s", symbol, e)
+        raise
+    except Exception as e:
+        logger.error("Unexpected error fetching company news for %s: %s", symbol, e)
+        raise HttpError(f"Unexpected Finnhub company news response: {e}") from e
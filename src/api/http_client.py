@@ -0,0 +1,262 @@
+"""
+http_client.py
+
+Shared async HTTP client used by every upstream API module. Keeps a single
+aiohttp session so TCP/TLS connections are reused between polls.
+"""
+
+import asyncio
+import os
+import random
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+import aiohttp
+from src import metrics
+from src.logger import Logger
+
+try:
+    import orjson
+
+    loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is optional
+    import json
+
+    loads = json.loads
+
+logger = Logger.get("HttpClient")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Returned by ``get_json(..., conditional=True)`` when the server answered 304.
+NOT_MODIFIED = object()
+
+REQUEST_SECONDS = metrics.histogram(
+    "http_request_seconds", "Upstream GET latency including retries", ["api"]
+)
+REQUEST_ERRORS = metrics.counter(
+    "http_request_errors_total", "Failed upstream GET attempts", ["api", "reason"]
+)
+NOT_MODIFIED_TOTAL = metrics.counter(
+    "http_not_modified_total", "Conditional GETs answered with 304", ["api"]
+)
+
+
+def pick(items: Iterable[Dict], fields: Iterable[str]) -> List[Dict]:
+    """Keep only ``fields`` of each item, so unused parts of a payload are freed."""
+    fields = tuple(fields)
+    return [{f: item[f] for f in fields if f in item} for item in items]
+
+
+class HttpError(Exception):
+    """Raised when a request fails after all retries or with a non-retryable status."""
+
+    def __init__(
+        self,
+        message: str,
+        status: Optional[int] = None,
+        retry_after: Optional[str] = None,
+    ):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class HttpTimeout(HttpError):
+    """Raised when every attempt of a request timed out."""
+
+
+class HttpClient:
+    """Pooled aiohttp session with per-host limits, timeouts and retries."""
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+        keepalive_timeout: float = 60.0,
+        retries: int = 2,
+        backoff: float = 0.5,
+        max_validators: int = 512,
+    ):
+        """
+        :param limit: Maximum open connections across all hosts
+        :param limit_per_host: Maximum open connections to a single host
+        :param timeout: Total seconds allowed for one attempt
+        :param connect_timeout: Seconds allowed to establish a connection
+        :param keepalive_timeout: Seconds an idle connection is kept for reuse
+        :param retries: Extra attempts after a timeout, connection error, 429 or 5xx
+        :param backoff: Base delay in seconds for exponential backoff between attempts
+        :param max_validators: URLs whose ETag/Last-Modified are remembered for conditional GETs
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self.keepalive_timeout = keepalive_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.max_validators = max_validators
+        self._validators: "OrderedDict[str, Tuple[Optional[str], Optional[str]]]" = (
+            OrderedDict()
+        )
+        self.not_modified = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self.timeout
+            )
+        return self._session
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt) * (0.5 + random.random() / 2)
+
+    @staticmethod
+    def _validator_key(url: str, params: Optional[Mapping[str, Any]]) -> str:
+        return f"{url}?{urlencode(sorted(params.items()))}" if params else url
+
+    def _conditional_headers(
+        self, key: str, headers: Optional[Mapping[str, str]]
+    ) -> Dict[str, str]:
+        headers = dict(headers or {})
+        etag, last_modified = self._validators.get(key, (None, None))
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def _remember_validators(self, key: str, resp: aiohttp.ClientResponse):
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            self._validators.pop(key, None)
+            return
+        self._validators[key] = (etag, last_modified)
+        self._validators.move_to_end(key)
+        while len(self._validators) > self.max_validators:
+            self._validators.popitem(last=False)
+
+    async def get_json(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        conditional: bool = False,
+        api: Optional[str] = None,
+    ) -> Any:
+        """
+        GET ``url`` and decode the JSON body.
+
+        With ``conditional``, the ETag / Last-Modified of the previous response
+        for the same URL and params are sent back; a 304 returns
+        ``NOT_MODIFIED`` without reading or parsing a body.
+
+        :param api: Label for the request metrics (default: the URL's host)
+        :raises HttpTimeout: if every attempt timed out
+        :raises HttpError: on a non-retryable status, when retries are exhausted
+            or when the body is not valid JSON
+        """
+        api = api or urlsplit(url).hostname or "unknown"
+        with REQUEST_SECONDS.time(api=api):
+            return await self._get_json(url, params, headers, conditional, api)
+
+    async def _get_json(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        headers: Optional[Mapping[str, str]],
+        conditional: bool,
+        api: str,
+    ) -> Any:
+        session = self._get_session()
+        last_error: Optional[HttpError] = None
+        key = self._validator_key(url, params)
+        if conditional:
+            headers = self._conditional_headers(key, headers)
+
+        for attempt in range(self.retries + 1):
+            if attempt:
+                retry_after = last_error.retry_after if last_error else None
+                await asyncio.sleep(self._retry_delay(attempt - 1, retry_after))
+            try:
+                async with session.get(url, params=params, headers=headers) as resp:
+                    if resp.status in RETRY_STATUSES:
+                        last_error = HttpError(
+                            f"HTTP {resp.status} from {url}",
+                            resp.status,
+                            resp.headers.get("Retry-After"),
+                        )
+                        REQUEST_ERRORS.inc(api=api, reason=str(resp.status))
+                        continue
+                    if resp.status == 304 and conditional:
+                        self.not_modified += 1
+                        NOT_MODIFIED_TOTAL.inc(api=api)
+                        return NOT_MODIFIED
+                    if resp.status >= 400:
+                        REQUEST_ERRORS.inc(api=api, reason=str(resp.status))
+                        raise HttpError(f"HTTP {resp.status} from {url}", resp.status)
+                    body = await resp.read()
+                    try:
+                        data = loads(body)
+                    except ValueError as e:
+                        REQUEST_ERRORS.inc(api=api, reason="decode")
+                        raise HttpError(
+                            f"Invalid JSON from {url}: {e}", resp.status
+                        ) from e
+                    # Only a body that decoded may be answered with a 304 later.
+                    if conditional:
+                        self._remember_validators(key, resp)
+                    return data
+            except asyncio.TimeoutError:
+                last_error = HttpTimeout(f"Timed out requesting {url}")
+                REQUEST_ERRORS.inc(api=api, reason="timeout")
+            except aiohttp.ClientError as e:
+                last_error = HttpError(f"Error requesting {url}: {e}")
+                REQUEST_ERRORS.inc(api=api, reason="connection")
+
+            logger.debug("Attempt %d for %s failed: %s", attempt + 1, url, last_error)
+
+        assert last_error is not None
+        raise last_error
+
+    async def close(self):
+        """Close the underlying session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_client: Optional[HttpClient] = None
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide HTTP client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = HttpClient(
+            limit_per_host=int(os.getenv("HTTP_LIMIT_PER_HOST", 10)),
+            timeout=float(os.getenv("HTTP_TIMEOUT", 10)),
+            retries=int(os.getenv("HTTP_RETRIES", 2)),
+        )
+    return _client
+
+
+async def close_http_client():
+    """Close the process-wide HTTP client, if one was created."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
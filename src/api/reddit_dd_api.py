@@ -1,10 +1,71 @@
-import requests
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from src.api.http_client import NOT_MODIFIED, HttpError, get_http_client, pick
+from src.logger import Logger
 
-BASE_URL = "https://www.reddit.com/r/wallstreetbets/search.json"
+logger = Logger.get("RedditAPI")
 
+SUBREDDIT_URL = "https://www.reddit.com/r/{subreddit}/{listing}.json"
+HEADERS = {"User-Agent": "Mozilla/5.0 (RedditServiceBot)"}
 
-def fetch_dd_posts(limit: int = 5) -> List[Dict]:
+# Fields of a post the services use; Reddit sends ~100 per post.
+POST_FIELDS = ("id", "name", "created_utc", "title", "selftext", "permalink", "author")
+
+
+async def fetch_posts(
+    subreddit: str,
+    flair: Optional[str] = None,
+    limit: int = 100,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Fetch one page of a subreddit's newest posts, optionally filtered by flair.
+
+    Args:
+        subreddit: Subreddit name without the ``r/`` prefix
+        flair: Only posts with this flair (uses the search listing)
+        limit: Page size (Reddit caps it at 100)
+        after: Fullname cursor; returns the page of older posts after it
+        before: Fullname cursor; returns the page of newer posts before it
+
+    Returns:
+        The posts (``POST_FIELDS`` of each post['data']), newest first, and the
+        ``after`` cursor for the next older page (None on the last page or
+        when the listing is unchanged since the last request)
+
+    Raises:
+        HttpError: the request failed; an empty page always means "no more posts"
+    """
+    params = {"sort": "new", "limit": limit}
+    if flair:
+        url = SUBREDDIT_URL.format(subreddit=subreddit, listing="search")
+        query = f'flair:"{flair}"' if " " in flair else f"flair:{flair}"
+        params.update({"q": query, "restrict_sr": "on"})
+    else:
+        url = SUBREDDIT_URL.format(subreddit=subreddit, listing="new")
+    if after:
+        params["after"] = after
+    if before:
+        params["before"] = before
+
+    try:
+        data = await get_http_client().get_json(
+            url, params=params, headers=HEADERS, conditional=True, api="reddit"
+        )
+        if data is NOT_MODIFIED:
+            return [], None
+        listing = data["data"]
+        posts = pick((p["data"] for p in listing["children"]), POST_FIELDS)
+        return posts, listing.get("after")
+    except HttpError as e:
+        logger.error("Error fetching Reddit posts from r/%s: %s", subreddit, e)
+        raise
+    except (KeyError, TypeError) as e:
+        logger.error("Malformed Reddit listing from r/%s: %s", subreddit, e)
+        raise HttpError(f"Malformed Reddit listing from r/{subreddit}: {e}") from e
+
+
+async def fetch_dd_posts(limit: int = 5) -> List[Dict]:
     """
     Fetch the latest posts with flair 'DD' from r/wallstreetbets.
 
@@ -14,19 +75,8 @@ def fetch_dd_posts(limit: int = 5) -> List[Dict]:
     Returns:
         List of posts as dictionaries (each is post['data'])
     """
-    params = {
-        "q": "flair:DD",
-        "restrict_sr": "on",
-        "sort": "new",
-        "limit": limit,
-    }
-    headers = {"User-Agent": "Mozilla/5.0 (RedditServiceBot)"}
-
     try:
-        resp = requests.get(BASE_URL, params=params, headers=headers, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        return [p["data"] for p in data["data"]["children"]]
-    except Exception as e:
-        print(f"Error fetching Reddit posts: {e}")
+        posts, _ = await fetch_posts("wallstreetbets", flair="DD", limit=limit)
+    except HttpError:
         return []
+    return posts
@@ -0,0 +1,191 @@
+# src/cache/async_redis_cache.py
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+import redis
+import redis.asyncio as aioredis
+from src.cache.base_cache import REDIS_ERRORS, BaseCache
+from src.cache.local_cache import LocalCache
+from src.logger import Logger
+
+logger = Logger.get("AsyncRedisCache")
+
+# One connection pool per Redis endpoint, shared by every namespace.
+_pools: Dict[Tuple[str, int, int], aioredis.ConnectionPool] = {}
+
+
+def _shared_pool(host: str, port: int, db: int, max_connections: int) -> aioredis.ConnectionPool:
+    pool = _pools.get((host, port, db))
+    if pool is None:
+        pool = aioredis.ConnectionPool(
+            host=host,
+            port=port,
+            db=db,
+            decode_responses=True,
+            max_connections=max_connections,
+        )
+        _pools[(host, port, db)] = pool
+    return pool
+
+
+async def close_pools():
+    """Disconnect every shared pool (call once at shutdown)."""
+    for pool in _pools.values():
+        await pool.disconnect()
+    _pools.clear()
+
+
+class AsyncRedisCache(BaseCache):
+    """
+    Namespaced Redis cache on the asyncio client.
+
+    Construction does no I/O; ``await connect()`` pings Redis once at startup.
+    After a failed command Redis is skipped for ``retry_interval`` seconds and
+    the L1 tier (if configured) answers on its own.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        db: Optional[int] = None,
+        namespace: str = "default",
+        seen_mode: Optional[str] = None,
+        seen_retention: Optional[int] = None,
+        local_cache: Optional[LocalCache] = None,
+        max_connections: int = 20,
+        retry_interval: float = 30.0,
+        pool: Optional[aioredis.ConnectionPool] = None,
+    ):
+        super().__init__(host, port, db, namespace, seen_mode, seen_retention, local_cache)
+        self.retry_interval = retry_interval
+        self.client = aioredis.Redis(
+            connection_pool=pool
+            or _shared_pool(self.host, self.port, self.db, max_connections)
+        )
+        self._down_until = 0.0
+
+    async def connect(self) -> bool:
+        """
+        Ping Redis; returns False (and falls back to L1) if it is unreachable.
+
+        Also unlinks the unbounded seen-set of older releases, if still there.
+        """
+        try:
+            await self.client.ping()
+            dropped = await self.client.unlink(self.legacy_seen_key)
+        except redis.RedisError as e:
+            self._redis_failed("connect", e)
+            return False
+        logger.info(
+            "Connected to Redis at %s:%d [%s]", self.host, self.port, self.namespace
+        )
+        if dropped:
+            logger.info("Dropped legacy seen-set %s", self.legacy_seen_key)
+        return True
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _redis_failed(self, op: str, error: redis.RedisError):
+        REDIS_ERRORS.inc(namespace=self.namespace, op=op)
+        self._down_until = time.monotonic() + self.retry_interval
+        logger.warning(
+            "Redis %s failed [%s]: %s; retrying in %.0fs",
+            op, self.namespace, error, self.retry_interval,
+        )
+
+    async def is_seen(self, key: str) -> bool:
+        return (await self.is_seen_many([key]))[0]
+
+    async def mark_seen(self, key: str):
+        await self.mark_seen_many([key])
+
+    async def is_seen_many(self, keys: Iterable) -> List[bool]:
+        """Check several keys, asking Redis (one round trip) only for L1 misses."""
+        keys = list(keys)
+        seen, pending = self._local_seen(keys)
+        local_hits = len(keys) - len(pending)
+        if not pending or not self.available:
+            self._record_lookups(len(keys), local_hits)
+            return seen
+        remote_keys = [keys[i] for i in pending]
+        pipe = self.client.pipeline(transaction=False)
+        self.seen_index.queue_contains(pipe, remote_keys)
+        try:
+            with self._timed("is_seen"):
+                results = self.seen_index.parse_contains(await pipe.execute(), remote_keys)
+        except redis.RedisError as e:
+            self._redis_failed("is_seen", e)
+            self._record_lookups(len(keys), local_hits)
+            return seen
+        for i, was_seen in zip(pending, results):
+            seen[i] = was_seen
+        self._remember_seen([k for k, was_seen in zip(remote_keys, results) if was_seen])
+        self._record_lookups(len(keys), local_hits, sum(results))
+        return seen
+
+    async def mark_seen_many(self, keys: Iterable):
+        """Mark several keys as seen in both tiers (one Redis round trip)."""
+        keys = list(keys)
+        if not keys:
+            return
+        self._remember_seen(keys)
+        if not self.available:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        self.seen_index.queue_add(pipe, keys)
+        try:
+            with self._timed("mark_seen"):
+                await pipe.execute()
+        except redis.RedisError as e:
+            self._redis_failed("mark_seen", e)
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None when the key is missing."""
+        return (await self.get_many([key]))[0]
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None):
+        await self.set_many({key: value}, ex=ex)
+
+    async def get_many(self, keys: Iterable[str]) -> List[Optional[str]]:
+        """Fetch several keys, with a single MGET for the ones not in L1."""
+        keys = list(keys)
+        values, pending = self._local_values(keys)
+        local_hits = len(keys) - len(pending)
+        if not pending or not self.available:
+            self._record_lookups(len(keys), local_hits)
+            return values
+        try:
+            with self._timed("get"):
+                fetched = await self.client.mget([self._key(keys[i]) for i in pending])
+        except redis.RedisError as e:
+            self._redis_failed("get", e)
+            self._record_lookups(len(keys), local_hits)
+            return values
+        for i, value in zip(pending, fetched):
+            values[i] = value
+        self._remember_values({keys[i]: value for i, value in zip(pending, fetched)})
+        self._record_lookups(
+            len(keys), local_hits, sum(value is not None for value in fetched)
+        )
+        return values
+
+    async def set_many(self, items: Dict[str, str], ex: Optional[int] = None):
+        """Set several keys in both tiers (MSET, or a pipeline when expiring)."""
+        if not items:
+            return
+        self._remember_values(items, ex)
+        if not self.available:
+            return
+        try:
+            with self._timed("set"):
+                if ex is None:
+                    await self.client.mset({self._key(k): v for k, v in items.items()})
+                    return
+                pipe = self.client.pipeline(transaction=False)
+                for k, v in items.items():
+                    pipe.set(self._key(k), v, ex=ex)
+                await pipe.execute()
+        except redis.RedisError as e:
+            self._redis_failed("set", e)
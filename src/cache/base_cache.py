@@ -0,0 +1,116 @@
+# src/cache/base_cache.py
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import os
+from src import metrics
+from src.cache.local_cache import LocalCache
+from src.cache.seen_index import build_seen_index
+
+CACHE_LOOKUPS = metrics.counter(
+    "cache_lookups_total",
+    "Cache lookups by outcome (local_hit, redis_hit, miss)",
+    ["namespace", "result"],
+)
+REDIS_SECONDS = metrics.histogram(
+    "redis_command_seconds", "Redis round-trip time", ["namespace", "op"]
+)
+REDIS_ERRORS = metrics.counter(
+    "redis_errors_total", "Failed Redis round trips", ["namespace", "op"]
+)
+
+
+class BaseCache:
+    """
+    Settings and L1 bookkeeping shared by the sync and asyncio Redis caches.
+
+    Seen keys expire after ``seen_retention`` seconds. ``seen_mode`` selects an
+    exact sorted-set index (``zset``) or a fixed-memory Bloom index (``bloom``)
+    for very high volumes; see ``src/cache/seen_index.py``.
+
+    With a ``local_cache`` the cache becomes two-tier: reads are served from the
+    in-process L1 when possible, writes go to both tiers, and if Redis is
+    unreachable the L1 keeps answering (including deduplication) on its own.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        db: Optional[int] = None,
+        namespace: str = "default",
+        seen_mode: Optional[str] = None,
+        seen_retention: Optional[int] = None,
+        local_cache: Optional[LocalCache] = None,
+    ):
+        self.host = host or os.getenv("REDIS_HOST", "localhost")
+        self.port = port or int(os.getenv("REDIS_PORT", 6379))
+        self.db = db or int(os.getenv("REDIS_DB", 0))
+        self.namespace = namespace
+        self.seen_retention = seen_retention or int(
+            os.getenv("REDIS_SEEN_RETENTION", 7 * 24 * 3600)
+        )
+        self.seen_index = build_seen_index(
+            seen_mode or os.getenv("REDIS_SEEN_MODE", "zset"),
+            self._key("seen"),
+            self.seen_retention,
+        )
+        # Older releases kept every seen key forever in a plain SET here; the
+        # indexes above use their own keys, so it is dropped on connect.
+        self.legacy_seen_key = self._key("seen")
+        self.local = local_cache
+
+    def _key(self, key: str) -> str:
+        """Prefix key with namespace."""
+        return f"{self.namespace}:{key}"
+
+    def _local_seen(self, keys: Sequence[Any]) -> Tuple[List[bool], List[int]]:
+        """Answer what L1 can; return the flags and the indexes still to ask Redis about."""
+        seen = [False] * len(keys)
+        pending = []
+        for i, key in enumerate(keys):
+            if self.local is not None and self.local.lookup(("seen", str(key)))[0]:
+                seen[i] = True
+            else:
+                pending.append(i)
+        return seen, pending
+
+    def _remember_seen(self, keys: Sequence[Any]):
+        if self.local is not None:
+            for key in keys:
+                self.local.set(("seen", str(key)), True, self.seen_retention)
+
+    def _local_values(
+        self, keys: Sequence[str]
+    ) -> Tuple[List[Optional[str]], List[int]]:
+        """Answer what L1 can; return the values and the indexes still to fetch."""
+        values: List[Optional[str]] = [None] * len(keys)
+        pending = []
+        for i, key in enumerate(keys):
+            found, value = (False, None)
+            if self.local is not None:
+                found, value = self.local.lookup(("value", key))
+            if found:
+                values[i] = value
+            else:
+                pending.append(i)
+        return values, pending
+
+    def _remember_values(self, items: Dict[str, Optional[str]], ex: Optional[int] = None):
+        """Write values to L1; a None value is kept as a negative entry with the short TTL."""
+        if self.local is None:
+            return
+        ttl = min(ex, self.local.ttl) if ex else None
+        for k, v in items.items():
+            self.local.set(("value", k), v, ttl)
+
+    def _record_lookups(self, total: int, local_hits: int, redis_hits: int = 0):
+        if local_hits:
+            CACHE_LOOKUPS.inc(local_hits, namespace=self.namespace, result="local_hit")
+        if redis_hits:
+            CACHE_LOOKUPS.inc(redis_hits, namespace=self.namespace, result="redis_hit")
+        misses = total - local_hits - redis_hits
+        if misses:
+            CACHE_LOOKUPS.inc(misses, namespace=self.namespace, result="miss")
+
+    def _timed(self, op: str):
+        """Context manager recording one Redis round trip."""
+        return REDIS_SECONDS.time(namespace=self.namespace, op=op)
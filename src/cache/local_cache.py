@@ -0,0 +1,89 @@
+# src/cache/local_cache.py
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class LocalCache:
+    """
+    In-process LRU cache with per-entry TTL and negative caching.
+
+    ``lookup`` distinguishes "not cached" from "cached as missing": a key stored
+    with ``set_missing`` is returned as ``(True, None)`` until its shorter
+    negative TTL runs out.
+    """
+
+    def __init__(
+        self, max_entries: int = 10_000, ttl: float = 300.0, negative_ttl: float = 30.0
+    ):
+        """
+        :param max_entries: Entries kept before the least recently used is evicted
+        :param ttl: Default lifetime of an entry in seconds
+        :param negative_ttl: Lifetime of a cached miss in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return ``(found, value)``; ``value`` is None for a cached miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        if value is None:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return True, value
+
+    def get(self, key: Hashable) -> Any:
+        return self.lookup(key)[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store ``value``; a None value is stored as a miss with the negative TTL."""
+        if value is None:
+            ttl = self.negative_ttl if ttl is None else min(ttl, self.negative_ttl)
+        elif ttl is None:
+            ttl = self.ttl
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def set_missing(self, key: Hashable):
+        self.set(key, None)
+
+    def delete(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -1,14 +1,15 @@
 # src/cache/redis_cache.py
-from typing import Optional
-import os
+from typing import Dict, Iterable, List, Optional
 import redis
+from src.cache.base_cache import REDIS_ERRORS, BaseCache
+from src.cache.local_cache import LocalCache
 from src.logger import Logger
 
 logger = Logger.get("RedisCache")
 
 
-class RedisCache:
-    """Wrapper around Redis for storing namespaced items."""
+class RedisCache(BaseCache):
+    """Wrapper around Redis for storing namespaced items (synchronous client)."""
 
     def __init__(
         self,
@@ -16,11 +17,11 @@ class RedisCache:
         port: Optional[int] = None,
         db: Optional[int] = None,
         namespace: str = "default",
+        seen_mode: Optional[str] = None,
+        seen_retention: Optional[int] = None,
+        local_cache: Optional[LocalCache] = None,
     ):
-        self.host = host or os.getenv("REDIS_HOST", "localhost")
-        self.port = port or int(os.getenv("REDIS_PORT", 6379))
-        self.db = db or int(os.getenv("REDIS_DB", 0))
-        self.namespace = namespace
+        super().__init__(host, port, db, namespace, seen_mode, seen_retention, local_cache)
         try:
             self.client = redis.Redis(
                 host=self.host, port=self.port, db=self.db, decode_responses=True
@@ -29,30 +30,110 @@ class RedisCache:
             logger.info(
                 "Connected to Redis at %s:%d [%s]", self.host, self.port, self.namespace
             )
+            if self.client.unlink(self.legacy_seen_key):
+                logger.info("Dropped legacy seen-set %s", self.legacy_seen_key)
         except redis.RedisError as e:
-            logger.error("Could not connect to Redis: %s", e)
+            if self.local is not None:
+                logger.error("Could not connect to Redis, using local cache only: %s", e)
+            else:
+                logger.error("Could not connect to Redis: %s", e)
             self.client = None
 
-    def _key(self, key: str) -> str:
-        """Prefix key with namespace."""
-        return f"{self.namespace}:{key}"
+    def _redis_failed(self, op: str, error: redis.RedisError):
+        REDIS_ERRORS.inc(namespace=self.namespace, op=op)
+        logger.warning("Redis %s failed [%s]: %s", op, self.namespace, error)
 
     def is_seen(self, key: str) -> bool:
-        if not self.client:
-            return False
-        return bool(self.client.sismember(self._key("seen"), key))
+        return self.is_seen_many([key])[0]
 
     def mark_seen(self, key: str):
+        self.mark_seen_many([key])
+
+    def is_seen_many(self, keys: Iterable) -> List[bool]:
+        """Check several keys, asking Redis (one round trip) only for L1 misses."""
+        keys = list(keys)
+        seen, pending = self._local_seen(keys)
+        local_hits = len(keys) - len(pending)
+        if not self.client or not pending:
+            self._record_lookups(len(keys), local_hits)
+            return seen
+        remote_keys = [keys[i] for i in pending]
+        pipe = self.client.pipeline(transaction=False)
+        self.seen_index.queue_contains(pipe, remote_keys)
+        try:
+            with self._timed("is_seen"):
+                results = self.seen_index.parse_contains(pipe.execute(), remote_keys)
+        except redis.RedisError as e:
+            self._redis_failed("is_seen", e)
+            self._record_lookups(len(keys), local_hits)
+            return seen
+        for i, was_seen in zip(pending, results):
+            seen[i] = was_seen
+        self._remember_seen([k for k, was_seen in zip(remote_keys, results) if was_seen])
+        self._record_lookups(len(keys), local_hits, sum(results))
+        return seen
+
+    def mark_seen_many(self, keys: Iterable):
+        """Mark several keys as seen in both tiers (one Redis round trip)."""
+        keys = list(keys)
+        if not keys:
+            return
+        self._remember_seen(keys)
         if not self.client:
             return
-        self.client.sadd(self._key("seen"), key)
+        pipe = self.client.pipeline(transaction=False)
+        self.seen_index.queue_add(pipe, keys)
+        try:
+            with self._timed("mark_seen"):
+                pipe.execute()
+        except redis.RedisError as e:
+            self._redis_failed("mark_seen", e)
 
     def get(self, key: str) -> Optional[str]:
-        if not self.client:
-            return None
-        return str(self.client.get(self._key(key)))
+        """Return the cached value, or None when the key is missing."""
+        return self.get_many([key])[0]
 
     def set(self, key: str, value: str, ex: Optional[int] = None):
+        self.set_many({key: value}, ex=ex)
+
+    def get_many(self, keys: Iterable[str]) -> List[Optional[str]]:
+        """Fetch several keys, with a single MGET for the ones not in L1."""
+        keys = list(keys)
+        values, pending = self._local_values(keys)
+        local_hits = len(keys) - len(pending)
+        if not self.client or not pending:
+            self._record_lookups(len(keys), local_hits)
+            return values
+        try:
+            with self._timed("get"):
+                fetched = self.client.mget([self._key(keys[i]) for i in pending])
+        except redis.RedisError as e:
+            self._redis_failed("get", e)
+            self._record_lookups(len(keys), local_hits)
+            return values
+        for i, value in zip(pending, fetched):
+            values[i] = value
+        self._remember_values({keys[i]: value for i, value in zip(pending, fetched)})
+        self._record_lookups(
+            len(keys), local_hits, sum(value is not None for value in fetched)
+        )
+        return values
+
+    def set_many(self, items: Dict[str, str], ex: Optional[int] = None):
+        """Set several keys in both tiers (MSET, or a pipeline when expiring)."""
+        if not items:
+            return
+        self._remember_values(items, ex)
         if not self.client:
             return
-        self.client.set(self._key(key), value, ex=ex)
+        try:
+            with self._timed("set"):
+                if ex is None:
+                    self.client.mset({self._key(k): v for k, v in items.items()})
+                    return
+                pipe = self.client.pipeline(transaction=False)
+                for k, v in items.items():
+                    pipe.set(self._key(k), v, ex=ex)
+                pipe.execute()
+        except redis.RedisError as e:
+            self._redis_failed("set", e)
@@ -0,0 +1,158 @@
+# src/cache/seen_index.py
+"""
+Bounded "seen" indexes for RedisCache.
+
+Both indexes only queue commands on a pipeline and interpret the results, so the
+same index works with the synchronous and the asyncio Redis clients.
+"""
+
+import hashlib
+import math
+import struct
+import time
+from typing import Any, List, Sequence, Tuple
+
+
+class SortedSetSeenIndex:
+    """
+    Exact seen-set stored as a sorted set scored by the time each key was marked.
+
+    Members older than ``retention`` seconds are trimmed whenever keys are added,
+    so the set only ever holds one retention window of keys.
+    """
+
+    def __init__(self, key: str, retention: int):
+        self.key = key
+        self.retention = retention
+
+    def queue_contains(self, pipe, keys: Sequence[Any]):
+        pipe.zmscore(self.key, list(keys))
+
+    def parse_contains(self, results: List[Any], keys: Sequence[Any]) -> List[bool]:
+        cutoff = time.time() - self.retention
+        return [score is not None and score >= cutoff for score in results[0]]
+
+    def queue_add(self, pipe, keys: Sequence[Any]):
+        now = time.time()
+        pipe.zadd(self.key, {k: now for k in keys})
+        pipe.zremrangebyscore(self.key, "-inf", now - self.retention)
+        pipe.expire(self.key, self.retention)
+
+
+class BloomSeenIndex:
+    """
+    Probabilistic seen-set built from time-bucketed Bloom filters in Redis bitmaps.
+
+    Keys are added to the filter of the current bucket; lookups check the current
+    and previous bucket, so a key is remembered for between one and two bucket
+    widths. Each bucket is a fixed-size bitmap that expires once it falls out of
+    the window, so memory is bounded by two bitmaps regardless of volume.
+
+    The filter is blocked: all of a key's bits live in one 64-bit word, so each
+    key costs one word read or OR per bucket. Offsets and masks are sent to small
+    Lua scripts as a single packed argument, which keeps client-side encoding
+    cost flat per key. There are no false negatives; false positives stay near
+    ``error_rate`` per bucket until a bucket holds ``capacity`` keys.
+    """
+
+    # Lua's bit library works on 32-bit integers, so every 64-bit word is handled
+    # as two halves. ARGV[1] packs one (offset, high mask, low mask) per key.
+    CONTAINS_SCRIPT = """
+    local packed = ARGV[1]
+    local out = {}
+    for pos = 1, #packed, 12 do
+        local off, hi, lo = struct.unpack('>I4I4I4', packed, pos)
+        hi, lo = bit.tobit(hi), bit.tobit(lo)
+        local found = '0'
+        for _, bucket in ipairs(KEYS) do
+            local cur = redis.call('BITFIELD', bucket, 'GET', 'u32', off, 'GET', 'u32', off + 32)
+            if bit.band(cur[1], hi) == hi and bit.band(cur[2], lo) == lo then
+                found = '1'
+                break
+            end
+        end
+        out[#out + 1] = found
+    end
+    return table.concat(out)
+    """
+
+    ADD_SCRIPT = """
+    local packed = ARGV[2]
+    for pos = 1, #packed, 12 do
+        local off, hi, lo = struct.unpack('>I4I4I4', packed, pos)
+        local cur = redis.call('BITFIELD', KEYS[1], 'GET', 'u32', off, 'GET', 'u32', off + 32)
+        redis.call('BITFIELD', KEYS[1],
+            'SET', 'u32', off, bit.bor(cur[1], hi),
+            'SET', 'u32', off + 32, bit.bor(cur[2], lo))
+    end
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+    return #packed / 12
+    """
+
+    def __init__(
+        self,
+        key: str,
+        retention: int,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+    ):
+        """
+        :param key: Prefix for the bucket bitmaps
+        :param retention: Width of a bucket in seconds; keys are remembered at least this long
+        :param capacity: Expected keys per bucket
+        :param error_rate: Target false-positive rate per bucket at capacity
+        """
+        self.key = key
+        self.retention = retention
+        # A blocked filter needs about twice the bits of a classic Bloom filter to
+        # reach the same false-positive rate; more than ~8 bits per 64-bit word
+        # only makes it worse.
+        bits = -2 * capacity * math.log(error_rate) / (math.log(2) ** 2)
+        self.blocks = int(math.ceil(bits / 64))
+        self.hashes = min(8, max(1, int(round(bits / capacity * math.log(2) / 2))))
+
+    def _block(self, key: Any) -> Tuple[int, int]:
+        """Return the bit offset of the key's word and the mask of its bits in it."""
+        digest = hashlib.blake2b(str(key).encode(), digest_size=16).digest()
+        offset = (int.from_bytes(digest[:8], "little") % self.blocks) * 64
+        entropy = int.from_bytes(digest[8:], "little")
+        mask = 0
+        for i in range(self.hashes):
+            # BITFIELD numbers bits from the most significant end of the word.
+            mask |= 1 << (63 - ((entropy >> (6 * i)) & 63))
+        return offset, mask
+
+    def _pack(self, keys: Sequence[Any]) -> bytes:
+        packed = bytearray()
+        for key in keys:
+            offset, mask = self._block(key)
+            packed += struct.pack(">III", offset, mask >> 32, mask & 0xFFFFFFFF)
+        return bytes(packed)
+
+    def _buckets(self) -> List[str]:
+        current = int(time.time() // self.retention)
+        return [f"{self.key}:{current}", f"{self.key}:{current - 1}"]
+
+    def queue_contains(self, pipe, keys: Sequence[Any]):
+        buckets = self._buckets()
+        pipe.eval(self.CONTAINS_SCRIPT, len(buckets), *buckets, self._pack(keys))
+
+    def parse_contains(self, results: List[Any], keys: Sequence[Any]) -> List[bool]:
+        flags = results[0]
+        if isinstance(flags, bytes):
+            flags = flags.decode()
+        return [flag == "1" for flag in flags]
+
+    def queue_add(self, pipe, keys: Sequence[Any]):
+        pipe.eval(
+            self.ADD_SCRIPT, 1, self._buckets()[0], 2 * self.retention, self._pack(keys)
+        )
+
+
+def build_seen_index(mode: str, key: str, retention: int, **bloom_options):
+    """Return the seen index for ``mode`` (``zset`` or ``bloom``)."""
+    if mode == "zset":
+        return SortedSetSeenIndex(f"{key}:z", retention)
+    if mode == "bloom":
+        return BloomSeenIndex(f"{key}:bloom", retention, **bloom_options)
+    raise ValueError(f"Unknown seen index mode: {mode}")
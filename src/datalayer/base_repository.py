@@ -1,34 +1,71 @@
 # src/datalayer/base_repository.py
-from typing import Any, Iterable, Optional
+from typing import Any, Callable, Iterable, Optional, TypeVar
+from src import metrics
 from src.datalayer.connection import Database
 
+T = TypeVar("T")
+
+QUERY_SECONDS = metrics.histogram(
+    "db_query_seconds",
+    "Repository operation time on the DB worker, including pool checkout",
+    ["repository", "op"],
+)
+QUERY_ERRORS = metrics.counter(
+    "db_query_errors_total", "Repository operations that raised", ["repository", "op"]
+)
+
 
 class BaseRepository:
-    """Base repository that operates using a shared Database instance."""
+    """
+    Base repository that operates using a shared Database instance.
+
+    The public query methods are coroutines: the blocking pyodbc call runs on the
+    database's executor so the event loop is never held up by a round trip. Each
+    operation borrows its own connection from the pool.
+    """
 
     def __init__(self, db: Database):
         self.db = db
 
-    def execute(
-        self, query: str, params: Optional[Iterable[Any]] = None, commit: bool = True
-    ):
-        """Execute INSERT, UPDATE, or DELETE queries."""
-        conn = self.db.connection
-        with conn.cursor() as cursor:
-            cursor.execute(query, params or ())
-            if commit:
-                conn.commit()
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a synchronous helper (several statements, one transaction) off the loop."""
+        return await self.db.run(self._timed, func, *args)
+
+    def _timed(self, func: Callable[..., T], *args: Any) -> T:
+        labels = {
+            "repository": type(self).__name__,
+            "op": func.__name__.lstrip("_"),
+        }
+        try:
+            with QUERY_SECONDS.time(**labels):
+                return func(*args)
+        except Exception:
+            QUERY_ERRORS.inc(**labels)
+            raise
+
+    async def execute(self, query: str, params: Optional[Iterable[Any]] = None):
+        """Execute INSERT, UPDATE, or DELETE queries and commit them."""
+        return await self.run(self._execute, query, params)
 
-    def fetch_all(self, query: str, params: Optional[Iterable[Any]] = None):
+    async def fetch_all(self, query: str, params: Optional[Iterable[Any]] = None):
         """Run SELECT queries and fetch all results."""
-        conn = self.db.connection
-        with conn.cursor() as cursor:
+        return await self.run(self._fetch_all, query, params)
+
+    async def fetch_one(self, query: str, params: Optional[Iterable[Any]] = None):
+        """Run SELECT queries and fetch one result."""
+        return await self.run(self._fetch_one, query, params)
+
+    def _execute(self, query: str, params: Optional[Iterable[Any]] = None):
+        with self.db.acquire() as conn, conn.cursor() as cursor:
+            cursor.execute(query, params or ())
+            conn.commit()
+
+    def _fetch_all(self, query: str, params: Optional[Iterable[Any]] = None):
+        with self.db.acquire() as conn, conn.cursor() as cursor:
             cursor.execute(query, params or ())
             return cursor.fetchall()
 
-    def fetch_one(self, query: str, params: Optional[Iterable[Any]] = None):
-        """Run SELECT queries and fetch one result."""
-        conn = self.db.connection
-        with conn.cursor() as cursor:
+    def _fetch_one(self, query: str, params: Optional[Iterable[Any]] = None):
+        with self.db.acquire() as conn, conn.cursor() as cursor:
             cursor.execute(query, params or ())
             return cursor.fetchone()
@@ -0,0 +1,105 @@
+# src/datalayer/checkpoint_store.py
+import asyncio
+from typing import Dict, Optional
+from src import metrics
+from src.datalayer.data_checkpoint_repository import DataCheckpointRepository
+from src.logger import Logger
+
+logger = Logger.get("CheckpointStore")
+
+DIRTY = metrics.gauge("checkpoints_dirty", "Checkpoints waiting for the next flush")
+FLUSHED_ROWS = metrics.counter("checkpoint_flushed_rows_total", "Checkpoint rows written")
+FLUSH_ERRORS = metrics.counter("checkpoint_flush_errors_total", "Failed checkpoint flushes")
+
+
+class CheckpointStore:
+    """
+    Write-behind cache in front of DataCheckpointRepository.
+
+    All checkpoints are read once, on first use; after that reads come from
+    memory and updates only mark the source dirty. Dirty checkpoints are written
+    in one batched MERGE every ``flush_interval`` seconds and on ``close()``.
+    A crash therefore loses at most one flush interval of checkpoint progress,
+    and only the items fetched in that window are delivered again.
+    """
+
+    def __init__(self, repo: DataCheckpointRepository, flush_interval: float = 5.0):
+        """
+        :param repo: Repository the checkpoints are persisted through
+        :param flush_interval: Seconds between flushes of dirty checkpoints
+        """
+        self.repo = repo
+        self.flush_interval = flush_interval
+        self._values: Dict[str, str] = {}
+        self._dirty: Dict[str, str] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.flush_errors = 0
+
+    async def _ensure_loaded(self):
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if not self._loaded:
+                stored = await self.repo.get_all()
+                # Keep anything written before the load finished.
+                self._values = {**stored, **self._values}
+                self._loaded = True
+                logger.info("Loaded %d checkpoints", len(stored))
+
+    async def get_last_id(self, source_name: str) -> Optional[str]:
+        await self._ensure_loaded()
+        return self._values.get(source_name)
+
+    async def update_last_id(self, source_name: str, last_id: str):
+        """Record a checkpoint in memory; it reaches the database on the next flush."""
+        if self._values.get(source_name) == last_id:
+            return
+        self._values[source_name] = last_id
+        self._dirty[source_name] = last_id
+
+    @property
+    def dirty(self) -> int:
+        return len(self._dirty)
+
+    async def flush(self):
+        """Write every dirty checkpoint in one batch; failed rows stay dirty."""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            pending, self._dirty = self._dirty, {}
+            try:
+                await self.repo.update_many(pending)
+            except Exception:
+                self.flush_errors += 1
+                FLUSH_ERRORS.inc()
+                # Newer values recorded during the failed write take precedence.
+                self._dirty = {**pending, **self._dirty}
+                raise
+            self.flushes += 1
+            self.flushed_rows += len(pending)
+            FLUSHED_ROWS.inc(len(pending))
+
+    def export_metrics(self):
+        """Scrape hook: copy the number of dirty checkpoints into its gauge."""
+        DIRTY.set(self.dirty)
+
+    async def run_async(self):
+        """Flush on a fixed interval until cancelled."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("Failed to flush %d checkpoints: %s", self.dirty, e)
+
+    async def close(self):
+        """Final flush at shutdown."""
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error("Lost %d checkpoints at shutdown: %s", self.dirty, e)
@@ -2,45 +2,129 @@
 from typing import Optional, Dict, List
 from src.datalayer.base_repository import BaseRepository
 
+# Rows sent per fast_executemany call when filling the staging table.
+STAGING_CHUNK = 10_000
+
+INSERT_IF_MISSING = """
+    IF NOT EXISTS (SELECT 1 FROM Companies WHERE company_name = ?)
+    INSERT INTO Companies (company_name, ticker_symbol)
+    VALUES (?, ?)
+"""
+
+# A session-scoped staging table with exactly the Companies column types.
+CREATE_STAGING = """
+    IF OBJECT_ID('tempdb..#CompanyStaging') IS NOT NULL DROP TABLE #CompanyStaging;
+    SELECT TOP 0 company_name, ticker_symbol INTO #CompanyStaging FROM Companies;
+"""
+
+# NCHAR(31)/NCHAR(30) separate fields and rows so no two tables hash alike;
+# NVARCHAR(MAX) keeps STRING_AGG from truncating at 4000 characters.
+FINGERPRINT = """
+    SELECT COUNT(*), CONVERT(VARCHAR(64), HASHBYTES('SHA2_256',
+        STRING_AGG(
+            CAST(CONCAT(company_name, NCHAR(31), COALESCE(ticker_symbol, NCHAR(29)))
+                AS NVARCHAR(MAX)),
+            NCHAR(30)
+        ) WITHIN GROUP (ORDER BY company_name)
+    ), 2)
+    FROM Companies
+"""
+
+INSERT_STAGING = "INSERT INTO #CompanyStaging (company_name, ticker_symbol) VALUES (?, ?)"
+
+# {matched} is either an UPDATE clause or empty (insert-only).
+MERGE_FROM_STAGING = """
+    SET NOCOUNT ON;
+    DECLARE @actions TABLE (action NVARCHAR(10));
+    MERGE Companies AS target
+    USING (
+        SELECT company_name, MAX(ticker_symbol) AS ticker_symbol
+        FROM #CompanyStaging
+        GROUP BY company_name
+    ) AS src
+    ON target.company_name = src.company_name
+    {matched}
+    WHEN NOT MATCHED THEN
+        INSERT (company_name, ticker_symbol) VALUES (src.company_name, src.ticker_symbol)
+    OUTPUT $action INTO @actions;
+    DROP TABLE #CompanyStaging;
+    SELECT
+        COALESCE(SUM(CASE WHEN action = 'INSERT' THEN 1 ELSE 0 END), 0),
+        COALESCE(SUM(CASE WHEN action = 'UPDATE' THEN 1 ELSE 0 END), 0)
+    FROM @actions;
+"""
+
+UPDATE_CHANGED_TICKER = """
+    WHEN MATCHED AND (target.ticker_symbol IS NULL
+                      OR target.ticker_symbol <> src.ticker_symbol) THEN
+        UPDATE SET target.ticker_symbol = src.ticker_symbol
+"""
+
 
 class CompanyRepository(BaseRepository):
     """Repository for accessing and managing the Companies table."""
 
-    def get_all(self) -> List[Dict[str, str]]:
+    async def get_all(self) -> List[Dict[str, str]]:
         """Return all companies."""
-        rows = self.fetch_all("SELECT company_name, ticker_symbol FROM Companies")
+        rows = await self.fetch_all("SELECT company_name, ticker_symbol FROM Companies")
         return [{"company_name": r[0], "ticker_symbol": r[1]} for r in rows]
 
-    def get_ticker_by_name(self, company_name: str) -> Optional[str]:
+    async def get_fingerprint(self) -> str:
+        """
+        Return a fingerprint of the table's contents (row count + SHA-256).
+
+        The hash covers every row in name order. CHECKSUM_AGG XORs row checksums,
+        so changes that cancel out went unnoticed and a stale index was loaded.
+        """
+        row = await self.fetch_one(FINGERPRINT)
+        return f"{row[0]}:{row[1]}" if row else "0:None"
+
+    async def get_ticker_by_name(self, company_name: str) -> Optional[str]:
         """Fetch ticker symbol for a given company name."""
-        row = self.fetch_one(
+        row = await self.fetch_one(
             "SELECT ticker_symbol FROM Companies WHERE company_name = ?",
             (company_name,),
         )
         return row[0] if row else None
 
-    def insert(self, company_name: str, ticker_symbol: str):
+    async def insert(self, company_name: str, ticker_symbol: str):
         """Insert a new company if it doesn't exist."""
-        self.execute(
-            """
-            IF NOT EXISTS (SELECT 1 FROM Companies WHERE company_name = ?)
-            INSERT INTO Companies (company_name, ticker_symbol)
-            VALUES (?, ?)
-            """,
-            (company_name, company_name, ticker_symbol),
+        await self.execute(
+            INSERT_IF_MISSING, (company_name, company_name, ticker_symbol)
         )
 
-    def bulk_insert(self, companies: Dict[str, str]):
-        """Insert multiple companies (idempotent)."""
-        for name, ticker in companies.items():
-            self.execute(
-                """
-                IF NOT EXISTS (SELECT 1 FROM Companies WHERE company_name = ?)
-                INSERT INTO Companies (company_name, ticker_symbol)
-                VALUES (?, ?)
-                """,
-                (name, name, ticker),
-                commit=False,
+    async def bulk_insert(self, companies: Dict[str, str]) -> Dict[str, int]:
+        """Insert multiple companies, leaving existing names untouched (idempotent)."""
+        return await self.run(self._bulk_merge, companies, False)
+
+    async def bulk_upsert(self, companies: Dict[str, str]) -> Dict[str, int]:
+        """Insert new companies and update the ticker of existing ones."""
+        return await self.run(self._bulk_merge, companies, True)
+
+    def _bulk_merge(self, companies: Dict[str, str], update: bool) -> Dict[str, int]:
+        """
+        Stage all rows with ``fast_executemany`` and apply them with one MERGE.
+
+        Round trips grow with ``len(companies) / STAGING_CHUNK`` rather than
+        with the number of rows. Returns ``{"inserted": n, "updated": n}``.
+        """
+        if not companies:
+            return {"inserted": 0, "updated": 0}
+
+        rows = list(companies.items())
+        with self.db.acquire() as conn, conn.cursor() as cursor:
+            cursor.execute(CREATE_STAGING)
+            cursor.fast_executemany = True
+            for start in range(0, len(rows), STAGING_CHUNK):
+                cursor.executemany(INSERT_STAGING, rows[start:start + STAGING_CHUNK])
+            cursor.fast_executemany = False
+
+            cursor.execute(
+                MERGE_FROM_STAGING.format(
+                    matched=UPDATE_CHANGED_TICKER if update else ""
+                )
             )
+            inserted, updated = cursor.fetchone()
+            conn.commit()
 
-        self.db.connection.commit()
+        return {"inserted": inserted, "updated": updated}
@@ -1,25 +1,217 @@
+import asyncio
+import functools
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
 import pyodbc
+from src import metrics
+from src.logger import Logger
+
+logger = Logger.get("Database")
+
+POOL_STATS = metrics.gauge(
+    "db_pool", "Connection pool counters, see Database.metrics()", ["stat"]
+)
+
+T = TypeVar("T")
+
+# Errors after which a connection can no longer be trusted and is dropped from the pool.
+CONNECTION_ERRORS = (pyodbc.OperationalError, pyodbc.InterfaceError)
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the checkout timeout."""
 
 
 class Database:
-    """Centralized database connection manager."""
+    """Centralized database connection manager backed by a connection pool."""
 
-    def __init__(self, server: str, database: str, username: str, password: str):
+    def __init__(
+        self,
+        server: str,
+        database: str,
+        username: str,
+        password: str,
+        pool_size: int = 5,
+        checkout_timeout: float = 30.0,
+        health_check_after: float = 60.0,
+    ):
+        """
+        :param pool_size: Maximum number of open connections (and DB worker threads)
+        :param checkout_timeout: Seconds to wait for a free connection before failing
+        :param health_check_after: Idle seconds after which a connection is pinged on checkout
+        """
         self.server = server
         self.database = database
         self.username = username
         self.password = password
-        self._connection = None
+        self.pool_size = pool_size
+        self.checkout_timeout = checkout_timeout
+        self.health_check_after = health_check_after
+
+        # Each slot holds an idle (connection, last_used) pair, or None when the
+        # slot has no open connection yet. Taking a slot is the checkout.
+        self._slots: "queue.LifoQueue[Optional[Tuple[Any, float]]]" = queue.LifoQueue()
+        for _ in range(pool_size):
+            self._slots.put(None)
+
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, float] = {
+            "checkouts": 0,
+            "checkout_wait_total": 0.0,
+            "checkout_wait_max": 0.0,
+            "checkout_timeouts": 0,
+            "connects": 0,
+            "health_check_failures": 0,
+            "discarded": 0,
+            "in_use": 0,
+        }
+
+        # One worker per pooled connection: pyodbc connections are not shared
+        # between threads, so more workers than connections would only queue.
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="db"
+        )
 
     def connect(self):
-        if self._connection is None:
-            conn_str = (
-                f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-                f"SERVER={self.server};DATABASE={self.database};Trusted_Connection=yes;"
+        """Open a new raw connection."""
+        conn_str = (
+            f"DRIVER={{ODBC Driver 17 for SQL Server}};"
+            f"SERVER={self.server};DATABASE={self.database};Trusted_Connection=yes;"
+        )
+        conn = pyodbc.connect(conn_str)
+        self._bump("connects")
+        return conn
+
+    def _bump(self, name: str, amount: float = 1):
+        with self._lock:
+            self._metrics[name] += amount
+
+    def _is_healthy(self, conn, last_used: float) -> bool:
+        if getattr(conn, "closed", False):
+            return False
+        if time.monotonic() - last_used < self.health_check_after:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            return True
+        except pyodbc.Error:
+            return False
+
+    def _checkout(self):
+        started = time.monotonic()
+        try:
+            slot = self._slots.get(timeout=self.checkout_timeout)
+        except queue.Empty as exc:
+            self._bump("checkout_timeouts")
+            raise PoolTimeout(
+                f"No database connection available after {self.checkout_timeout}s"
+            ) from exc
+
+        waited = time.monotonic() - started
+        with self._lock:
+            self._metrics["checkouts"] += 1
+            self._metrics["checkout_wait_total"] += waited
+            self._metrics["checkout_wait_max"] = max(
+                self._metrics["checkout_wait_max"], waited
             )
-            self._connection = pyodbc.connect(conn_str)
-        return self._connection
+            self._metrics["in_use"] += 1
+
+        try:
+            if slot is not None:
+                conn, last_used = slot
+                if self._is_healthy(conn, last_used):
+                    return conn
+                self._bump("health_check_failures")
+                logger.warning("Discarding unhealthy database connection; reconnecting.")
+                self._close_quietly(conn)
+            return self.connect()
+        except Exception:
+            self._release(None)
+            raise
+
+    def _release(self, conn):
+        self._bump("in_use", -1)
+        self._slots.put((conn, time.monotonic()) if conn is not None else None)
+
+    def _discard(self, conn):
+        self._bump("discarded")
+        self._close_quietly(conn)
+        self._release(None)
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except pyodbc.Error:
+            pass
+
+    @contextmanager
+    def acquire(self) -> Iterator[Any]:
+        """
+        Borrow a pooled connection for the duration of the block.
+
+        Connections that fail with a connection-level error are closed and
+        replaced on the next checkout; otherwise any open transaction is rolled
+        back before the connection goes back into the pool, so work the block
+        did not commit never leaks into the next borrower's transaction.
+        """
+        conn = self._checkout()
+        try:
+            yield conn
+        except CONNECTION_ERRORS:
+            self._discard(conn)
+            raise
+        except BaseException:
+            self._reset(conn)
+            raise
+        else:
+            self._reset(conn)
+
+    def _reset(self, conn):
+        """Roll back whatever the borrower left open and return the connection."""
+        try:
+            conn.rollback()
+        except pyodbc.Error:
+            self._discard(conn)
+        else:
+            self._release(conn)
+
+    def metrics(self) -> Dict[str, float]:
+        """Return pool counters, including checkout wait totals."""
+        with self._lock:
+            snapshot = dict(self._metrics)
+        checkouts = snapshot["checkouts"]
+        snapshot["checkout_wait_avg"] = (
+            snapshot["checkout_wait_total"] / checkouts if checkouts else 0.0
+        )
+        snapshot["pool_size"] = self.pool_size
+        return snapshot
+
+    def export_metrics(self):
+        """Scrape hook: copy the pool counters into the ``db_pool`` gauge."""
+        for stat, value in self.metrics().items():
+            POOL_STATS.set(value, stat=stat)
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking database call on the dedicated executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args)
+        )
 
-    @property
-    def connection(self):
-        return self.connect()
+    def close(self):
+        """Stop the executor and close every idle connection."""
+        self._executor.shutdown(wait=True)
+        while True:
+            try:
+                slot = self._slots.get_nowait()
+            except queue.Empty:
+                break
+            if slot is not None:
+                self._close_quietly(slot[0])
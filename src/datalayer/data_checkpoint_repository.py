@@ -1,20 +1,23 @@
 # src/datalayer/data_checkpoint_repository.py
-from typing import Optional
+from typing import Dict, Optional
 from src.datalayer.base_repository import BaseRepository
 
+# Rows per batched MERGE; two parameters each keeps well under SQL Server's 2100.
+MERGE_CHUNK = 500
+
 
 class DataCheckpointRepository(BaseRepository):
     """Repository for persisting latest processed IDs for any data source."""
 
-    def get_last_id(self, source_name: str) -> Optional[str]:
-        row = self.fetch_one(
+    async def get_last_id(self, source_name: str) -> Optional[str]:
+        row = await self.fetch_one(
             "SELECT last_id FROM DataCheckpoint WHERE source_name = ?",
             (source_name,),
         )
         return str(row[0]) if row else None
 
-    def update_last_id(self, source_name: str, last_id: str):
-        self.execute(
+    async def update_last_id(self, source_name: str, last_id: str):
+        await self.execute(
             """
             MERGE DataCheckpoint AS target
             USING (SELECT ? AS source_name, ? AS last_id) AS src
@@ -26,3 +29,32 @@ class DataCheckpointRepository(BaseRepository):
             """,
             (source_name, last_id),
         )
+
+    async def get_all(self) -> Dict[str, str]:
+        """Return every checkpoint as ``{source_name: last_id}``."""
+        rows = await self.fetch_all("SELECT source_name, last_id FROM DataCheckpoint")
+        return {row[0]: str(row[1]) for row in rows}
+
+    async def update_many(self, checkpoints: Dict[str, str]):
+        """Upsert several checkpoints in one transaction, one MERGE per chunk."""
+        if checkpoints:
+            await self.run(self._update_many, list(checkpoints.items()))
+
+    def _update_many(self, rows):
+        with self.db.acquire() as conn, conn.cursor() as cursor:
+            for start in range(0, len(rows), MERGE_CHUNK):
+                chunk = rows[start:start + MERGE_CHUNK]
+                values = ", ".join("(?, ?)" for _ in chunk)
+                cursor.execute(
+                    f"""
+                    MERGE DataCheckpoint AS target
+                    USING (VALUES {values}) AS src (source_name, last_id)
+                    ON target.source_name = src.source_name
+                    WHEN MATCHED THEN
+                        UPDATE SET target.last_id = src.last_id, updated_at = GETDATE()
+                    WHEN NOT MATCHED THEN
+                        INSERT (source_name, last_id) VALUES (src.source_name, src.last_id);
+                    """,
+                    [value for row in chunk for value in row],
+                )
+            conn.commit()
@@ -4,7 +4,10 @@ from src.datalayer.company_repository import CompanyRepository
 from src.utilities.constants import COMPANIES
 
 
-def seed_companies(db: Database):
+async def seed_companies(db: Database):
     repo = CompanyRepository(db)
-    repo.bulk_insert(COMPANIES)
-    print(f"Inserted {len(COMPANIES)} companies successfully!")
+    counts = await repo.bulk_upsert(COMPANIES)
+    print(
+        f"Seeded {len(COMPANIES)} companies: "
+        f"{counts['inserted']} inserted, {counts['updated']} updated."
+    )
@@ -0,0 +1,123 @@
+# symbol_master.py
+"""
+Stream a symbol master file into the Companies table and the company parser.
+
+Supported formats, chosen by file extension:
+
+* CSV with a header row: ``ticker,name[,aliases]``, where aliases are separated by ``|``
+* JSONL, one object per line: ``{"ticker": ..., "name": ..., "aliases": [...]}``
+
+``symbol`` and ``company_name`` are accepted in place of ``ticker`` and
+``name``. Each name and alias becomes one ``(name, ticker)`` row. Rows are
+read and written in chunks, so memory stays flat whatever the file size.
+
+    python -m src.datalayer.seed.symbol_master symbols.csv
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from dotenv import load_dotenv
+from src.logger import Logger
+from src.datalayer.connection import Database
+from src.datalayer.company_repository import CompanyRepository
+
+logger = Logger.get("SymbolMaster")
+
+Row = Tuple[str, str]
+
+
+def _records(path: str) -> Iterator[Dict]:
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.warning("Skipping %s line %d: %s", path, line_no, e)
+        else:
+            yield from csv.DictReader(f)
+
+
+def _rows(record: Dict) -> List[Row]:
+    ticker = (record.get("ticker") or record.get("symbol") or "").strip().upper()
+    if not ticker:
+        return []
+    aliases = record.get("aliases") or []
+    if isinstance(aliases, str):
+        aliases = aliases.split("|")
+    names = [record.get("name") or record.get("company_name") or "", *aliases]
+    return [(name.strip(), ticker) for name in names if name and name.strip()]
+
+
+def iter_symbol_master(path: str, chunk_size: int = 5000) -> Iterator[List[Row]]:
+    """Yield ``(name, ticker)`` rows from ``path`` in lists of up to ``chunk_size``."""
+    chunk: List[Row] = []
+    for record in _records(path):
+        chunk.extend(_rows(record))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def load_symbol_master(
+    path: str,
+    repo: Optional[CompanyRepository] = None,
+    parser=None,
+    chunk_size: int = 5000,
+) -> Dict[str, int]:
+    """
+    Stream ``path`` into the Companies table and/or a CompanyParserService.
+
+    :param repo: Repository to upsert into (skipped when None)
+    :param parser: Parser whose keyword processor is extended (skipped when None)
+    :return: Totals of rows read and rows inserted/updated in the database
+    """
+    totals = {"rows": 0, "inserted": 0, "updated": 0}
+    for chunk in iter_symbol_master(path, chunk_size):
+        totals["rows"] += len(chunk)
+        if repo is not None:
+            counts = await repo.bulk_upsert(dict(chunk))
+            totals["inserted"] += counts["inserted"]
+            totals["updated"] += counts["updated"]
+        if parser is not None:
+            parser.add_companies(chunk)
+        logger.debug("Loaded %d rows from %s", totals["rows"], path)
+
+    logger.info(
+        "Loaded %d rows from %s (%d inserted, %d updated)",
+        totals["rows"], path, totals["inserted"], totals["updated"],
+    )
+    return totals
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load a symbol master into Companies.")
+    parser.add_argument("path", help="CSV or JSONL symbol master")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    load_dotenv(dotenv_path=Path(__file__).resolve().parents[3] / ".env")
+    db = Database(
+        server=os.getenv("SQL_SERVER"),
+        database=os.getenv("SQL_DATABASE"),
+        username=os.getenv("SQL_USERNAME"),
+        password=os.getenv("SQL_PASSWORD"),
+        pool_size=1,
+    )
+    try:
+        await load_symbol_master(args.path, CompanyRepository(db), chunk_size=args.chunk_size)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
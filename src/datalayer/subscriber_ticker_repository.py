@@ -0,0 +1,40 @@
+# src/datalayer/subscriber_ticker_repository.py
+from typing import List, Tuple
+from src.datalayer.base_repository import BaseRepository
+
+
+class SubscriberTickerRepository(BaseRepository):
+    """
+    Repository for the SubscriberTickers table (one row per followed ticker):
+
+        CREATE TABLE SubscriberTickers (
+            user_id BIGINT NOT NULL,
+            ticker_symbol NVARCHAR(20) NOT NULL,
+            created_at DATETIME NOT NULL DEFAULT GETDATE(),
+            PRIMARY KEY (user_id, ticker_symbol)
+        );
+    """
+
+    async def get_all(self) -> List[Tuple[int, str]]:
+        rows = await self.fetch_all("SELECT user_id, ticker_symbol FROM SubscriberTickers")
+        return [(row[0], row[1]) for row in rows]
+
+    async def follow(self, user_id: int, ticker: str):
+        await self.execute(
+            """
+            IF NOT EXISTS (
+                SELECT 1 FROM SubscriberTickers WHERE user_id = ? AND ticker_symbol = ?
+            )
+            INSERT INTO SubscriberTickers (user_id, ticker_symbol) VALUES (?, ?)
+            """,
+            (user_id, ticker, user_id, ticker),
+        )
+
+    async def unfollow(self, user_id: int, ticker: str):
+        await self.execute(
+            "DELETE FROM SubscriberTickers WHERE user_id = ? AND ticker_symbol = ?",
+            (user_id, ticker),
+        )
+
+    async def unfollow_all(self, user_id: int):
+        await self.execute("DELETE FROM SubscriberTickers WHERE user_id = ?", (user_id,))
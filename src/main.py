@@ -7,7 +7,17 @@ from src.services.company_parser_service import CompanyParserService
 from src.services.discord_bot_service import DiscordBotService
 from src.services.reddit_service import RedditService
 from src.services.news_service import NewsService
+from src.services.company_news_service import CompanyNewsService
+from src.services.mention_tracker import MentionTracker
+from src.utilities.poll_scheduler import PollScheduler
+from src.utilities.profiler import Profiler, install_signal_handlers
+from src.utilities.token_bucket import TokenBucket
 from src.datalayer.connection import Database
+from src.datalayer.checkpoint_store import CheckpointStore
+from src.datalayer.data_checkpoint_repository import DataCheckpointRepository
+from src import metrics
+from src.api.http_client import close_http_client
+from src.cache.async_redis_cache import close_pools
 
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
@@ -21,6 +31,17 @@ SQL_SERVER = str(os.getenv("SQL_SERVER"))
 SQL_DATABASE = str(os.getenv("SQL_DATABASE"))
 SQL_USERNAME = str(os.getenv("SQL_USERNAME"))
 SQL_PASSWORD = str(os.getenv("SQL_PASSWORD"))
+SQL_POOL_SIZE = int(os.getenv("SQL_POOL_SIZE") or 5)
+
+FINNHUB_CALLS_PER_MINUTE = int(os.getenv("FINNHUB_CALLS_PER_MINUTE") or 60)
+CHECKPOINT_FLUSH_INTERVAL = float(os.getenv("CHECKPOINT_FLUSH_INTERVAL") or 5)
+
+# Prometheus text endpoint; METRICS_PORT=0 turns it off.
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT") or 9108)
+
+# Window of a profile started with SIGUSR1 (CPU) or SIGUSR2 (memory)
+PROFILE_SECONDS = float(os.getenv("PROFILE_SECONDS") or 30)
 
 
 async def main():
@@ -29,27 +50,93 @@ async def main():
         database=SQL_DATABASE,
         username=SQL_USERNAME,
         password=SQL_PASSWORD,
+        pool_size=SQL_POOL_SIZE,
     )
 
     company_parser = CompanyParserService(db)
+    await company_parser.load()
 
     # Create bot
-    bot = DiscordBotService(db=db, channel_id=CHANNEL_ID, guild_id=SERVER_ID)
+    profiler = Profiler()
+    install_signal_handlers(profiler, PROFILE_SECONDS)
+    bot = DiscordBotService(
+        db=db, channel_id=CHANNEL_ID, guild_id=SERVER_ID, profiler=profiler
+    )
+
+    # Every Finnhub caller draws from the same per-minute budget
+    finnhub_budget = TokenBucket.per_minute(FINNHUB_CALLS_PER_MINUTE)
+    mention_tracker = MentionTracker()
+    checkpoints = CheckpointStore(
+        DataCheckpointRepository(db), flush_interval=CHECKPOINT_FLUSH_INTERVAL
+    )
 
     # Other services
     news_service = NewsService(
-        interval=30, bot=bot, max_items=10, company_parser=company_parser, db=db
+        interval=30,
+        bot=bot,
+        max_items=10,
+        company_parser=company_parser,
+        db=db,
+        rate_limiter=finnhub_budget,
+        mention_tracker=mention_tracker,
+        checkpoints=checkpoints,
+    )
+
+    company_news_service = CompanyNewsService(
+        db=db,
+        news_service=news_service,
+        rate_limiter=finnhub_budget,
+        subscriber_count=bot.subscribers.follower_count,
     )
 
     reddit_service = RedditService(
         db=db,
         discord_bot=bot,
         interval=30,
+        company_parser=company_parser,
+        checkpoints=checkpoints,
     )
 
-    await asyncio.gather(
-        bot.start(TOKEN), news_service.run_async(), reddit_service.run_async()
-    )
+    # Feed pollers share one adaptive scheduler
+    scheduler = PollScheduler()
+    news_service.schedule(scheduler)
+    reddit_service.schedule(scheduler)
+    await news_service.connect()
+
+    # Gauges are refreshed from live state on every scrape
+    for component in (
+        db,
+        bot.dispatcher,
+        scheduler,
+        checkpoints,
+        news_service.pipeline,
+        reddit_service.pipeline,
+    ):
+        metrics.on_scrape(component.export_metrics)
+    metrics_server = None
+    if METRICS_PORT:
+        metrics_server = metrics.MetricsServer(METRICS_HOST, METRICS_PORT)
+        await metrics_server.start()
+
+    try:
+        await asyncio.gather(
+            bot.start(TOKEN),
+            bot.subscribers.run_async(),
+            bot.dispatcher.run_async(),
+            scheduler.run_async(),
+            checkpoints.run_async(),
+            news_service.pipeline.run_async(),
+            reddit_service.pipeline.run_async(),
+            company_news_service.run_async(),
+        )
+    finally:
+        if metrics_server is not None:
+            await metrics_server.stop()
+        await checkpoints.close()
+        db.close()
+        await close_http_client()
+        await close_pools()
+        company_parser.close()
 
 
 if __name__ == "__main__":
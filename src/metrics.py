@@ -0,0 +1,285 @@
+"""
+metrics.py
+
+Process-wide counters, gauges and histograms, exposed in the Prometheus text
+format on a small local HTTP endpoint.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from aiohttp import web
+from src.logger import Logger
+
+logger = Logger.get("Metrics")
+
+PREFIX = "newstracker_"
+
+# Seconds; spans a Redis round trip up to a slow upstream poll.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    """A named metric with a fixed set of label names."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = PREFIX + name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _values(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(
+                f"{self.name} expects labels {self.label_names}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[n]) for n in self.label_names)
+
+    @abstractmethod
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Return ``(sample name, rendered labels, value)`` for every series."""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(
+            f"{name}{labels} {_format_value(value)}"
+            for name, labels, value in self.samples()
+        )
+        return lines
+
+
+class Counter(Metric):
+    """Monotonic count, e.g. requests or errors."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._counts: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._values(labels)
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._counts.get(self._values(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._counts.items())
+        return [(self.name, _format_labels(self.label_names, k), v) for k, v in items]
+
+
+class Gauge(Metric):
+    """Current value, e.g. a queue depth; usually set by a scrape hook."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values_by_key: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str):
+        key = self._values(labels)
+        with self._lock:
+            self._values_by_key[key] = value
+
+    def value(self, **labels: str) -> float:
+        return self._values_by_key.get(self._values(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values_by_key.items())
+        return [(self.name, _format_labels(self.label_names, k), v) for k, v in items]
+
+
+class Histogram(Metric):
+    """Distribution of observed values (latencies) in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # Per label set: [bucket counts..., sum, count]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._values(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the block (also when it raises)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> float:
+        series = self._series.get(self._values(labels))
+        return series[-1] if series else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        out = []
+        for key, series in items:
+            cumulative = 0.0
+            for bound, hits in zip(self.buckets, series):
+                cumulative += hits
+                labels = _format_labels(
+                    self.label_names + ("le",), key + (_format_value(bound),)
+                )
+                out.append((f"{self.name}_bucket", labels, cumulative))
+            labels = _format_labels(self.label_names, key)
+            out.append((f"{self.name}_sum", labels, series[-2]))
+            out.append((f"{self.name}_count", labels, series[-1]))
+        return out
+
+
+class Registry:
+    """All metrics of the process plus hooks that refresh gauges before a scrape."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._hooks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if (
+                    type(existing) is not type(metric)
+                    or existing.label_names != metric.label_names
+                ):
+                    raise ValueError(f"Metric {metric.name} already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def on_scrape(self, hook: Callable[[], None]):
+        """Call ``hook`` before every scrape, e.g. to copy queue depths into gauges."""
+        self._hooks.append(hook)
+
+    def render(self) -> str:
+        for hook in list(self._hooks):
+            try:
+                hook()
+            except Exception as e:
+                logger.warning(
+                    "Metrics hook %s failed: %s", getattr(hook, "__qualname__", hook), e
+                )
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+    """Return the process-wide counter ``name``, creating it on first use."""
+    return REGISTRY.register(Counter(name, help, labels))
+
+
+def gauge(name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+    """Return the process-wide gauge ``name``, creating it on first use."""
+    return REGISTRY.register(Gauge(name, help, labels))
+
+
+def histogram(
+    name: str,
+    help: str,
+    labels: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    """Return the process-wide histogram ``name``, creating it on first use."""
+    return REGISTRY.register(Histogram(name, help, labels, buckets))
+
+
+def on_scrape(hook: Callable[[], None]):
+    REGISTRY.on_scrape(hook)
+
+
+class MetricsServer:
+    """Serves ``GET /metrics`` from a registry on a local port."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 9108,
+        registry: Optional[Registry] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.registry = registry or REGISTRY
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _handle(self, _request: web.Request) -> web.Response:
+        return web.Response(
+            body=self.registry.render().encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Port 0 binds an ephemeral port; report the real one.
+        self.port = self._runner.addresses[0][1]
+        logger.info("Serving metrics on http://%s:%d/metrics", self.host, self.port)
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
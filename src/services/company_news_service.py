@@ -0,0 +1,182 @@
+"""
+company_news_service.py
+
+Polls Finnhub's per-ticker company news for every company in the Companies
+table, spreading the calls over a shared token bucket.
+"""
+
+import asyncio
+import heapq
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from src.logger import Logger
+from src.api.finnhub_news_api import fetch_company_news
+from src.datalayer.company_repository import CompanyRepository
+from src.datalayer.connection import Database
+from src.services.mention_tracker import MentionTracker
+from src.services.news_service import NewsService
+from src.utilities.token_bucket import TokenBucket
+
+logger = Logger.get("CompanyNewsService")
+
+
+class CompanyNewsService:
+    """
+    Schedules ``/company-news`` polls per ticker.
+
+    Each ticker is due again after ``base_interval / weight`` seconds, clamped to
+    ``[min_interval, max_interval]``, where the weight grows with the number of
+    subscribers following the ticker and its recent mention activity. Due tickers
+    are polled in order of due time, and every call waits on the shared token
+    bucket so the Finnhub budget is never exceeded. A ticker whose poll fails
+    backs off like a PollScheduler source: its interval doubles per consecutive
+    failure, up to ``max_interval``.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        news_service: NewsService,
+        rate_limiter: TokenBucket,
+        api_key: Optional[str] = None,
+        mention_tracker: Optional[MentionTracker] = None,
+        subscriber_count: Optional[Callable[[str], int]] = None,
+        base_interval: float = 900.0,
+        min_interval: float = 60.0,
+        max_interval: float = 3600.0,
+        first_fetch_items: int = 3,
+        universe_refresh: float = 3600.0,
+    ):
+        """
+        :param news_service: Service whose dedupe/parse/notify path results go through
+        :param rate_limiter: Token bucket shared with every other Finnhub caller
+        :param mention_tracker: Source of recent mention activity per ticker
+        :param subscriber_count: Returns how many subscribers follow a ticker
+        :param base_interval: Poll interval in seconds for a ticker with weight 1
+        :param first_fetch_items: Items notified for a ticker that has no checkpoint yet
+        :param universe_refresh: Seconds between reloads of the Companies table
+        """
+        self.api_key = api_key or os.getenv("FINNHUB_API_KEY")
+        self.repo = CompanyRepository(db)
+        self.news_service = news_service
+        self.rate_limiter = rate_limiter
+        self.mention_tracker = mention_tracker or news_service.mention_tracker
+        self.subscriber_count = subscriber_count
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.first_fetch_items = first_fetch_items
+        self.universe_refresh = universe_refresh
+        self._schedule: List[Tuple[float, str]] = []
+        self._failures: Dict[str, int] = {}
+
+    @staticmethod
+    def source_name(ticker: str) -> str:
+        return f"finnhub_company_{ticker}"
+
+    def weight(self, ticker: str) -> float:
+        weight = 1.0
+        if self.subscriber_count:
+            weight += self.subscriber_count(ticker)
+        if self.mention_tracker:
+            weight += self.mention_tracker.score(ticker)
+        return weight
+
+    def interval_for(self, ticker: str) -> float:
+        interval = self.base_interval / self.weight(ticker)
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def next_interval(self, ticker: str, failed: bool) -> float:
+        """Interval until ``ticker`` is polled again, after a successful or failed poll."""
+        if not failed:
+            self._failures.pop(ticker, None)
+            return self.interval_for(ticker)
+        failures = self._failures[ticker] = self._failures.get(ticker, 0) + 1
+        return min(self.max_interval, self.interval_for(ticker) * 2 ** failures)
+
+    def cadence(self) -> Dict[str, float]:
+        """Return the current poll interval in seconds for every scheduled ticker."""
+        return {ticker: self.interval_for(ticker) for _, ticker in self._schedule}
+
+    async def load_universe(self):
+        """(Re)build the schedule from the Companies table, keeping existing due times."""
+        loop = asyncio.get_running_loop()
+        tickers = {c["ticker_symbol"] for c in await self.repo.get_all() if c["ticker_symbol"]}
+        due = {ticker: at for at, ticker in self._schedule if ticker in tickers}
+        self._failures = {t: n for t, n in self._failures.items() if t in tickers}
+        now = loop.time()
+        # Stagger new tickers over one minimum interval instead of firing them all at once.
+        new = sorted(tickers - due.keys())
+        for i, ticker in enumerate(new):
+            due[ticker] = now + self.min_interval * i / max(1, len(new))
+        self._schedule = [(at, ticker) for ticker, at in due.items()]
+        heapq.heapify(self._schedule)
+        logger.info("Scheduling company news for %d tickers", len(self._schedule))
+
+    async def poll_ticker(self, ticker: str) -> int:
+        """Fetch company news for ``ticker`` and queue it on the news pipeline; returns items queued."""
+        source_name = self.source_name(ticker)
+        last_seen = await self.news_service.get_checkpoint(source_name)
+
+        today = datetime.now(timezone.utc).date()
+        start = (
+            datetime.fromtimestamp(last_seen, timezone.utc).date()
+            if last_seen
+            else today - timedelta(days=1)
+        )
+
+        await self.rate_limiter.acquire()
+        news = await fetch_company_news(
+            self.api_key, ticker, start.isoformat(), today.isoformat()
+        )
+        if not last_seen:
+            news = sorted(news, key=lambda n: n.get("datetime", 0), reverse=True)
+            news = news[: self.first_fetch_items]
+        for item in news:
+            item["companies"] = [ticker]
+
+        return await self.news_service.ingest(
+            news, source_name, last_seen, key="datetime"
+        )
+
+    async def run_async(self):
+        """Poll tickers as they come due, until cancelled."""
+        if not self.api_key:
+            logger.warning("FINNHUB_API_KEY not set. Company news polling disabled.")
+            return
+
+        loop = asyncio.get_running_loop()
+        logger.info("Company News Service started.")
+        await self.load_universe()
+        next_refresh = loop.time() + self.universe_refresh
+
+        while True:
+            now = loop.time()
+            if now >= next_refresh:
+                try:
+                    await self.load_universe()
+                except Exception as e:
+                    logger.error("Failed to reload company universe: %s", e)
+                next_refresh = now + self.universe_refresh
+
+            if not self._schedule:
+                await asyncio.sleep(self.min_interval)
+                continue
+
+            due, ticker = self._schedule[0]
+            if due > now:
+                await asyncio.sleep(min(due - now, next_refresh - now))
+                continue
+
+            heapq.heappop(self._schedule)
+            failed = False
+            try:
+                queued = await self.poll_ticker(ticker)
+                if queued:
+                    logger.info("Company news for %s: %d items queued", ticker, queued)
+            except Exception as e:
+                failed = True
+                logger.error("Error polling company news for %s: %s", ticker, e)
+            interval = self.next_interval(ticker, failed)
+            heapq.heappush(self._schedule, (loop.time() + interval, ticker))
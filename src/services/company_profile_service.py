@@ -0,0 +1,147 @@
+"""
+company_profile_service.py
+
+Read-through cache of Finnhub company profiles used to enrich news items.
+"""
+
+import asyncio
+import json
+from typing import Dict, Iterable, List, Optional
+from src.api.finnhub_company_api import fetch_company_profile
+from src.cache.async_redis_cache import AsyncRedisCache
+from src.logger import Logger
+from src.utilities.token_bucket import TokenBucket
+
+logger = Logger.get("CompanyProfileService")
+
+# Finnhub profile2 field -> field attached to news items
+PROFILE_FIELDS = {
+    "name": "name",
+    "finnhubIndustry": "sector",
+    "marketCapitalization": "market_cap",
+    "logo": "logo",
+}
+
+
+class CompanyProfileService:
+    """
+    Looks up company profiles through the ``company`` cache namespace.
+
+    Concurrent misses for the same symbol share one in-flight fetch, and at most
+    ``max_concurrency`` profile requests are outstanding at a time. Symbols
+    Finnhub has no profile for are cached as missing for ``negative_ttl``;
+    failed requests are not cached at all.
+    """
+
+    def __init__(
+        self,
+        cache: AsyncRedisCache,
+        api_key: Optional[str],
+        rate_limiter: Optional[TokenBucket] = None,
+        ttl: int = 24 * 3600,
+        negative_ttl: int = 3600,
+        max_concurrency: int = 4,
+    ):
+        """
+        :param cache: Cache for the ``company`` namespace
+        :param api_key: Finnhub API key (lookups are skipped without one)
+        :param rate_limiter: Shared Finnhub budget each fetch draws from
+        :param ttl: Seconds a profile stays cached
+        :param negative_ttl: Seconds an unknown symbol stays cached as missing
+        :param max_concurrency: Maximum profile requests in flight
+        """
+        self.cache = cache
+        self.api_key = api_key
+        self.rate_limiter = rate_limiter
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.fetches = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def _key(symbol: str) -> str:
+        return f"profile:{symbol}"
+
+    async def get_profiles(self, symbols: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """Return ``{symbol: profile or None}``, reading all cached ones in one call."""
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        if not symbols:
+            return {}
+        cached = await self.cache.get_many([self._key(s) for s in symbols])
+
+        profiles: Dict[str, Optional[Dict]] = {}
+        misses = []
+        for symbol, raw in zip(symbols, cached):
+            if raw is None:
+                misses.append(symbol)
+            else:
+                # An empty string marks a symbol Finnhub has no profile for.
+                profiles[symbol] = json.loads(raw) if raw else None
+
+        fetched = await asyncio.gather(*(self._fetch_shared(s) for s in misses))
+        profiles.update(zip(misses, fetched))
+        return profiles
+
+    async def get_profile(self, symbol: str) -> Optional[Dict]:
+        return (await self.get_profiles([symbol]))[symbol.upper()]
+
+    async def enrich(self, articles: List[Dict]):
+        """Attach ``profiles`` ({ticker: profile}) to every article with companies."""
+        symbols = {c for a in articles for c in a.get("companies") or []}
+        if not symbols or not self.api_key:
+            return
+        profiles = await self.get_profiles(symbols)
+        for article in articles:
+            article["profiles"] = {
+                c: profiles[c.upper()]
+                for c in article.get("companies") or []
+                if profiles.get(c.upper())
+            }
+
+    def _fetch_shared(self, symbol: str) -> asyncio.Future:
+        """Join the in-flight fetch for ``symbol`` or start one."""
+        future = self._inflight.get(symbol)
+        if future is not None:
+            self.coalesced += 1
+            return future
+        future = asyncio.ensure_future(self._fetch(symbol))
+        self._inflight[symbol] = future
+        future.add_done_callback(lambda _: self._inflight.pop(symbol, None))
+        return future
+
+    async def _fetch(self, symbol: str) -> Optional[Dict]:
+        async with self._semaphore:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            self.fetches += 1
+            data = await fetch_company_profile(symbol, self.api_key)
+
+        if data is None:
+            return None
+        if not data.get("name"):
+            await self.cache.set(self._key(symbol), "", ex=self.negative_ttl)
+            return None
+
+        profile = {field: data.get(source) for source, field in PROFILE_FIELDS.items()}
+        await self.cache.set(self._key(symbol), json.dumps(profile), ex=self.ttl)
+        return profile
+
+
+def describe(ticker: str, profile: Optional[Dict]) -> str:
+    """Short label such as ``NVDA (NVIDIA Corp, Semiconductors, $3.1T)``."""
+    if not profile:
+        return ticker
+    details = [profile.get("name"), profile.get("sector")]
+    market_cap = profile.get("market_cap")
+    if market_cap:
+        # Finnhub reports market capitalization in millions of USD.
+        value = market_cap * 1_000_000
+        for unit, size in (("T", 1e12), ("B", 1e9), ("M", 1e6)):
+            if value >= size:
+                details.append(f"${value / size:.1f}{unit}")
+                break
+    details = [d for d in details if d]
+    return f"{ticker} ({', '.join(details)})" if details else ticker
@@ -1,18 +1,56 @@
+import re
+from typing import Iterable, List, Optional
 import discord
 from discord import TextChannel
 from src.datalayer.connection import Database
 from src.datalayer.subscriber_repository import SubscriberRepository
+from src.datalayer.subscriber_ticker_repository import SubscriberTickerRepository
+from src.services.subscriber_registry import SubscriberRegistry
+from src.services.message_dispatcher import MessageDispatcher
+from src.utilities.profiler import CPU_MODES, Profiler, ProfilerBusy
+
+# Discord rejects messages longer than this.
+MAX_MESSAGE_LENGTH = 2000
+TICKER_PATTERN = re.compile(r"^[A-Z0-9.\-]{1,10}$")
+
+
+def split_mentions(user_ids: Iterable[int], message: str) -> List[str]:
+    """Build messages of ``mentions + message`` that each fit Discord's length limit."""
+    room = MAX_MESSAGE_LENGTH - len(message) - 1
+    chunks, current = [], ""
+    for uid in sorted(user_ids):
+        mention = f"<@{uid}>"
+        if current and len(current) + 1 + len(mention) > room:
+            chunks.append(current)
+            current = mention
+        else:
+            current = f"{current} {mention}" if current else mention
+    if current:
+        chunks.append(current)
+    return [f"{mentions} {message}" for mentions in chunks]
 
 
 class DiscordBotService(discord.Bot):
     """Discord bot that pings users and supports slash commands."""
 
-    def __init__(self, db: Database, channel_id: int, guild_id: int):
+    def __init__(
+        self,
+        db: Database,
+        channel_id: int,
+        guild_id: int,
+        profiler: Optional[Profiler] = None,
+    ):
         intents = discord.Intents.all()
         super().__init__(intents=intents)
 
         self.db = db
         self.subscriber_repository = SubscriberRepository(db)
+        self.subscribers = SubscriberRegistry(
+            self.subscriber_repository,
+            ticker_repo=SubscriberTickerRepository(db),
+        )
+        self.dispatcher = MessageDispatcher()
+        self.profiler = profiler or Profiler()
         self.channel_id = channel_id
         self.guild_id = guild_id
         self._register_commands()
@@ -21,13 +59,26 @@ class DiscordBotService(discord.Bot):
         print(f"Bot online as {self.user}")
         await self.ping_users("Bot is now online!")
 
-    async def ping_users(self, message: str):
-        """Ping all subscribers."""
-        user_ids = self.subscriber_repository.get_all()
+    async def ping_users(self, message: str, tickers: Optional[Iterable[str]] = None):
+        """
+        Queue a message for the dispatcher, pinging the users it concerns.
+
+        Without ``tickers`` every subscriber is pinged. With ``tickers`` only
+        their followers and subscribers without a watchlist are; nothing is
+        sent when nobody matches.
+        """
+        if not self.subscribers.loaded:
+            await self.subscribers.load()
+        if tickers is None:
+            user_ids = self.subscribers.get_all()
+        else:
+            user_ids = self.subscribers.route(tickers)
+            if not user_ids:
+                return
         channel = self.get_channel(self.channel_id)
         if isinstance(channel, TextChannel):
-            mentions = " ".join(f"<@{uid}>" for uid in user_ids)
-            await channel.send(f"{mentions} {message}")
+            for content in split_mentions(user_ids, message) or [message]:
+                self.dispatcher.submit(channel, content)
 
     def _register_commands(self):
         """Define all slash commands here."""
@@ -35,14 +86,68 @@ class DiscordBotService(discord.Bot):
         @self.command(description="Add yourself to the subscribers list")
         async def addsubscriber(ctx):
             user_id = ctx.author.id
-            # example DB call
-            if self.subscriber_repository:
-                self.subscriber_repository.add(user_id)
+            await self.subscribers.add(user_id)
             await ctx.respond(f"<@{user_id}> added!", ephemeral=True)
 
         @self.command(description="Remove yourself from the subscribers list")
         async def removesubscriber(ctx):
             user_id = ctx.author.id
-            if self.subscriber_repository:
-                self.subscriber_repository.remove(user_id)
+            await self.subscribers.remove(user_id)
             await ctx.respond(f"<@{user_id}> removed!", ephemeral=True)
+
+        @self.command(description="Get pinged for news about a ticker")
+        async def follow(
+            ctx, ticker: discord.Option(str, "Ticker symbol, e.g. NVDA")
+        ):
+            ticker = ticker.strip().upper()
+            if not TICKER_PATTERN.match(ticker):
+                await ctx.respond(f"`{ticker}` is not a valid ticker.", ephemeral=True)
+                return
+            if ctx.author.id not in self.subscribers:
+                await ctx.respond("Subscribe with /addsubscriber first.", ephemeral=True)
+                return
+            await self.subscribers.follow(ctx.author.id, ticker)
+            await ctx.respond(f"Following {ticker}.", ephemeral=True)
+
+        @self.command(description="Stop getting pinged for a ticker")
+        async def unfollow(
+            ctx, ticker: discord.Option(str, "Ticker symbol, e.g. NVDA")
+        ):
+            ticker = ticker.strip().upper()
+            await self.subscribers.unfollow(ctx.author.id, ticker)
+            await ctx.respond(f"Unfollowed {ticker}.", ephemeral=True)
+
+        @self.command(description="List the tickers you follow")
+        async def watchlist(ctx):
+            tickers = self.subscribers.watchlist(ctx.author.id)
+            text = ", ".join(tickers) if tickers else "You follow no tickers; you get every alert."
+            await ctx.respond(text, ephemeral=True)
+
+        @self.command(description="Profile the bot's CPU or memory for a while (admins only)")
+        @discord.default_permissions(administrator=True)
+        async def profile(
+            ctx,
+            kind: discord.Option(str, "What to profile", choices=["cpu", "memory"]),
+            seconds: discord.Option(
+                int, "Length of the window", min_value=1, max_value=300, default=30
+            ),
+            mode: discord.Option(
+                str, "CPU profiler", choices=list(CPU_MODES), default="sample"
+            ),
+        ):
+            # Server admins can re-grant the command, so check the caller too.
+            permissions = getattr(ctx.author, "guild_permissions", None)
+            if permissions is None or not permissions.administrator:
+                await ctx.respond("Only administrators can profile the bot.", ephemeral=True)
+                return
+            await ctx.defer(ephemeral=True)
+            try:
+                if kind == "cpu":
+                    paths = await self.profiler.profile_cpu(seconds, mode)
+                else:
+                    paths = await self.profiler.profile_memory(seconds)
+            except ProfilerBusy as e:
+                await ctx.followup.send(str(e), ephemeral=True)
+                return
+            files = "\n".join(f"`{path}`" for path in paths)
+            await ctx.followup.send(f"{kind} profile written:\n{files}", ephemeral=True)
@@ -0,0 +1,34 @@
+"""
+mention_tracker.py
+
+Tracks how often each ticker has been mentioned recently, with exponential decay.
+"""
+
+import math
+import time
+from typing import Dict, Iterable, Tuple
+
+
+class MentionTracker:
+    """Decaying per-ticker mention counts; a mention loses half its weight every ``half_life`` seconds."""
+
+    def __init__(self, half_life: float = 3600.0):
+        self.half_life = half_life
+        self._scores: Dict[str, Tuple[float, float]] = {}
+
+    def _decayed(self, score: float, updated: float, now: float) -> float:
+        return score * math.pow(0.5, (now - updated) / self.half_life)
+
+    def record(self, tickers: Iterable[str]):
+        """Count one mention for each ticker."""
+        now = time.monotonic()
+        for ticker in tickers:
+            score, updated = self._scores.get(ticker, (0.0, now))
+            self._scores[ticker] = (self._decayed(score, updated, now) + 1.0, now)
+
+    def score(self, ticker: str) -> float:
+        """Return the current decayed mention count for ``ticker``."""
+        entry = self._scores.get(ticker)
+        if entry is None:
+            return 0.0
+        return self._decayed(entry[0], entry[1], time.monotonic())
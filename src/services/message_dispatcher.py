@@ -0,0 +1,226 @@
+"""
+message_dispatcher.py
+
+Queues outbound Discord messages and sends them from a background task,
+respecting Discord's per-route rate limits.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+import discord
+from src import metrics
+from src.logger import Logger
+
+logger = Logger.get("MessageDispatcher")
+
+SEND_SECONDS = metrics.histogram("discord_send_seconds", "Discord message send latency")
+QUEUE_DELAY_SECONDS = metrics.histogram(
+    "discord_queue_delay_seconds", "Time a message waited in the dispatch queue"
+)
+MESSAGES = metrics.counter(
+    "discord_messages_total", "Discord messages by outcome", ["result"]
+)
+RATE_LIMITED = metrics.counter(
+    "discord_rate_limited_total", "429 responses from Discord", ["route"]
+)
+QUEUE_DEPTH = metrics.gauge("discord_queue_depth", "Messages waiting to be sent")
+
+
+class RateLimitBucket:
+    """
+    Fixed-window, per-route pacing ahead of Discord's own buckets.
+
+    This is a static approximation: ``channel.send`` does not expose the
+    response headers of a successful request, so ``X-RateLimit-Remaining`` is
+    never seen. The window starts from the configured defaults and only learns
+    Discord's real bucket from a 429 (``X-RateLimit-Limit`` and
+    ``X-RateLimit-Reset-After``). py-cord's HTTP client still enforces the
+    exact buckets underneath.
+    """
+
+    def __init__(self, limit: int, per: float):
+        self.limit = limit
+        self.per = per
+        self.remaining = limit
+        self.reset_at = 0.0
+
+    def delay(self, now: float) -> float:
+        """Return seconds to wait before a request may be sent on this route."""
+        if now >= self.reset_at:
+            return 0.0
+        if self.remaining > 0:
+            return 0.0
+        return self.reset_at - now
+
+    def consume(self, now: float):
+        """Account for one request sent at ``now``."""
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.per
+        self.remaining -= 1
+
+    def block(self, retry_after: float, now: float, limit: Optional[int] = None):
+        """
+        Empty the bucket until ``retry_after`` seconds from now (after a 429).
+
+        :param limit: Discord's ``X-RateLimit-Limit`` for the route, when sent
+        """
+        self.remaining = 0
+        self.reset_at = now + retry_after
+        if limit:
+            self.limit = limit
+
+
+class MessageDispatcher:
+    """Bounded queue plus background sender for Discord channel messages."""
+
+    def __init__(
+        self,
+        max_queue: int = 1000,
+        route_limit: int = 5,
+        route_period: float = 5.0,
+        max_retries: int = 3,
+    ):
+        """
+        :param max_queue: Maximum number of pending messages
+        :param route_limit: Requests allowed per route in each window
+        :param route_period: Length of a rate-limit window in seconds
+        :param max_retries: Attempts per message before giving up on 429s
+        """
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.route_limit = route_limit
+        self.route_period = route_period
+        self.max_retries = max_retries
+        self.buckets: Dict[str, RateLimitBucket] = {}
+
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.rate_limited = 0
+        self.last_send_latency = 0.0
+        self.max_send_latency = 0.0
+        self._total_send_latency = 0.0
+        self._total_queue_delay = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return self.queue.qsize()
+
+    def submit(self, channel: discord.abc.Messageable, content: str) -> bool:
+        """
+        Enqueue a message without waiting for it to be sent.
+
+        :return: False if the queue is full and the message was dropped
+        """
+        try:
+            self.queue.put_nowait((channel, content, time.monotonic()))
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            MESSAGES.inc(result="dropped")
+            logger.warning("Dispatch queue full (%d); dropping message.", self.queue.maxsize)
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, counters and latency figures."""
+        return {
+            "queue_depth": self.queue_depth,
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "rate_limited": self.rate_limited,
+            "last_send_latency": self.last_send_latency,
+            "max_send_latency": self.max_send_latency,
+            "avg_send_latency": self._total_send_latency / self.sent if self.sent else 0.0,
+            "avg_queue_delay": self._total_queue_delay / self.sent if self.sent else 0.0,
+        }
+
+    def export_metrics(self):
+        """Scrape hook: copy the current queue depth into its gauge."""
+        QUEUE_DEPTH.set(self.queue_depth)
+
+    def _bucket(self, route: str) -> RateLimitBucket:
+        bucket = self.buckets.get(route)
+        if bucket is None:
+            bucket = RateLimitBucket(self.route_limit, self.route_period)
+            self.buckets[route] = bucket
+        return bucket
+
+    @staticmethod
+    def _route(channel: Any) -> str:
+        return f"POST /channels/{getattr(channel, 'id', 0)}/messages"
+
+    @staticmethod
+    def _route_limit(error: discord.HTTPException) -> Optional[int]:
+        """Read the route's request limit from a 429, if Discord sent it."""
+        headers = getattr(error.response, "headers", None) or {}
+        try:
+            return int(headers["X-RateLimit-Limit"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _retry_after(self, error: discord.HTTPException) -> float:
+        """Read the retry delay Discord sent with a 429, falling back to one window."""
+        headers = getattr(error.response, "headers", None) or {}
+        value = headers.get("X-RateLimit-Reset-After") or headers.get("Retry-After")
+        try:
+            return float(value) if value is not None else self.route_period
+        except ValueError:
+            return self.route_period
+
+    async def _send(self, channel: Any, content: str, queued_at: float):
+        bucket = self._bucket(self._route(channel))
+
+        for attempt in range(1, self.max_retries + 1):
+            wait = bucket.delay(time.monotonic())
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            bucket.consume(time.monotonic())
+            started = time.monotonic()
+            try:
+                await channel.send(content)
+            except discord.HTTPException as e:
+                if e.status != 429:
+                    raise
+                self.rate_limited += 1
+                RATE_LIMITED.inc(route=self._route(channel))
+                retry_after = self._retry_after(e)
+                bucket.block(retry_after, time.monotonic(), self._route_limit(e))
+                logger.warning(
+                    "Rate limited on %s (attempt %d/%d); retrying in %.2fs",
+                    self._route(channel), attempt, self.max_retries, retry_after,
+                )
+                continue
+
+            finished = time.monotonic()
+            self.sent += 1
+            self.last_send_latency = finished - started
+            self.max_send_latency = max(self.max_send_latency, self.last_send_latency)
+            self._total_send_latency += self.last_send_latency
+            self._total_queue_delay += started - queued_at
+            SEND_SECONDS.observe(self.last_send_latency)
+            QUEUE_DELAY_SECONDS.observe(started - queued_at)
+            MESSAGES.inc(result="sent")
+            return
+
+        raise RuntimeError(f"Gave up after {self.max_retries} rate-limited attempts")
+
+    async def run_async(self):
+        """Send queued messages until cancelled."""
+        logger.info("Message dispatcher started.")
+        while True:
+            channel, content, queued_at = await self.queue.get()
+            try:
+                await self._send(channel, content, queued_at)
+            except Exception as e:
+                self.failed += 1
+                MESSAGES.inc(result="failed")
+                logger.error("Failed to send message: %s", e)
+            finally:
+                self.queue.task_done()
+
+    async def drain(self):
+        """Wait until every queued message has been handled."""
+        await self.queue.join()
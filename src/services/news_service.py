@@ -2,14 +2,23 @@ import asyncio
 import os
 from typing import Optional, List, Dict
 from src.logger import Logger
-from src.cache.redis_cache import RedisCache
+from src.cache.local_cache import LocalCache
+from src.cache.async_redis_cache import AsyncRedisCache
 from src.api.finnhub_news_api import fetch_news
 from src.services.company_parser_service import CompanyParserService
+from src.services.company_profile_service import CompanyProfileService, describe
+from src.services.mention_tracker import MentionTracker
+from src.services.pipeline import Batch, Pipeline
+from src.utilities.poll_scheduler import PollScheduler
+from src.utilities.token_bucket import TokenBucket
 from src.datalayer.connection import Database
+from src.datalayer.checkpoint_store import CheckpointStore
 from src.datalayer.data_checkpoint_repository import DataCheckpointRepository
 
 logger = Logger.get("NewsService")
 
+DEFAULT_CATEGORIES = ["general", "forex", "crypto", "merger"]
+
 
 class NewsService:
     """Service that periodically fetches news from Finnhub and notifies Discord subscribers."""
@@ -22,75 +31,216 @@ class NewsService:
         interval: int = 30,
         max_items: int = 10,
         api_key: Optional[str] = None,
-        news_cache: Optional[RedisCache] = None,
-        company_cache: Optional[RedisCache] = None,
+        news_cache: Optional[AsyncRedisCache] = None,
+        company_cache: Optional[AsyncRedisCache] = None,
+        categories: Optional[List[str]] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        mention_tracker: Optional[MentionTracker] = None,
+        profile_service: Optional[CompanyProfileService] = None,
+        min_interval: Optional[int] = None,
+        max_interval: Optional[int] = None,
+        pipeline_queue_size: int = 100,
+        checkpoints: Optional[CheckpointStore] = None,
     ):
         self.api_key = api_key or os.getenv("FINNHUB_API_KEY")
         self.interval = interval
+        self.min_interval = min_interval or max(1, interval // 3)
+        self.max_interval = max_interval or interval * 10
         self.max_items = max_items
-        self.news_cache = news_cache or RedisCache(namespace="news")
-        self.company_cache = company_cache or RedisCache(namespace="company")
+        self.categories = categories or DEFAULT_CATEGORIES
+        self.rate_limiter = rate_limiter
+        self.mention_tracker = mention_tracker
+        self.news_cache = news_cache or AsyncRedisCache(
+            namespace="news", local_cache=LocalCache()
+        )
+        self.company_cache = company_cache or AsyncRedisCache(
+            namespace="company", local_cache=LocalCache()
+        )
+        self.profile_service = profile_service or CompanyProfileService(
+            self.company_cache, self.api_key, self.rate_limiter
+        )
         self.company_parser = company_parser
         self.bot = bot
-        self.news_checkpoint_repo = DataCheckpointRepository(db)
+        # Shared write-behind store when given, else read/write straight through.
+        self.news_checkpoint_repo = checkpoints or DataCheckpointRepository(db)
+        # Dedupe stays single-worker so two batches never race on the seen-set.
+        self.pipeline = Pipeline(
+            "news",
+            [
+                ("dedupe", self._dedupe, 1),
+                ("parse", self._parse, 2),
+                ("enrich", self._enrich, 4),
+                ("deliver", self._deliver, 1),
+            ],
+            queue_size=pipeline_queue_size,
+        )
 
         if not self.api_key:
             logger.warning("FINNHUB_API_KEY not set. News fetching will be disabled.")
 
-    def validate_news(self, news: List[Dict]) -> List[Dict]:
-        """Filter out already-seen news articles using persisted checkpoint."""
-        source_name = "finnhub"
-        new_items = []
+    @staticmethod
+    def source_name(category: str) -> str:
+        """Checkpoint name for a category; ``general`` keeps the original ``finnhub`` row."""
+        return "finnhub" if category == "general" else f"finnhub_{category}"
 
-        last_seen_id = int(self.news_checkpoint_repo.get_last_id(source_name) or "0")
-        max_seen_id = last_seen_id
+    async def get_checkpoint(self, source_name: str) -> int:
+        return int(await self.news_checkpoint_repo.get_last_id(source_name) or "0")
 
-        for item in news:
-            news_id = item.get("id")
-            if not news_id:
-                continue
-            if news_id <= last_seen_id:
-                continue
+    async def validate_news(
+        self,
+        news: List[Dict],
+        source_name: str = "finnhub",
+        last_seen_id: Optional[int] = None,
+        key: str = "id",
+    ) -> List[Dict]:
+        """
+        Filter out already-seen news articles using persisted checkpoint.
+
+        Items past the checkpoint are also checked against the seen-set, so an
+        article already delivered from another feed is dropped. Both the lookup
+        and the update are single batched Redis calls.
 
-            self.news_cache.mark_seen(news_id)
-            new_items.append(item)
-            max_seen_id = max(max_seen_id, news_id)
+        :param key: Monotonic item field the checkpoint tracks (``id``, or
+            ``datetime`` for per-ticker company news)
+        """
+        if last_seen_id is None:
+            last_seen_id = await self.get_checkpoint(source_name)
 
-        if max_seen_id > last_seen_id:
-            self.news_checkpoint_repo.update_last_id(source_name, str(max_seen_id))
+        if key == "datetime":
+            # Timestamps are not unique: an item published in the same second
+            # as the checkpoint may arrive on a later poll. The seen-set drops
+            # the ones already delivered.
+            candidates = [
+                item for item in news if item.get(key) and item[key] >= last_seen_id
+            ]
+        else:
+            candidates = [
+                item for item in news if item.get(key) and item[key] > last_seen_id
+            ]
+        if not candidates:
+            return []
+
+        ids = [item.get("id", item[key]) for item in candidates]
+        seen = await self.news_cache.is_seen_many(ids)
+        new_items = [item for item, was_seen in zip(candidates, seen) if not was_seen]
+        await self.news_cache.mark_seen_many(
+            news_id for news_id, was_seen in zip(ids, seen) if not was_seen
+        )
+
+        # Re-read the checkpoint: a later batch of the same source may already
+        # have moved it past this one, and it must never go backwards.
+        max_seen_id = max(item[key] for item in candidates)
+        if max_seen_id > await self.get_checkpoint(source_name):
+            await self.news_checkpoint_repo.update_last_id(source_name, str(max_seen_id))
 
         return new_items
 
     async def validate_company(self, news: List[Dict]) -> List[Dict]:
-        """Extract companies from headline + summary."""
+        """Extract companies from headline + summary, keeping any already attached."""
+        texts = [
+            f"{n.get('headline') or ''}\n{n.get('summary') or ''}" for n in news
+        ]
+        found = await self.company_parser.extract_companies_batch_async(texts)
+
         processed = []
-        for n in news:
-            headline = n.get("headline", "") or ""
-            summary = n.get("summary", "") or ""
-            companies = set()
-            companies |= set(self.company_parser.extract_companies(headline))
-            companies |= set(self.company_parser.extract_companies(summary))
+        for n, tickers in zip(news, found):
+            companies = list(dict.fromkeys([*(n.get("companies") or []), *tickers]))
             if companies:
-                n["companies"] = list(companies)
+                n["companies"] = companies
                 processed.append(n)
+                if self.mention_tracker:
+                    self.mention_tracker.record(companies)
         return processed
 
-    async def fetch_news(self) -> List[Dict]:
-        """Fetch, process, and notify new news."""
+    async def fetch_category(self, category: str) -> Batch:
+        """
+        Fetch only the items newer than the category's checkpoint.
+
+        The checkpoint is sent as Finnhub's ``minId`` so the payload contains
+        unseen items only. ``max_items`` caps the very first fetch, when there
+        is no checkpoint yet, so a fresh install doesn't replay the whole feed.
+        """
+        source_name = self.source_name(category)
+        last_seen_id = await self.get_checkpoint(source_name)
+        if self.rate_limiter:
+            await self.rate_limiter.acquire()
+        news = await fetch_news(
+            api_key=self.api_key,
+            category=category,
+            max_items=None if last_seen_id else self.max_items,
+            min_id=last_seen_id or None,
+        )
+        return Batch(source_name, news, last_seen_id=last_seen_id, key="id")
+
+    async def fetch_batches(self) -> List[Batch]:
+        """
+        Fetch every category concurrently; returns the non-empty batches.
+
+        A failed category is logged and retried on the next poll. When every
+        category failed the first error is raised, so the scheduler backs off.
+        """
         if not self.api_key:
             return []
+        results = await asyncio.gather(
+            *(self.fetch_category(c) for c in self.categories),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, Exception)]
+        for category, result in zip(self.categories, results):
+            if isinstance(result, Exception):
+                logger.warning(f"{category} news poll failed: {result}")
+        if errors and len(errors) == len(results):
+            raise errors[0]
+        return [b for b in results if not isinstance(b, Exception) and b.items]
 
-        news = await asyncio.to_thread(
-            fetch_news, api_key=self.api_key, max_items=self.max_items
+    async def fetch_news(self) -> List[Dict]:
+        """Fetch every category and run it through the pipeline inline; returns what was delivered."""
+        processed = []
+        for batch in await self.fetch_batches():
+            processed.extend(await self.pipeline.process(batch))
+        logger.info(
+            "Delivered %d new items across %d categories.",
+            len(processed), len(self.categories),
         )
-        new_items = self.validate_news(news)
-        processed = await self.validate_company(new_items)
+        return processed
 
-        if processed:
-            await self.notify_subscribers(processed)
+    async def ingest(
+        self,
+        news: List[Dict],
+        source_name: str,
+        last_seen_id: Optional[int] = None,
+        key: str = "id",
+    ) -> int:
+        """Queue items from another feed for the dedupe, parse, enrich and deliver stages."""
+        if not news:
+            return 0
+        await self.pipeline.submit(
+            Batch(source_name, news, last_seen_id=last_seen_id, key=key)
+        )
+        return len(news)
 
-        logger.info("Fetched %d new items out of %d total.", len(processed), len(news))
-        return processed
+    async def _dedupe(self, batch: Batch) -> Batch:
+        batch.items = await self.validate_news(
+            batch.items, batch.source, batch.meta["last_seen_id"], batch.meta["key"]
+        )
+        return batch
+
+    async def _parse(self, batch: Batch) -> Batch:
+        batch.items = await self.validate_company(batch.items)
+        return batch
+
+    async def _enrich(self, batch: Batch) -> Batch:
+        # Best effort: the batch is already deduped and checkpointed, so a
+        # profile failure must not drop it; articles go out without profiles.
+        try:
+            await self.profile_service.enrich(batch.items)
+        except Exception as e:
+            logger.warning(f"Profile enrichment failed for {batch.source}: {e}")
+        return batch
+
+    async def _deliver(self, batch: Batch) -> Batch:
+        await self.notify_subscribers(batch.items)
+        return batch
 
     async def notify_subscribers(self, articles: List[Dict]):
         """Send new news articles to all subscribers via the Discord bot."""
@@ -101,17 +251,48 @@ class NewsService:
         for article in articles:
             headline = article.get("headline", "")
             url = article.get("url", "")
-            companies = ", ".join(article.get("companies", []))
+            profiles = article.get("profiles") or {}
+            companies = ", ".join(
+                describe(c, profiles.get(c)) for c in article.get("companies", [])
+            )
 
             message = f"**{headline}**\nCompanies: {companies}\n<{url}>"
             try:
-                await self.bot.ping_users(message)
+                await self.bot.ping_users(message, article.get("companies", []))
             except Exception as e:
                 logger.error(f"Failed to broadcast article: {e}")
 
+    async def connect(self):
+        """Ping the caches once at startup."""
+        await self.news_cache.connect()
+        await self.company_cache.connect()
+
+    async def poll_once(self) -> int:
+        """
+        One scheduled poll: fetch and queue every category for the pipeline.
+
+        Returns the number of items fetched. Processing continues on the
+        pipeline's workers, so a slow stage only delays the next poll once
+        its queue is full.
+        """
+        batches = await self.fetch_batches()
+        for batch in batches:
+            await self.pipeline.submit(batch)
+        return sum(len(b.items) for b in batches)
+
+    def schedule(self, scheduler: PollScheduler):
+        scheduler.add(
+            "finnhub_news",
+            self.poll_once,
+            self.interval,
+            self.min_interval,
+            self.max_interval,
+        )
+
     async def run_async(self):
-        """Run continuously."""
+        """Run continuously on an adaptive schedule of its own."""
+        await self.connect()
         logger.info("News Service started.")
-        while True:
-            await self.fetch_news()
-            await asyncio.sleep(self.interval)
+        scheduler = PollScheduler()
+        self.schedule(scheduler)
+        await asyncio.gather(self.pipeline.run_async(), scheduler.run_async())
@@ -0,0 +1,228 @@
+"""
+pipeline.py
+
+Staged ingestion pipeline: bounded asyncio queues between stages, each stage
+served by its own workers.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from src import metrics
+from src.logger import Logger
+
+logger = Logger.get("Pipeline")
+
+STAGE_SECONDS = metrics.histogram(
+    "pipeline_stage_seconds", "Time a stage spent on one batch", ["pipeline", "stage"]
+)
+STAGE_ITEMS = metrics.counter(
+    "pipeline_stage_items_total", "Items handled by a stage", ["pipeline", "stage"]
+)
+STAGE_ERRORS = metrics.counter(
+    "pipeline_stage_errors_total", "Batches a stage failed on", ["pipeline", "stage"]
+)
+END_TO_END_SECONDS = metrics.histogram(
+    "pipeline_end_to_end_seconds", "Fetch-to-delivery latency of a batch", ["pipeline"]
+)
+QUEUE_DEPTH = metrics.gauge(
+    "pipeline_queue_depth", "Batches waiting in front of a stage", ["pipeline", "stage"]
+)
+BUSY_WORKERS = metrics.gauge(
+    "pipeline_busy_workers", "Stage workers currently handling a batch", ["pipeline", "stage"]
+)
+
+
+class Batch:
+    """Items from one fetch moving through the pipeline, plus whatever a stage needs."""
+
+    def __init__(self, source: str, items: List[Dict], **meta: Any):
+        self.source = source
+        self.items = items
+        self.meta = meta
+        self.created = time.monotonic()
+        self.queued_at = self.created
+
+
+# A handler returns the batch to pass on, or None / an empty batch to stop it there.
+Handler = Callable[[Batch], Awaitable[Optional[Batch]]]
+
+
+class Stage:
+    """One pipeline stage with its input queue and counters."""
+
+    def __init__(self, name: str, handler: Handler, workers: int, queue_size: int):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue: "asyncio.Queue[Batch]" = asyncio.Queue(maxsize=queue_size)
+
+        self.batches = 0
+        self.items = 0
+        self.passed = 0
+        self.errors = 0
+        self.busy = 0
+        self.max_latency = 0.0
+        self._total_latency = 0.0
+        self._total_wait = 0.0
+
+    def record(self, batch: Batch, latency: float, wait: float):
+        self.batches += 1
+        self.items += len(batch.items)
+        self._total_latency += latency
+        self._total_wait += wait
+        self.max_latency = max(self.max_latency, latency)
+
+    def stats(self, elapsed: float) -> Dict[str, Any]:
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "busy": self.busy,
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "batches": self.batches,
+            "items": self.items,
+            "passed": self.passed,
+            "errors": self.errors,
+            "items_per_s": self.items / elapsed if elapsed else 0.0,
+            "avg_latency": self._total_latency / self.batches if self.batches else 0.0,
+            "max_latency": self.max_latency,
+            "avg_queue_wait": self._total_wait / self.batches if self.batches else 0.0,
+        }
+
+
+class Pipeline:
+    """
+    Moves batches through a fixed sequence of stages.
+
+    Every stage reads from a bounded queue. When a stage falls behind, its queue
+    fills, the stage before it blocks on ``put``, and eventually ``submit``
+    blocks the producer: a slow consumer slows fetching instead of growing
+    memory without bound. ``process`` runs a batch through the stages inline,
+    for callers that want the result.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        stages: List[Tuple[str, Handler, int]],
+        queue_size: int = 100,
+    ):
+        """
+        :param name: Used in logs
+        :param stages: ``(name, handler, workers)`` in processing order
+        :param queue_size: Capacity of the queue in front of every stage
+        """
+        self.name = name
+        self.stages = [Stage(n, h, w, queue_size) for n, h, w in stages]
+        self.submitted = 0
+        self.completed = 0
+        self.max_end_to_end = 0.0
+        self._total_end_to_end = 0.0
+        self._total_submit_wait = 0.0
+        self._started: Optional[float] = None
+
+    async def submit(self, batch: Batch):
+        """Queue a batch for the first stage, waiting while that queue is full."""
+        started = time.monotonic()
+        await self.stages[0].queue.put(batch)
+        self._total_submit_wait += time.monotonic() - started
+        self.submitted += 1
+
+    async def _run_stage(
+        self, stage: Stage, index: int, batch: Batch, wait: float = 0.0
+    ) -> Optional[Batch]:
+        stage.busy += 1
+        started = time.monotonic()
+        try:
+            result = await stage.handler(batch)
+        except Exception as e:
+            stage.errors += 1
+            STAGE_ERRORS.inc(pipeline=self.name, stage=stage.name)
+            logger.error("%s/%s failed on %s: %s", self.name, stage.name, batch.source, e)
+            result = None
+        finally:
+            stage.busy -= 1
+            latency = time.monotonic() - started
+            stage.record(batch, latency, wait)
+            STAGE_SECONDS.observe(latency, pipeline=self.name, stage=stage.name)
+            STAGE_ITEMS.inc(len(batch.items), pipeline=self.name, stage=stage.name)
+
+        if result is None or not result.items:
+            return None
+        stage.passed += 1
+        if index == len(self.stages) - 1:
+            self._finish(result)
+        return result
+
+    def _finish(self, batch: Batch):
+        latency = time.monotonic() - batch.created
+        self.completed += 1
+        self._total_end_to_end += latency
+        self.max_end_to_end = max(self.max_end_to_end, latency)
+        END_TO_END_SECONDS.observe(latency, pipeline=self.name)
+
+    async def process(self, batch: Batch) -> List[Dict]:
+        """Run ``batch`` through every stage now; returns the items that came out."""
+        for index, stage in enumerate(self.stages):
+            batch = await self._run_stage(stage, index, batch)
+            if batch is None:
+                return []
+        return batch.items
+
+    async def _worker(self, index: int):
+        stage = self.stages[index]
+        following = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            batch = await stage.queue.get()
+            try:
+                wait = time.monotonic() - batch.queued_at
+                result = await self._run_stage(stage, index, batch, wait)
+                if result is not None and following is not None:
+                    result.queued_at = time.monotonic()
+                    await following.queue.put(result)
+            finally:
+                stage.queue.task_done()
+
+    async def run_async(self):
+        """Run every stage's workers until cancelled."""
+        self._started = time.monotonic()
+        logger.info(
+            "Pipeline %s started: %s", self.name,
+            " -> ".join(f"{s.name} x{s.workers}" for s in self.stages),
+        )
+        await asyncio.gather(
+            *(
+                self._worker(index)
+                for index, stage in enumerate(self.stages)
+                for _ in range(stage.workers)
+            )
+        )
+
+    async def drain(self):
+        """Wait until every submitted batch has left the pipeline."""
+        for stage in self.stages:
+            await stage.queue.join()
+
+    def export_metrics(self):
+        """Scrape hook: copy queue depths and busy workers into their gauges."""
+        for stage in self.stages:
+            QUEUE_DEPTH.set(stage.queue.qsize(), pipeline=self.name, stage=stage.name)
+            BUSY_WORKERS.set(stage.busy, pipeline=self.name, stage=stage.name)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-stage counters and end-to-end figures."""
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        return {
+            "pipeline": self.name,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "avg_submit_wait": (
+                self._total_submit_wait / self.submitted if self.submitted else 0.0
+            ),
+            "avg_end_to_end": (
+                self._total_end_to_end / self.completed if self.completed else 0.0
+            ),
+            "max_end_to_end": self.max_end_to_end,
+            "stages": [s.stats(elapsed) for s in self.stages],
+        }
@@ -1,71 +1,216 @@
 import asyncio
-import logging
-from typing import List, Dict
-import requests
-from datetime import datetime
+import os
+from typing import List, Dict, Optional, Tuple
 
-from src.api.reddit_dd_api import fetch_dd_posts
+from src.api.reddit_dd_api import fetch_posts
 from src.datalayer.connection import Database
+from src.datalayer.checkpoint_store import CheckpointStore
 from src.datalayer.data_checkpoint_repository import DataCheckpointRepository
+from src.cache.local_cache import LocalCache
+from src.logger import Logger
+from src.services.pipeline import Batch, Pipeline
+from src.utilities.poll_scheduler import PollScheduler
 
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
+logger = Logger.get("RedditService")
+
+# subreddit[:flair] entries, comma separated
+DEFAULT_FEEDS = "wallstreetbets:DD"
+
+
+def parse_feeds(spec: str) -> List[Tuple[str, Optional[str]]]:
+    """Parse ``"wallstreetbets:DD,stocks"`` into ``[("wallstreetbets", "DD"), ("stocks", None)]``."""
+    feeds = []
+    for entry in spec.split(","):
+        subreddit, _, flair = entry.strip().partition(":")
+        if subreddit:
+            feeds.append((subreddit, flair or None))
+    return feeds
 
 
 class RedditService:
-    """Service to continuously fetch new posts"""
+    """
+    Service to continuously fetch new posts from one or more subreddit feeds.
 
-    BASE_URL = "https://www.reddit.com/r/wallstreetbets/search.json"
+    Each feed keeps its own checkpoint (the newest ``created_utc`` delivered).
+    A poll pages back through the listing with Reddit's ``after`` cursor until
+    it reaches the checkpoint, so bursts larger than one page are not lost.
+    """
 
     def __init__(
         self,
         db: Database,
         discord_bot,
         interval: int = 60,
+        company_parser=None,
+        feeds: Optional[List[Tuple[str, Optional[str]]]] = None,
+        page_size: int = 100,
+        max_pages: int = 5,
+        first_fetch_items: int = 5,
+        min_interval: Optional[int] = None,
+        max_interval: Optional[int] = None,
+        checkpoints: Optional[CheckpointStore] = None,
     ):
-        self.checkpoint_repo = DataCheckpointRepository(db)
+        """
+        :param company_parser: CompanyParserService used to tag posts with tickers
+        :param feeds: ``(subreddit, flair)`` pairs; defaults to ``REDDIT_FEEDS``
+        :param page_size: Posts per listing request
+        :param max_pages: Most pages walked back per feed and poll
+        :param first_fetch_items: Posts delivered for a feed with no checkpoint yet
+        :param min_interval: Fastest poll interval while posts keep arriving
+        :param max_interval: Slowest poll interval when quiet or failing
+        :param checkpoints: Shared write-behind checkpoint store (default: direct DB access)
+        """
+        self.checkpoint_repo = checkpoints or DataCheckpointRepository(db)
         self.discord_bot = discord_bot
-        self.source_name = "reddit_wsb"
+        self.company_parser = company_parser
+        self.feeds = feeds or parse_feeds(os.getenv("REDDIT_FEEDS", DEFAULT_FEEDS))
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.first_fetch_items = first_fetch_items
         self.interval = interval
-        self.running = True
+        self.min_interval = min_interval or max(1, interval // 2)
+        self.max_interval = max_interval or interval * 10
+        self._scheduler: Optional[PollScheduler] = None
+        self._recent = LocalCache(max_entries=10_000, ttl=7 * 24 * 3600)
+        self.pipeline = Pipeline(
+            "reddit",
+            [
+                ("dedupe", self._dedupe, 1),
+                ("parse", self._parse, 1),
+                ("deliver", self._deliver, 1),
+            ],
+        )
 
-    def get_new_posts(self) -> List[Dict]:
-        """Filter posts that are newer than the last checkpoint."""
-        # Get last seen timestamp from DB
-        last_timestamp_str = self.checkpoint_repo.get_last_id(self.source_name)
-        last_timestamp = float(last_timestamp_str) if last_timestamp_str else 0
+    @staticmethod
+    def source_name(subreddit: str, flair: Optional[str]) -> str:
+        """Checkpoint name; the original WSB DD feed keeps its ``reddit_wsb`` row."""
+        if (subreddit.lower(), (flair or "").lower()) == ("wallstreetbets", "dd"):
+            return "reddit_wsb"
+        name = f"reddit_{subreddit}" + (f"_{flair}" if flair else "")
+        return name.lower().replace(" ", "_")
 
-        posts = fetch_dd_posts(limit=5)
-        new_posts = []
+    async def fetch_since(
+        self, subreddit: str, flair: Optional[str], last_timestamp: float
+    ) -> List[Dict]:
+        """
+        Page back from the newest post until ``last_timestamp`` (newest first).
 
-        for post in posts:
-            created_utc = post.get("created_utc", 0)
-            if created_utc <= last_timestamp:
-                continue
-            new_posts.append(post)
+        A failed page raises (HttpError) instead of ending the walk early, so
+        the caller never moves the checkpoint past posts it did not fetch.
+        """
+        if not last_timestamp:
+            posts, _ = await fetch_posts(subreddit, flair, limit=self.first_fetch_items)
+            return posts
+
+        posts, ids, after = [], set(), None
+        for _ in range(self.max_pages):
+            page, after = await fetch_posts(subreddit, flair, self.page_size, after=after)
+            fresh = [p for p in page if p.get("created_utc", 0) > last_timestamp]
+            posts.extend(p for p in fresh if p.get("id") not in ids)
+            ids.update(p.get("id") for p in fresh)
+            if not after or len(fresh) < len(page):
+                return posts
+        logger.warning(
+            "r/%s: stopped after %d pages before reaching the checkpoint",
+            subreddit, self.max_pages,
+        )
+        return posts
+
+    async def get_feed_posts(self, subreddit: str, flair: Optional[str]) -> List[Dict]:
+        """
+        Return a feed's posts newer than its checkpoint, oldest first.
+
+        The checkpoint only moves once the whole walk succeeded; after a failed
+        page the next poll fetches the same range again.
+        """
+        source_name = self.source_name(subreddit, flair)
+        last_timestamp_str = await self.checkpoint_repo.get_last_id(source_name)
+        last_timestamp = float(last_timestamp_str) if last_timestamp_str else 0
 
+        new_posts = await self.fetch_since(subreddit, flair, last_timestamp)
         if new_posts:
             newest_timestamp = max(p["created_utc"] for p in new_posts)
-            self.checkpoint_repo.update_last_id(self.source_name, str(newest_timestamp))
+            await self.checkpoint_repo.update_last_id(
+                source_name, str(newest_timestamp)
+            )
 
+        feed = f"r/{subreddit}" + (f" {flair}" if flair else "")
+        for post in new_posts:
+            post["feed"] = feed
         return list(reversed(new_posts))
 
+    async def fetch_batches(self) -> List[Batch]:
+        """
+        Fetch every feed concurrently; returns the non-empty batches.
+
+        A failed feed is logged and retried on the next poll. When every feed
+        failed the first error is raised, so the scheduler backs off.
+        """
+        results = await asyncio.gather(
+            *(self.get_feed_posts(subreddit, flair) for subreddit, flair in self.feeds),
+            return_exceptions=True,
+        )
+        batches, errors = [], []
+        for (subreddit, flair), posts in zip(self.feeds, results):
+            if isinstance(posts, Exception):
+                logger.warning("r/%s: poll failed, retrying next time: %s", subreddit, posts)
+                errors.append(posts)
+            elif posts:
+                batches.append(Batch(self.source_name(subreddit, flair), posts))
+        if errors and len(errors) == len(results):
+            raise errors[0]
+        return batches
+
+    async def _dedupe(self, batch: Batch) -> Batch:
+        # A post can match more than one feed.
+        fresh = []
+        for post in batch.items:
+            if not self._recent.lookup(post.get("id"))[0]:
+                self._recent.set(post.get("id"), True)
+                fresh.append(post)
+        batch.items = fresh
+        return batch
+
+    async def _parse(self, batch: Batch) -> Batch:
+        if self.company_parser:
+            texts = [
+                f"{p.get('title') or ''}\n{p.get('selftext') or ''}" for p in batch.items
+            ]
+            found = await self.company_parser.extract_companies_batch_async(texts)
+            for post, tickers in zip(batch.items, found):
+                post["companies"] = tickers
+        return batch
+
+    async def _deliver(self, batch: Batch) -> Batch:
+        for post in batch.items:
+            title = post.get("title", "")
+            permalink = post.get("permalink", "")
+            reddit_url = f"https://reddit.com{permalink}"
+            tickers = ", ".join(post.get("companies") or [])
+            tickers = f" ({tickers})" if tickers else ""
+            message = f"New post ({post.get('feed')}): {title}{tickers} - {reddit_url}"
+            await self.discord_bot.ping_users(message, post.get("companies") or [])
+            logger.info("Pinged Discord for new Reddit post")
+        return batch
+
+    async def poll_once(self) -> int:
+        """Fetch new posts and queue them for the pipeline; returns the number fetched."""
+        batches = await self.fetch_batches()
+        for batch in batches:
+            await self.pipeline.submit(batch)
+        return sum(len(b.items) for b in batches)
+
+    def schedule(self, scheduler: PollScheduler):
+        scheduler.add(
+            "reddit", self.poll_once, self.interval, self.min_interval, self.max_interval
+        )
+
     async def run_async(self):
-        """Continuously fetch new posts and ping Discord."""
-        while self.running:
-            try:
-                new_posts = self.get_new_posts()
-                for post in new_posts:
-                    title = post.get("title", "")
-                    permalink = post.get("permalink", "")
-                    reddit_url = f"https://reddit.com{permalink}"
-                    message = f"New DD post: {title} - {reddit_url}"
-                    await self.discord_bot.ping_users(message)
-                    logger.info("Pinged Discord for new Reddit post")
-            except Exception as e:
-                logger.error("Error in RedditService run loop: %s", e)
-
-            await asyncio.sleep(self.interval)
+        """Continuously fetch new posts and ping Discord on an adaptive schedule."""
+        self._scheduler = PollScheduler()
+        self.schedule(self._scheduler)
+        await asyncio.gather(self.pipeline.run_async(), self._scheduler.run_async())
 
     def stop(self):
-        self.running = False
+        if self._scheduler:
+            self._scheduler.stop()
@@ -0,0 +1,214 @@
+"""
+subscriber_registry.py
+
+In-memory view of the subscribers and SubscriberTickers tables so broadcasts
+never hit the database.
+"""
+
+import asyncio
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from src.logger import Logger
+from src.datalayer.subscriber_repository import SubscriberRepository
+from src.datalayer.subscriber_ticker_repository import SubscriberTickerRepository
+
+logger = Logger.get("SubscriberRegistry")
+
+
+class SubscriberRegistry:
+    """
+    Keeps subscribers and their ticker watchlists in memory and refreshes them
+    periodically.
+
+    Routing uses an inverted index from ticker to followers, so finding the
+    recipients of an article costs O(matched users). Subscribers who follow no
+    tickers keep receiving everything.
+    """
+
+    def __init__(
+        self,
+        repo: SubscriberRepository,
+        refresh_interval: int = 300,
+        ticker_repo: Optional[SubscriberTickerRepository] = None,
+    ):
+        """
+        :param repo: Repository backing the registry
+        :param refresh_interval: Seconds between full reloads from the database
+        :param ticker_repo: Repository of followed tickers (watchlists disabled when None)
+        """
+        self.repo = repo
+        self.ticker_repo = ticker_repo
+        self.refresh_interval = refresh_interval
+        self._user_ids: Set[int] = set()
+        self._followers: Dict[str, Set[int]] = {}
+        self._watchlists: Dict[int, Set[str]] = {}
+        # Subscribers without a watchlist, kept in step so routing never scans everyone.
+        self._everything: Set[int] = set()
+        self._loaded = False
+        self._invalidated = asyncio.Event()
+        # One journal per load in progress: changes made while it awaits the
+        # database, replayed on top of its snapshot so none are lost.
+        self._journals: List[List[Tuple[str, int, Optional[str]]]] = []
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    async def load(self):
+        """
+        Replace the in-memory state with the current contents of the tables.
+
+        add/remove/follow/unfollow calls made while the tables are read are
+        replayed on the new state; replaying one the snapshot already
+        contains is a no-op.
+        """
+        journal: List[Tuple[str, int, Optional[str]]] = []
+        self._journals.append(journal)
+        try:
+            user_ids = set(await self.repo.get_all())
+            rows = await self.ticker_repo.get_all() if self.ticker_repo is not None else []
+        finally:
+            self._journals.remove(journal)
+
+        followers: Dict[str, Set[int]] = {}
+        watchlists: Dict[int, Set[str]] = {}
+        for user_id, ticker in rows:
+            # Rows left behind by a removed subscriber never route.
+            if user_id not in user_ids:
+                continue
+            followers.setdefault(ticker, set()).add(user_id)
+            watchlists.setdefault(user_id, set()).add(ticker)
+
+        self._user_ids = user_ids
+        self._followers = followers
+        self._watchlists = watchlists
+        self._everything = user_ids - watchlists.keys()
+        for change, user_id, ticker in journal:
+            self._apply(change, user_id, ticker)
+        self._loaded = True
+        logger.info(
+            "Loaded %d subscribers and %d followed tickers",
+            len(self._user_ids),
+            len(self._followers),
+        )
+
+    def _apply(self, change: str, user_id: int, ticker: Optional[str] = None):
+        """Apply one persisted change to the in-memory state and journal it."""
+        if change == "add":
+            self._user_ids.add(user_id)
+            if user_id not in self._watchlists:
+                self._everything.add(user_id)
+        elif change == "remove":
+            for followed in self._watchlists.pop(user_id, set()):
+                self._drop_follower(followed, user_id)
+            self._user_ids.discard(user_id)
+            self._everything.discard(user_id)
+        elif change == "follow":
+            if user_id not in self._user_ids:
+                return
+            self._followers.setdefault(ticker, set()).add(user_id)
+            self._watchlists.setdefault(user_id, set()).add(ticker)
+            self._everything.discard(user_id)
+        elif change == "unfollow":
+            watchlist = self._watchlists.get(user_id)
+            if watchlist is not None:
+                watchlist.discard(ticker)
+                if not watchlist:
+                    del self._watchlists[user_id]
+                    if user_id in self._user_ids:
+                        self._everything.add(user_id)
+            self._drop_follower(ticker, user_id)
+
+    def _record(self, change: str, user_id: int, ticker: Optional[str] = None):
+        self._apply(change, user_id, ticker)
+        for journal in self._journals:
+            journal.append((change, user_id, ticker))
+
+    def get_all(self) -> List[int]:
+        """Return all subscriber IDs without touching the database."""
+        return list(self._user_ids)
+
+    async def add(self, user_id: int):
+        """Persist a new subscriber and add it to the in-memory set."""
+        if user_id in self._user_ids:
+            return
+        # Claim the user before awaiting so a concurrent add returns above
+        # instead of inserting the row a second time.
+        self._record("add", user_id)
+        try:
+            await self.repo.add(user_id)
+        except BaseException:
+            self._record("remove", user_id)
+            raise
+
+    async def remove(self, user_id: int):
+        """Delete a subscriber, along with its watchlist, and drop it from memory."""
+        await self.repo.remove(user_id)
+        # Unconditionally: before the first load the watchlist is not in memory,
+        # and rows left behind would come back if the user subscribes again.
+        if self.ticker_repo is not None:
+            await self.ticker_repo.unfollow_all(user_id)
+        self._record("remove", user_id)
+
+    async def follow(self, user_id: int, ticker: str):
+        """Persist a followed ticker and add it to the index; only subscribers may follow."""
+        if self.ticker_repo is None:
+            raise RuntimeError("Ticker watchlists are not configured")
+        if user_id not in self._user_ids:
+            raise ValueError(f"User {user_id} is not a subscriber")
+        ticker = ticker.upper()
+        if ticker in self._watchlists.get(user_id, ()):
+            return
+        await self.ticker_repo.follow(user_id, ticker)
+        self._record("follow", user_id, ticker)
+
+    async def unfollow(self, user_id: int, ticker: str):
+        """Delete a followed ticker and remove it from the index."""
+        if self.ticker_repo is None:
+            raise RuntimeError("Ticker watchlists are not configured")
+        ticker = ticker.upper()
+        await self.ticker_repo.unfollow(user_id, ticker)
+        self._record("unfollow", user_id, ticker)
+
+    def _drop_follower(self, ticker: str, user_id: int):
+        followers = self._followers.get(ticker)
+        if followers is not None:
+            followers.discard(user_id)
+            if not followers:
+                del self._followers[ticker]
+
+    def watchlist(self, user_id: int) -> List[str]:
+        return sorted(self._watchlists.get(user_id, ()))
+
+    def follower_count(self, ticker: str) -> int:
+        return len(self._followers.get(ticker.upper(), ()))
+
+    def route(self, tickers: Iterable[str]) -> Set[int]:
+        """Users to notify about ``tickers``: their followers plus subscribers without a watchlist."""
+        recipients = set(self._everything)
+        for ticker in tickers:
+            recipients |= self._followers.get(ticker.upper(), set())
+        return recipients
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._user_ids
+
+    def __len__(self) -> int:
+        return len(self._user_ids)
+
+    def invalidate(self):
+        """Request a reload before the next scheduled refresh."""
+        self._invalidated.set()
+
+    async def run_async(self, interval: Optional[int] = None):
+        """Reload the registry every refresh interval, or sooner when invalidated."""
+        interval = interval or self.refresh_interval
+        while True:
+            try:
+                await self.load()
+            except Exception as e:
+                logger.error("Failed to refresh subscribers: %s", e)
+            self._invalidated.clear()
+            try:
+                await asyncio.wait_for(self._invalidated.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
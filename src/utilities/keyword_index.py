@@ -0,0 +1,74 @@
+"""
+keyword_index.py
+
+On-disk snapshot of the compiled company keyword processor.
+
+The file holds a small header (format version and the fingerprint of the
+Companies table it was built from) followed by the pickled KeywordProcessor.
+A snapshot is only used when both match, so any change to the table or to the
+format forces a rebuild from the database.
+"""
+
+import gc
+import os
+import pickle
+import tempfile
+from typing import Optional
+from flashtext import KeywordProcessor
+from src.logger import Logger
+
+logger = Logger.get("KeywordIndex")
+
+INDEX_FORMAT = 1
+
+
+def load_index(path: str, fingerprint: str) -> Optional[KeywordProcessor]:
+    """Return the stored processor if the file exists and matches ``fingerprint``."""
+    try:
+        with open(path, "rb") as f:
+            header = pickle.load(f)
+            if header.get("format") != INDEX_FORMAT:
+                logger.info("Keyword index at %s has an old format; rebuilding", path)
+                return None
+            if header.get("fingerprint") != fingerprint:
+                logger.info("Keyword index at %s is stale; rebuilding", path)
+                return None
+            # The trie is millions of small dicts; collecting while they are
+            # created costs more than the unpickling itself.
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                return pickle.load(f)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # Truncated files, a newer pickle protocol (ValueError), renamed
+        # classes: anything unreadable is rebuilt from the database.
+        logger.warning("Could not read keyword index at %s: %s", path, e)
+        return None
+
+
+def save_index(path: str, fingerprint: str, processor: KeywordProcessor):
+    """Write the processor atomically so a crash never leaves a torn file."""
+    directory = os.path.dirname(path) or "."
+    tmp_path = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump({"format": INDEX_FORMAT, "fingerprint": fingerprint}, f)
+            pickle.dump(processor, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        tmp_path = None
+    except Exception as e:
+        # The snapshot is only a cache; the next start rebuilds it.
+        logger.warning("Could not write keyword index to %s: %s", path, e)
+    finally:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,187 @@
+"""
+poll_scheduler.py
+
+Fixed-rate, adaptive scheduler for periodic pollers.
+"""
+
+import asyncio
+import random
+from typing import Awaitable, Callable, Dict, List, Optional
+from src import metrics
+from src.logger import Logger
+
+logger = Logger.get("PollScheduler")
+
+POLL_SECONDS = metrics.histogram("poll_seconds", "Duration of one poll", ["source"])
+POLL_ITEMS = metrics.counter("poll_items_total", "New items found by polls", ["source"])
+POLL_FAILURES = metrics.counter("poll_failures_total", "Polls that raised", ["source"])
+POLL_INTERVAL = metrics.gauge(
+    "poll_interval_seconds", "Current adaptive poll interval", ["source"]
+)
+
+# A poll returns how many new items it found.
+Poll = Callable[[], Awaitable[int]]
+
+
+class PollSource:
+    """Schedule state of one polled source."""
+
+    def __init__(
+        self,
+        name: str,
+        poll: Poll,
+        interval: float,
+        min_interval: float,
+        max_interval: float,
+    ):
+        self.name = name
+        self.poll = poll
+        self.base_interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = interval
+        self.next_run = 0.0
+
+        self.runs = 0
+        self.failures = 0
+        self.overruns = 0
+        self.last_items = 0
+        self.last_duration = 0.0
+
+
+class PollScheduler:
+    """
+    Runs every source on its own fixed-rate tick and adapts its interval.
+
+    Ticks are counted from when a run was scheduled, not from when it finished,
+    so fetch latency does not stretch the period; a run that overruns its tick
+    starts the next one immediately instead of queueing the missed ones.
+
+    After a run that found items the interval is divided by ``speedup`` (down to
+    the source's minimum). A quiet run multiplies it by ``backoff``, and each
+    consecutive failure doubles it, both up to the maximum. Every delay is
+    jittered by ``jitter`` so sources sharing an upstream don't fire together.
+    """
+
+    def __init__(self, speedup: float = 2.0, backoff: float = 1.5, jitter: float = 0.1):
+        self.speedup = speedup
+        self.backoff = backoff
+        self.jitter = jitter
+        self.sources: Dict[str, PollSource] = {}
+        self.running = True
+
+    def add(
+        self,
+        name: str,
+        poll: Poll,
+        interval: float,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+    ):
+        """
+        Register a source; it first runs as soon as the scheduler starts.
+
+        :param poll: Coroutine function returning the number of new items
+        :param interval: Starting interval in seconds
+        :param min_interval: Fastest interval while items keep arriving (default ``interval``)
+        :param max_interval: Slowest interval when quiet or failing (default ``interval``)
+        """
+        self.sources[name] = PollSource(
+            name,
+            poll,
+            interval,
+            min_interval if min_interval is not None else interval,
+            max_interval if max_interval is not None else interval,
+        )
+
+    def adapt(self, source: PollSource, items: Optional[int]):
+        """Update ``source.interval`` after a run (``items`` is None when it failed)."""
+        if items is None:
+            source.failures += 1
+            interval = max(source.interval, source.base_interval) * 2
+        elif items > 0:
+            source.failures = 0
+            interval = source.interval / self.speedup
+        else:
+            source.failures = 0
+            interval = source.interval * self.backoff
+        source.interval = min(source.max_interval, max(source.min_interval, interval))
+
+    async def run_source(self, source: PollSource):
+        loop = asyncio.get_running_loop()
+        source.next_run = loop.time()
+        while self.running:
+            delay = source.next_run - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            started = loop.time()
+            items: Optional[int]
+            try:
+                items = await source.poll()
+            except Exception as e:
+                logger.error("Poll of %s failed: %s", source.name, e)
+                items = None
+            now = loop.time()
+            source.runs += 1
+            source.last_duration = now - started
+            source.last_items = items or 0
+            POLL_SECONDS.observe(source.last_duration, source=source.name)
+            if items is None:
+                POLL_FAILURES.inc(source=source.name)
+            else:
+                POLL_ITEMS.inc(items, source=source.name)
+
+            self.adapt(source, items)
+            tick = source.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            source.next_run += tick
+            if source.next_run < now:
+                source.overruns += 1
+                source.next_run = now
+            logger.debug(
+                "%s: %s items in %.2fs, next in %.1fs",
+                source.name, items, source.last_duration, source.next_run - now,
+            )
+
+    async def report(self, every: float):
+        """Log every source's cadence every ``every`` seconds."""
+        while self.running:
+            await asyncio.sleep(every)
+            for c in self.cadence():
+                logger.info(
+                    "%s: every %.0fs (%.0f-%.0fs), %d runs, %d failing, last %d items",
+                    c["source"], c["interval"], c["min_interval"], c["max_interval"],
+                    c["runs"], c["failures"], c["last_items"],
+                )
+
+    async def run_async(self, report_interval: Optional[float] = 600):
+        """Run all registered sources until ``stop()`` or cancellation."""
+        tasks = [self.run_source(s) for s in self.sources.values()]
+        if report_interval:
+            tasks.append(self.report(report_interval))
+        await asyncio.gather(*tasks)
+
+    def stop(self):
+        self.running = False
+
+    def export_metrics(self):
+        """Scrape hook: copy every source's current interval into its gauge."""
+        for s in self.sources.values():
+            POLL_INTERVAL.set(s.interval, source=s.name)
+
+    def cadence(self) -> List[Dict]:
+        """Current interval and recent run stats for every source."""
+        return [
+            {
+                "source": s.name,
+                "interval": s.interval,
+                "min_interval": s.min_interval,
+                "max_interval": s.max_interval,
+                "runs": s.runs,
+                "failures": s.failures,
+                "overruns": s.overruns,
+                "last_items": s.last_items,
+                "last_duration": s.last_duration,
+            }
+            for s in self.sources.values()
+        ]
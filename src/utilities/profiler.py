@@ -0,0 +1,283 @@
+"""
+profiler.py
+
+On-demand CPU and memory profiling of the running bot. Each run covers a
+fixed window and writes its results under ``PROFILE_DIR`` for offline reading.
+"""
+
+import asyncio
+import cProfile
+import os
+import pstats
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import List, Optional
+from src.logger import Logger
+
+logger = Logger.get("Profiler")
+
+CPU_MODES = ("sample", "cprofile")
+
+# Frames that only show the profiler itself.
+_MEMORY_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a profile of the same kind is already running."""
+
+
+def _frame_name(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Statistical profiler for the event-loop thread.
+
+    Where ``setitimer`` exists and the loop runs on the main thread, a SIGPROF
+    timer fires every ``interval`` seconds of process CPU time and the handler
+    records the interrupted stack, so samples land in proportion to where CPU
+    is spent and an idle loop costs nothing. Elsewhere a background thread
+    reads the loop thread's frame instead; it can only do so when the loop
+    releases the GIL, so it under-counts short CPU-bound calls.
+
+    Samples are kept as collapsed stacks (root first), the input format of
+    flamegraph.pl and speedscope.
+
+    The timer is process-wide: every SIGPROF can interrupt a blocking system
+    call in another thread (the pyodbc executor, SSL reads) with EINTR, which
+    C extensions do not always retry. Use it for short diagnostic windows only;
+    the default rate of 50 Hz keeps that interference low.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.02, max_depth: int = 64):
+        """
+        :param thread_id: ``threading.get_ident()`` of the thread to sample
+        :param interval: Seconds between samples
+        :param max_depth: Innermost frames kept per sample
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.use_timer = (
+            hasattr(signal, "setitimer") and thread_id == threading.main_thread().ident
+        )
+        self._previous_handler = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _record(self, frame):
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            names.append(_frame_name(frame.f_code))
+            frame = frame.f_back
+        if names:
+            self.stacks[";".join(reversed(names))] += 1
+            self.samples += 1
+
+    def _on_signal(self, _signum, frame):
+        self._record(frame)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._record(sys._current_frames().get(self.thread_id))
+
+    def start(self):
+        if self.use_timer:
+            self._previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self.use_timer:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+            return
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write_collapsed(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    """
+    Runs CPU and memory profiles of the event-loop thread for a fixed window.
+
+    One CPU and one memory profile may run at a time; starting a second of the
+    same kind raises ProfilerBusy.
+    """
+
+    def __init__(self, output_dir: Optional[str] = None, max_seconds: float = 300):
+        """
+        :param output_dir: Where result files go (default ``PROFILE_DIR``)
+        :param max_seconds: Longest window a caller may ask for
+        """
+        self.output_dir = output_dir or os.getenv("PROFILE_DIR", ".cache/profiles")
+        self.max_seconds = max_seconds
+        self._cpu_running = False
+        self._memory_running = False
+
+    def _path(self, kind: str, suffix: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return os.path.join(self.output_dir, f"{kind}-{stamp}-{os.getpid()}.{suffix}")
+
+    def _window(self, seconds: float) -> float:
+        if seconds <= 0:
+            raise ValueError("Profile window must be positive")
+        return min(seconds, self.max_seconds)
+
+    async def profile_cpu(self, seconds: float, mode: str = "sample") -> List[str]:
+        """
+        Profile the event-loop thread for ``seconds``; returns the files written.
+
+        ``sample`` writes collapsed stacks at little cost (see StackSampler).
+        ``cprofile`` traces every call on the loop thread (several times slower
+        while it runs) and writes a ``.pstats`` file plus a text summary of the top
+        functions by cumulative time.
+        """
+        if mode not in CPU_MODES:
+            raise ValueError(f"Unknown CPU profile mode {mode!r}; use one of {CPU_MODES}")
+        if self._cpu_running:
+            raise ProfilerBusy("A CPU profile is already running")
+        window = self._window(seconds)
+        self._cpu_running = True
+        try:
+            if mode == "sample":
+                sampler = StackSampler(threading.get_ident())
+                sampler.start()
+                try:
+                    await asyncio.sleep(window)
+                finally:
+                    sampler.stop()
+                path = self._path("cpu", "collapsed")
+                await asyncio.to_thread(sampler.write_collapsed, path)
+                logger.info(
+                    "CPU profile: %d samples over %.1fs -> %s", sampler.samples, window, path
+                )
+                return [path]
+
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                await asyncio.sleep(window)
+            finally:
+                profile.disable()
+            path = self._path("cpu", "pstats")
+            summary = self._path("cpu", "txt")
+            await asyncio.to_thread(self._write_pstats, profile, path, summary)
+            logger.info("CPU profile over %.0fs -> %s", window, path)
+            return [path, summary]
+        finally:
+            self._cpu_running = False
+
+    @staticmethod
+    def _write_pstats(profile: cProfile.Profile, path: str, summary: str):
+        profile.dump_stats(path)
+        with open(summary, "w", encoding="utf-8") as f:
+            stats = pstats.Stats(profile, stream=f)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(50)
+
+    async def profile_memory(
+        self, seconds: float, top: int = 25, frames: int = 10
+    ) -> List[str]:
+        """
+        Diff two tracemalloc snapshots taken ``seconds`` apart.
+
+        Writes the top allocators by growth (per line, then per traceback) as
+        text, and the closing snapshot for ``tracemalloc.Snapshot.load``.
+        Tracing is stopped again afterwards unless it was already on.
+        """
+        if self._memory_running:
+            raise ProfilerBusy("A memory profile is already running")
+        window = self._window(seconds)
+        self._memory_running = True
+        started_here = not tracemalloc.is_tracing()
+        try:
+            if started_here:
+                tracemalloc.start(frames)
+            before = tracemalloc.take_snapshot().filter_traces(_MEMORY_FILTERS)
+            await asyncio.sleep(window)
+            after = tracemalloc.take_snapshot().filter_traces(_MEMORY_FILTERS)
+            traced, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started_here:
+                tracemalloc.stop()
+            self._memory_running = False
+
+        path = self._path("memory", "txt")
+        snapshot_path = self._path("memory", "tracemalloc")
+        await asyncio.to_thread(
+            self._write_memory, before, after, path, snapshot_path, top, traced, peak, window
+        )
+        logger.info("Memory profile over %.0fs -> %s", window, path)
+        return [path, snapshot_path]
+
+    @staticmethod
+    def _write_memory(before, after, path, snapshot_path, top, traced, peak, window):
+        after.dump(snapshot_path)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(
+                f"Window {window:.0f}s, traced {traced / 1024:.1f} KiB, "
+                f"peak {peak / 1024:.1f} KiB\n\n"
+            )
+            f.write(f"Top {top} allocators by growth (line):\n")
+            for stat in after.compare_to(before, "lineno")[:top]:
+                f.write(f"{stat}\n")
+            f.write(f"\nTop {min(top, 10)} allocators by growth (traceback):\n")
+            for stat in after.compare_to(before, "traceback")[: min(top, 10)]:
+                f.write(f"\n{stat.size_diff / 1024:+.1f} KiB, {stat.count_diff:+d} blocks\n")
+                for line in stat.traceback.format():
+                    f.write(f"{line}\n")
+
+
+def install_signal_handlers(profiler: Profiler, seconds: float = 30):
+    """
+    ``kill -USR1 <pid>`` starts a CPU profile, ``kill -USR2 <pid>`` a memory
+    profile, each for ``seconds``. Call from inside the running loop; a no-op
+    where these signals don't exist (Windows).
+    """
+    if not hasattr(signal, "SIGUSR1"):
+        return
+    loop = asyncio.get_running_loop()
+
+    async def run(kind: str):
+        try:
+            if kind == "cpu":
+                await profiler.profile_cpu(seconds)
+            else:
+                await profiler.profile_memory(seconds)
+        except ProfilerBusy as e:
+            logger.warning("%s", e)
+        except Exception as e:
+            logger.error("%s profile failed: %s", kind, e)
+
+    tasks = set()
+
+    def start(kind: str):
+        # Keep a reference so the task isn't collected mid-profile.
+        task = loop.create_task(run(kind))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    loop.add_signal_handler(signal.SIGUSR1, start, "cpu")
+    loop.add_signal_handler(signal.SIGUSR2, start, "memory")
+    logger.info("Profiling signals installed: USR1 = CPU, USR2 = memory (%ss)", seconds)
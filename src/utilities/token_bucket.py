@@ -0,0 +1,42 @@
+"""
+token_bucket.py
+
+Async token bucket for sharing an upstream API call budget between pollers.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Refills ``rate`` tokens per second up to ``capacity``; ``acquire`` waits for one."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        :param rate: Tokens added per second
+        :param capacity: Maximum burst size (defaults to one second's worth, at least 1)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def per_minute(cls, calls: float, capacity: Optional[float] = None) -> "TokenBucket":
+        return cls(calls / 60.0, capacity)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until ``tokens`` are available and take them. Callers are served in order."""
+        async with self._lock:
+            self._refill()
+            while self.tokens < tokens:
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= tokens
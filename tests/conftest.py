@@ -0,0 +1,56 @@
+"""
+Fakes shared by the service tests
+"""
+
+import pytest
+
+
+class FakeCheckpointRepository:
+    """
+    In-memory DataCheckpointRepository, with both the per-source calls the
+    services make and the batched ones CheckpointStore makes.
+    """
+
+    def __init__(self):
+        self.checkpoints = {}
+        self.fail = False
+        self.loads = 0
+        self.writes = []
+
+    async def get_last_id(self, source_name):
+        return self.checkpoints.get(source_name)
+
+    async def update_last_id(self, source_name, last_id):
+        self.checkpoints[source_name] = last_id
+
+    async def get_all(self):
+        self.loads += 1
+        return dict(self.checkpoints)
+
+    async def update_many(self, checkpoints):
+        if self.fail:
+            raise RuntimeError("database down")
+        self.writes.append(dict(checkpoints))
+        self.checkpoints.update(checkpoints)
+
+
+class FakeBot:
+    """Records every ping as ``(message, tickers)``."""
+
+    def __init__(self):
+        self.messages = []
+
+    async def ping_users(self, message, tickers=None):
+        self.messages.append((message, list(tickers or [])))
+
+
+@pytest.fixture
+def checkpoint_repo() -> FakeCheckpointRepository:
+    """Return an empty checkpoint repository; tests seed ``.checkpoints``."""
+    return FakeCheckpointRepository()
+
+
+@pytest.fixture
+def bot() -> FakeBot:
+    """Return a Discord bot stand-in that records its messages."""
+    return FakeBot()
@@ -0,0 +1,54 @@
+"""
+Testing the asyncio RedisCache fallback behaviour
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import redis.asyncio as aioredis
+from src.cache.local_cache import LocalCache
+from src.cache.async_redis_cache import AsyncRedisCache
+
+
+def test_unreachable_redis_falls_back_to_local_cache():
+    """Test that a failed connect backs off and the L1 tier keeps answering."""
+
+    async def scenario():
+        pool = aioredis.ConnectionPool(host="127.0.0.1", port=1, decode_responses=True)
+        cache = AsyncRedisCache(
+            namespace="test", local_cache=LocalCache(), retry_interval=60, pool=pool
+        )
+        assert cache.available
+        assert await cache.connect() is False
+        assert not cache.available
+        assert await cache.is_seen_many([1, 2]) == [False, False]
+        await cache.mark_seen_many([1])
+        assert await cache.is_seen_many([1, 2]) == [True, False]
+        await cache.set("k", "v", ex=30)
+        assert await cache.get("k") == "v"
+        assert await cache.get("missing") is None
+        await pool.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_connect_drops_legacy_seen_set():
+    """Test that connect() unlinks the unbounded seen SET of older releases."""
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    pool = fakeredis.FakeAsyncRedis(server=server, decode_responses=True).connection_pool
+    fakeredis.FakeRedis(server=server).sadd("test:seen", 1, 2, 3)
+
+    async def scenario():
+        cache = AsyncRedisCache(namespace="test", pool=pool)
+        assert await cache.connect()
+        await cache.mark_seen_many([1])
+        assert await cache.is_seen_many([1, 2]) == [True, False]
+        await pool.disconnect()
+
+    asyncio.run(scenario())
+    assert not fakeredis.FakeRedis(server=server).exists("test:seen")
@@ -0,0 +1,69 @@
+"""
+Testing the write-behind CheckpointStore
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.datalayer.checkpoint_store import CheckpointStore
+
+
+def test_reads_load_once_and_updates_wait_for_flush(checkpoint_repo):
+    """Test that checkpoints load once and updates reach the DB in one batch."""
+    repo = checkpoint_repo
+    repo.checkpoints["general"] = "10"
+    store = CheckpointStore(repo)
+
+    async def run():
+        assert await store.get_last_id("general") == "10"
+        assert await store.get_last_id("reddit_wsb") is None
+        await store.update_last_id("general", "11")
+        await store.update_last_id("general", "12")
+        await store.update_last_id("reddit_wsb", "1700000000.0")
+        assert repo.writes == []
+        assert await store.get_last_id("general") == "12"
+        await store.flush()
+        await store.flush()
+
+    asyncio.run(run())
+    assert repo.loads == 1
+    assert repo.writes == [{"general": "12", "reddit_wsb": "1700000000.0"}]
+    assert store.dirty == 0
+
+
+def test_failed_flush_keeps_checkpoints_dirty(checkpoint_repo):
+    """Test that a failed write leaves the rows to be retried on the next flush."""
+    repo = checkpoint_repo
+    repo.fail = True
+    store = CheckpointStore(repo)
+
+    async def run():
+        await store.update_last_id("general", "5")
+        with pytest.raises(RuntimeError):
+            await store.flush()
+        assert store.dirty == 1
+        repo.fail = False
+        await store.close()
+
+    asyncio.run(run())
+    assert store.flush_errors == 1
+    assert repo.checkpoints == {"general": "5"}
+
+
+def test_unchanged_update_is_not_written(checkpoint_repo):
+    """Test that re-recording the stored value leaves nothing to flush."""
+    checkpoint_repo.checkpoints["general"] = "10"
+    store = CheckpointStore(checkpoint_repo)
+
+    async def run():
+        await store.get_last_id("general")
+        await store.update_last_id("general", "10")
+        assert store.dirty == 0
+        await store.flush()
+
+    asyncio.run(run())
+    assert checkpoint_repo.writes == []
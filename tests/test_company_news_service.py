@@ -0,0 +1,146 @@
+"""
+Testing the CompanyNewsService scheduler
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from unittest.mock import patch
+from src.services.company_news_service import CompanyNewsService
+from src.utilities.token_bucket import TokenBucket
+
+
+class FakeCompanyRepository:
+    def __init__(self, tickers):
+        self.tickers = tickers
+
+    async def get_all(self):
+        return [{"company_name": t.title(), "ticker_symbol": t} for t in self.tickers]
+
+
+class FakeNewsService:
+    mention_tracker = None
+
+    def __init__(self, checkpoints=None):
+        self.checkpoints = dict(checkpoints or {})
+        self.ingested = []
+
+    async def get_checkpoint(self, source_name):
+        return int(self.checkpoints.get(source_name) or 0)
+
+    async def ingest(self, news, source_name, last_seen_id=None, key="id"):
+        self.ingested.append((source_name, news, last_seen_id, key))
+        return len(news)
+
+
+class FakeMentions:
+    def __init__(self, scores):
+        self.scores = scores
+
+    def score(self, ticker):
+        return self.scores.get(ticker, 0.0)
+
+
+def make_service(tickers=(), checkpoints=None, **kwargs) -> CompanyNewsService:
+    service = CompanyNewsService(
+        db=None,
+        news_service=FakeNewsService(checkpoints),
+        rate_limiter=TokenBucket(1000),
+        api_key="FAKE_KEY",
+        **kwargs,
+    )
+    service.repo = FakeCompanyRepository(list(tickers))
+    return service
+
+
+def test_weight_and_interval_clamping():
+    """Test that followers and mentions shorten the interval within its bounds."""
+    service = make_service(
+        subscriber_count=lambda t: {"NVDA": 4, "TSLA": 1000}.get(t, 0),
+        mention_tracker=FakeMentions({"NVDA": 5.0}),
+        base_interval=900,
+        min_interval=60,
+        max_interval=3600,
+    )
+
+    assert service.weight("NVDA") == 10
+    assert service.weight("AAPL") == 1
+    assert service.interval_for("NVDA") == 90
+    assert service.interval_for("AAPL") == 900
+    assert service.interval_for("TSLA") == 60  # clamped to min_interval
+
+    service.base_interval = 7200
+    assert service.interval_for("AAPL") == 3600  # clamped to max_interval
+
+
+def test_load_universe_keeps_due_times():
+    """Test that a reload keeps existing due times, drops removed tickers and staggers new ones."""
+    service = make_service(["AAPL", "NVDA"], min_interval=60)
+
+    async def run():
+        await service.load_universe()
+        service._schedule = [(12345.0, "AAPL"), (23456.0, "NVDA")]
+        service.repo.tickers = ["AAPL", "TSLA", "MSFT"]
+        now = asyncio.get_running_loop().time()
+        await service.load_universe()
+        return now
+
+    now = asyncio.run(run())
+    due = {ticker: at for at, ticker in service._schedule}
+    assert set(due) == {"AAPL", "MSFT", "TSLA"}
+    assert due["AAPL"] == 12345.0
+    # New tickers are spread over one minimum interval, in name order.
+    assert now <= due["MSFT"] < due["TSLA"] < now + 60
+
+
+def make_company_news(timestamps):
+    return [{"id": i, "datetime": ts, "headline": f"story {i}"} for i, ts in enumerate(timestamps)]
+
+
+def test_first_fetch_is_capped_to_newest_items():
+    """Test that a ticker without a checkpoint only queues its newest items."""
+    service = make_service(first_fetch_items=2)
+
+    async def fake_fetch(api_key, symbol, from_date, to_date):
+        return make_company_news([100, 400, 300, 200])
+
+    with patch("src.services.company_news_service.fetch_company_news", fake_fetch):
+        queued = asyncio.run(service.poll_ticker("NVDA"))
+
+    assert queued == 2
+    source_name, news, last_seen, key = service.news_service.ingested[0]
+    assert (source_name, last_seen, key) == ("finnhub_company_NVDA", 0, "datetime")
+    assert [n["datetime"] for n in news] == [400, 300]
+    assert all(n["companies"] == ["NVDA"] for n in news)
+
+
+def test_later_fetch_starts_at_checkpoint_day_uncapped():
+    """Test that a known checkpoint sets the start date and passes every item on."""
+    # 2024-03-01T12:00:00Z
+    service = make_service(checkpoints={"finnhub_company_AAPL": "1709294400"})
+    calls = []
+
+    async def fake_fetch(api_key, symbol, from_date, to_date):
+        calls.append((symbol, from_date))
+        return make_company_news([100, 400, 300, 200])
+
+    with patch("src.services.company_news_service.fetch_company_news", fake_fetch):
+        queued = asyncio.run(service.poll_ticker("AAPL"))
+
+    assert calls == [("AAPL", "2024-03-01")]
+    assert queued == 4
+    assert service.news_service.ingested[0][2] == 1709294400
+
+
+def test_failed_polls_back_off_until_a_success():
+    """Test that failures double a ticker's interval up to the maximum and success resets it."""
+    service = make_service(base_interval=900, min_interval=60, max_interval=3600)
+
+    assert service.next_interval("NVDA", failed=True) == 1800
+    assert service.next_interval("NVDA", failed=True) == 3600
+    assert service.next_interval("NVDA", failed=True) == 3600
+    assert service.next_interval("NVDA", failed=False) == 900
+    assert service.next_interval("NVDA", failed=True) == 1800
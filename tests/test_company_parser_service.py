@@ -0,0 +1,137 @@
+"""
+Testing the CompanyParserService keyword index cache
+"""
+
+import sys
+import asyncio
+import gc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.company_parser_service import CompanyParserService
+from src.utilities.keyword_index import load_index, save_index
+
+
+class FakeCompanyRepository:
+    def __init__(self, companies):
+        self.companies = companies
+        self.get_all_calls = 0
+
+    async def get_fingerprint(self):
+        return f"{len(self.companies)}:{hash(tuple(sorted(self.companies.items())))}"
+
+    async def get_all(self):
+        self.get_all_calls += 1
+        return [
+            {"company_name": name, "ticker_symbol": ticker}
+            for name, ticker in self.companies.items()
+        ]
+
+
+def make_parser(tmp_path, repo):
+    parser = CompanyParserService(db=None, index_path=str(tmp_path / "index.pkl"))
+    parser.repo = repo
+    return parser
+
+
+def test_index_is_reused_until_table_changes(tmp_path):
+    """Test that the DB is only read when the Companies fingerprint changes."""
+    repo = FakeCompanyRepository({"Apple": "AAPL"})
+
+    first = make_parser(tmp_path, repo)
+    asyncio.run(first.load())
+    assert repo.get_all_calls == 1
+
+    second = make_parser(tmp_path, repo)
+    asyncio.run(second.load())
+    assert repo.get_all_calls == 1
+    assert second.extract_companies("Apple beats estimates") == ["AAPL"]
+
+    repo.companies["Tesla"] = "TSLA"
+    third = make_parser(tmp_path, repo)
+    asyncio.run(third.load())
+    assert repo.get_all_calls == 2
+    assert third.extract_companies("Tesla and Apple") == ["TSLA", "AAPL"]
+
+
+def test_corrupt_index_is_rebuilt(tmp_path):
+    """Test that an unreadable index falls back to the database."""
+    corrupt = [
+        b"not a pickle",
+        # Written by a Python with a newer pickle protocol: "unsupported pickle protocol".
+        b"\x80\x63" + b"\x00" * 16,
+    ]
+    for contents in corrupt:
+        (tmp_path / "index.pkl").write_bytes(contents)
+        repo = FakeCompanyRepository({"Apple": "AAPL"})
+        parser = make_parser(tmp_path, repo)
+        asyncio.run(parser.load())
+        assert repo.get_all_calls == 1
+        assert parser.extract_companies("AAPL") == ["AAPL"]
+
+
+def test_index_io_keeps_gc_state_and_cleans_up(tmp_path):
+    """Test that loading leaves a disabled collector off and a failed save leaves no temp file."""
+    path = str(tmp_path / "index.pkl")
+    save_index(path, "fp", {"apple": "AAPL"})
+    gc.disable()
+    try:
+        assert load_index(path, "fp") == {"apple": "AAPL"}
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+
+    save_index(str(tmp_path / "other.pkl"), "fp", lambda: None)  # not picklable
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["index.pkl"]
+
+
+def make_loaded_parser(tmp_path, **kwargs):
+    parser = CompanyParserService(
+        db=None, index_path=str(tmp_path / "index.pkl"), **kwargs
+    )
+    parser.processor.add_keyword("Apple", "AAPL")
+    parser.processor.add_keyword("AAPL", "AAPL")
+    parser.processor.add_keyword("Tesla", "TSLA")
+    return parser
+
+
+def test_batch_extraction_dedupes_per_text(tmp_path):
+    """Test that each text yields its tickers once, in order of first mention."""
+    parser = make_loaded_parser(tmp_path, workers=0)
+    texts = ["Apple and Tesla\nAAPL rallies", "", "No companies here"]
+    assert parser.extract_companies_batch(texts) == [["AAPL", "TSLA"], [], []]
+    assert asyncio.run(parser.extract_companies_batch_async(texts)) == [
+        ["AAPL", "TSLA"], [], []
+    ]
+
+
+def test_batch_extraction_on_process_pool(tmp_path):
+    """Test that large batches give the same results through the process pool."""
+    parser = make_loaded_parser(tmp_path, workers=2, parallel_threshold=2)
+    texts = ["Tesla", "Apple Tesla", "nothing", "AAPL"] * 5
+    try:
+        result = asyncio.run(parser.extract_companies_batch_async(texts))
+    finally:
+        parser.close()
+    assert result == parser.extract_companies_batch(texts)
+
+
+def test_pool_swap_lets_in_flight_parses_finish(tmp_path):
+    """Test that new keywords replace the pool without cancelling queued parses."""
+    parser = make_loaded_parser(tmp_path, workers=2, parallel_threshold=2)
+    texts = ["Tesla", "Apple Tesla", "nothing", "AAPL"] * 50
+
+    async def run():
+        in_flight = asyncio.ensure_future(parser.extract_companies_batch_async(texts))
+        await asyncio.sleep(0)
+        parser.add_companies([("Nvidia", "NVDA")])
+        fresh = await parser.extract_companies_batch_async(["Nvidia", "Tesla"])
+        return await in_flight, fresh
+
+    try:
+        first, fresh = asyncio.run(run())
+    finally:
+        parser.close()
+    assert first == parser.extract_companies_batch(texts)
+    assert fresh == [["NVDA"], ["TSLA"]]
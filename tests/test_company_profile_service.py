@@ -0,0 +1,94 @@
+"""
+Testing the CompanyProfileService read-through cache
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from unittest.mock import patch
+import redis.asyncio as aioredis
+from src.cache.async_redis_cache import AsyncRedisCache
+from src.cache.local_cache import LocalCache
+from src.services.company_profile_service import CompanyProfileService, describe
+
+PROFILES = {
+    "AAPL": {"name": "Apple Inc", "finnhubIndustry": "Technology",
+             "marketCapitalization": 3_000_000, "logo": "https://logo/aapl.png"},
+    "TSLA": {"name": "Tesla Inc", "finnhubIndustry": "Automobiles",
+             "marketCapitalization": 800_000, "logo": ""},
+}
+
+
+class FakeFinnhub:
+    def __init__(self):
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.fail = set()
+
+    async def __call__(self, symbol, api_key):
+        self.calls.append(symbol)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if symbol in self.fail:
+            return None
+        return PROFILES.get(symbol, {})
+
+
+async def make_service(**kwargs) -> CompanyProfileService:
+    # No Redis in tests: after the failed connect the L1 tier is the whole cache.
+    pool = aioredis.ConnectionPool(host="127.0.0.1", port=1)
+    cache = AsyncRedisCache(
+        namespace="company", local_cache=LocalCache(), retry_interval=3600, pool=pool
+    )
+    await cache.connect()
+    return CompanyProfileService(cache, api_key="key", **kwargs)
+
+
+def test_concurrent_misses_share_one_fetch():
+    """Test that concurrent lookups coalesce and later ones hit the cache."""
+    finnhub = FakeFinnhub()
+
+    async def scenario():
+        service = await make_service()
+        results = await asyncio.gather(*(service.get_profile("aapl") for _ in range(5)))
+        again = await service.get_profile("AAPL")
+        return service, results, again
+
+    with patch("src.services.company_profile_service.fetch_company_profile", finnhub):
+        service, results, again = asyncio.run(scenario())
+
+    assert finnhub.calls == ["AAPL"]
+    assert service.coalesced == 4
+    assert all(r == again for r in results)
+    assert again["sector"] == "Technology"
+    assert describe("AAPL", again) == "AAPL (Apple Inc, Technology, $3.0T)"
+
+
+def test_concurrency_cap_and_negative_caching():
+    """Test the in-flight cap, cached unknown symbols and uncached failures."""
+    finnhub = FakeFinnhub()
+    finnhub.fail = {"MSFT"}
+
+    async def scenario():
+        service = await make_service(max_concurrency=2)
+        articles = [
+            {"companies": ["AAPL", "TSLA"]},
+            {"companies": ["ZZZZ", "MSFT"]},
+        ]
+        await service.enrich(articles)
+        await service.get_profiles(["ZZZZ", "MSFT"])
+        return articles
+
+    with patch("src.services.company_profile_service.fetch_company_profile", finnhub):
+        articles = asyncio.run(scenario())
+
+    assert finnhub.max_active == 2
+    assert sorted(finnhub.calls) == ["AAPL", "MSFT", "MSFT", "TSLA", "ZZZZ"]
+    assert set(articles[0]["profiles"]) == {"AAPL", "TSLA"}
+    assert articles[1]["profiles"] == {}
@@ -0,0 +1,53 @@
+"""
+Testing the CompanyRepository set-based bulk upsert
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from unittest.mock import MagicMock, patch
+from src.datalayer import company_repository
+from src.datalayer.company_repository import CompanyRepository
+from src.datalayer.connection import Database
+
+
+@patch("src.datalayer.connection.pyodbc.connect")
+def test_bulk_upsert_stages_rows_in_chunks(mock_connect):
+    """Test that rows are staged with fast_executemany and merged once."""
+    conn = MagicMock(closed=False)
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.fetchone.return_value = (3, 1)
+    mock_connect.return_value = conn
+
+    db = Database("server", "db", "user", "pass", pool_size=1)
+    repo = CompanyRepository(db)
+    companies = {f"Company {i}": f"C{i}" for i in range(5)}
+    with patch.object(company_repository, "STAGING_CHUNK", 2):
+        counts = asyncio.run(repo.bulk_upsert(companies))
+    db.close()
+
+    assert counts == {"inserted": 3, "updated": 1}
+    batches = [c.args[1] for c in cursor.executemany.call_args_list]
+    assert [len(b) for b in batches] == [2, 2, 1]
+    merge_sql = cursor.execute.call_args_list[-1].args[0]
+    assert "MERGE Companies" in merge_sql and "UPDATE SET" in merge_sql
+    conn.commit.assert_called_once()
+
+
+@patch("src.datalayer.connection.pyodbc.connect")
+def test_bulk_insert_does_not_update(mock_connect):
+    """Test that the insert-only path leaves existing tickers alone."""
+    conn = MagicMock(closed=False)
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.fetchone.return_value = (1, 0)
+    mock_connect.return_value = conn
+
+    db = Database("server", "db", "user", "pass", pool_size=1)
+    counts = asyncio.run(CompanyRepository(db).bulk_insert({"Apple": "AAPL"}))
+    db.close()
+
+    assert counts == {"inserted": 1, "updated": 0}
+    assert "UPDATE SET" not in cursor.execute.call_args_list[-1].args[0]
@@ -0,0 +1,72 @@
+"""
+Testing the Database connection pool
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from unittest.mock import MagicMock, patch
+import pyodbc
+from src.datalayer.connection import Database, PoolTimeout
+
+
+@pytest.fixture
+def db() -> Database:
+    """Return a Database with a two-connection pool."""
+    return Database("server", "db", "user", "pass", pool_size=2, checkout_timeout=0.05)
+
+
+@patch("src.datalayer.connection.pyodbc.connect")
+def test_connections_are_reused(mock_connect, db: Database):
+    """Test that a released connection is handed out again."""
+    mock_connect.side_effect = lambda *_: MagicMock(closed=False)
+    with db.acquire() as first:
+        pass
+    with db.acquire() as second:
+        pass
+    assert first is second
+    assert db.metrics()["connects"] == 1
+    assert db.metrics()["checkouts"] == 2
+
+
+@patch("src.datalayer.connection.pyodbc.connect")
+def test_broken_connection_is_replaced(mock_connect, db: Database):
+    """Test that a connection-level error drops the connection and reconnects."""
+    mock_connect.side_effect = lambda *_: MagicMock(closed=False)
+    with pytest.raises(pyodbc.OperationalError):
+        with db.acquire():
+            raise pyodbc.OperationalError("link failure")
+    with db.acquire():
+        pass
+    metrics = db.metrics()
+    assert metrics["discarded"] == 1
+    assert metrics["connects"] == 2
+    assert metrics["in_use"] == 0
+
+
+@patch("src.datalayer.connection.pyodbc.connect")
+def test_checkout_times_out_when_exhausted(mock_connect, db: Database):
+    """Test that checkout fails once every connection is borrowed."""
+    mock_connect.side_effect = lambda *_: MagicMock(closed=False)
+    with db.acquire(), db.acquire():
+        with pytest.raises(PoolTimeout):
+            with db.acquire():
+                pass
+    assert db.metrics()["checkout_timeouts"] == 1
+
+
+@patch("src.datalayer.connection.pyodbc.connect")
+def test_uncommitted_work_is_rolled_back_on_release(mock_connect, db: Database):
+    """Test that a connection goes back to the pool without an open transaction."""
+    mock_connect.side_effect = lambda *_: MagicMock(closed=False)
+    with db.acquire() as conn:
+        conn.cursor().execute("UPDATE t SET x = 1")
+    conn.rollback.assert_called_once()
+
+    conn.rollback.side_effect = pyodbc.Error("rollback failed")
+    with db.acquire():
+        pass
+    assert db.metrics()["discarded"] == 1
@@ -0,0 +1,123 @@
+"""
+Testing the shared HttpClient
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aiohttp import web
+from src.api.http_client import NOT_MODIFIED, HttpClient, HttpError, pick
+
+
+async def _serve(handler):
+    app = web.Application()
+    app.router.add_get("/data", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/data"
+
+
+def test_retries_transient_status_then_succeeds():
+    """Test that a 503 is retried and the JSON body of the retry is returned."""
+    calls = []
+
+    async def handler(_request):
+        calls.append(1)
+        if len(calls) == 1:
+            return web.Response(status=503)
+        return web.json_response([{"id": 1}])
+
+    async def run():
+        runner, url = await _serve(handler)
+        client = HttpClient(retries=2, backoff=0.01)
+        try:
+            return await client.get_json(url)
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    assert asyncio.run(run()) == [{"id": 1}]
+    assert len(calls) == 2
+
+
+def test_client_error_is_not_retried():
+    """Test that a 4xx raises HttpError without retrying."""
+    calls = []
+
+    async def handler(_request):
+        calls.append(1)
+        return web.Response(status=401)
+
+    async def run():
+        runner, url = await _serve(handler)
+        client = HttpClient(retries=2, backoff=0.01)
+        try:
+            await client.get_json(url)
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    with pytest.raises(HttpError) as exc:
+        asyncio.run(run())
+    assert exc.value.status == 401
+    assert len(calls) == 1
+
+
+def test_malformed_json_raises_http_error():
+    """Test that a truncated body surfaces as HttpError and is not cached for 304s."""
+    requests = []
+
+    async def handler(request):
+        requests.append(request.headers.get("If-None-Match"))
+        return web.Response(body=b'{"data": {"children": [', headers={"ETag": '"v1"'})
+
+    async def run():
+        runner, url = await _serve(handler)
+        client = HttpClient(retries=0)
+        try:
+            for _ in range(2):
+                with pytest.raises(HttpError):
+                    await client.get_json(url, conditional=True)
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    asyncio.run(run())
+    assert requests == [None, None]
+
+
+def test_conditional_get_returns_not_modified():
+    """Test that the stored ETag is sent back and a 304 skips the body."""
+    seen_validators = []
+
+    async def handler(request):
+        seen_validators.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.json_response([{"id": 1, "unused": "x"}], headers={"ETag": '"v1"'})
+
+    async def run():
+        runner, url = await _serve(handler)
+        client = HttpClient(retries=0)
+        try:
+            first = await client.get_json(url, params={"q": 1}, conditional=True)
+            second = await client.get_json(url, params={"q": 1}, conditional=True)
+            other = await client.get_json(url, params={"q": 2}, conditional=True)
+            return first, second, other, client.not_modified
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    first, second, other, not_modified = asyncio.run(run())
+    assert pick(first, ["id"]) == [{"id": 1}]
+    assert second is NOT_MODIFIED
+    assert other == first
+    assert not_modified == 1
+    assert seen_validators == [None, '"v1"', None]
@@ -0,0 +1,56 @@
+"""
+Testing the LocalCache class and the two-tier RedisCache
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from unittest.mock import patch
+import redis
+from src.cache.local_cache import LocalCache
+from src.cache.redis_cache import RedisCache
+
+
+def test_lru_eviction_and_counters():
+    """Test that the least recently used entry is evicted first."""
+    cache = LocalCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.lookup("b") == (False, None)
+    assert cache.lookup("a") == (True, "1")
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_ttl_and_negative_caching():
+    """Test that entries expire and misses are cached with the negative TTL."""
+    cache = LocalCache(ttl=10, negative_ttl=1)
+    with patch("src.cache.local_cache.time.monotonic", return_value=100.0):
+        cache.set("a", "1")
+        cache.set_missing("b")
+        assert cache.lookup("b") == (True, None)
+    with patch("src.cache.local_cache.time.monotonic", return_value=102.0):
+        assert cache.lookup("a") == (True, "1")
+        assert cache.lookup("b") == (False, None)
+    with patch("src.cache.local_cache.time.monotonic", return_value=111.0):
+        assert cache.lookup("a") == (False, None)
+
+
+@patch("src.cache.redis_cache.redis.Redis")
+def test_dedup_survives_redis_outage(mock_redis):
+    """Test that the L1 tier keeps deduplication working without Redis."""
+    mock_redis.return_value.ping.side_effect = redis.ConnectionError("refused")
+    cache = RedisCache(namespace="test", local_cache=LocalCache())
+    assert cache.client is None
+    assert cache.is_seen_many([1, 2]) == [False, False]
+    cache.mark_seen_many([1])
+    assert cache.is_seen_many([1, 2]) == [True, False]
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+    assert cache.get("missing") is None
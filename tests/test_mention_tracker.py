@@ -0,0 +1,42 @@
+"""
+Testing the decaying MentionTracker
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from unittest.mock import patch
+from src.services.mention_tracker import MentionTracker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_mentions_decay_by_half_life():
+    """Test that each mention counts once and halves every half-life."""
+    clock = FakeClock()
+    tracker = MentionTracker(half_life=60)
+
+    with patch("src.services.mention_tracker.time", clock):
+        tracker.record(["NVDA", "AAPL"])
+        tracker.record(["NVDA"])
+        assert tracker.score("NVDA") == 2
+        assert tracker.score("AAPL") == 1
+        assert tracker.score("TSLA") == 0
+
+        clock.now += 60
+        assert tracker.score("NVDA") == 1
+        # A new mention adds to the decayed score, not the original one.
+        tracker.record(["NVDA"])
+        assert tracker.score("NVDA") == 2
+
+        clock.now += 120
+        assert tracker.score("NVDA") == 0.5
+        assert tracker.score("AAPL") == 0.125
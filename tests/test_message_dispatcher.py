@@ -0,0 +1,79 @@
+"""
+Testing the MessageDispatcher class
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from unittest.mock import AsyncMock, MagicMock
+import discord
+from src.services.message_dispatcher import MessageDispatcher, RateLimitBucket
+
+
+def _rate_limited(retry_after: float, **headers) -> discord.HTTPException:
+    response = MagicMock(status=429, reason="Too Many Requests")
+    response.headers = {"Retry-After": str(retry_after), **headers}
+    return discord.HTTPException(response, "rate limited")
+
+
+def test_submit_returns_immediately_and_drops_when_full():
+    """Test that producers never wait on the sender."""
+    dispatcher = MessageDispatcher(max_queue=1)
+    channel = MagicMock(id=1)
+    assert dispatcher.submit(channel, "first") is True
+    assert dispatcher.submit(channel, "second") is False
+    assert dispatcher.queue_depth == 1
+    assert dispatcher.stats()["dropped"] == 1
+
+
+def test_sender_retries_after_429():
+    """Test that a 429 blocks the route bucket and the message is retried."""
+
+    async def run():
+        dispatcher = MessageDispatcher()
+        channel = MagicMock(id=1)
+        channel.send = AsyncMock(side_effect=[_rate_limited(0.01), None])
+        dispatcher.submit(channel, "hello")
+
+        task = asyncio.create_task(dispatcher.run_async())
+        await asyncio.wait_for(dispatcher.drain(), timeout=1)
+        task.cancel()
+        return dispatcher, channel
+
+    dispatcher, channel = asyncio.run(run())
+    assert channel.send.await_count == 2
+    stats = dispatcher.stats()
+    assert stats["sent"] == 1
+    assert stats["rate_limited"] == 1
+    assert stats["queue_depth"] == 0
+
+
+def test_bucket_waits_for_reset_once_exhausted():
+    """Test the fixed-window bucket accounting."""
+    bucket = RateLimitBucket(limit=2, per=5.0)
+    bucket.consume(0.0)
+    bucket.consume(1.0)
+    assert bucket.delay(2.0) == 3.0
+    assert bucket.delay(5.0) == 0.0
+
+
+def test_429_adopts_discords_route_limit():
+    """Test that the bucket takes the route limit Discord reports with a 429."""
+
+    async def run():
+        dispatcher = MessageDispatcher(route_limit=5)
+        channel = MagicMock(id=1)
+        channel.send = AsyncMock(
+            side_effect=[_rate_limited(0.01, **{"X-RateLimit-Limit": "2"}), None]
+        )
+        dispatcher.submit(channel, "hello")
+        task = asyncio.create_task(dispatcher.run_async())
+        await asyncio.wait_for(dispatcher.drain(), timeout=1)
+        task.cancel()
+        return dispatcher
+
+    dispatcher = asyncio.run(run())
+    assert dispatcher.buckets["POST /channels/1/messages"].limit == 2
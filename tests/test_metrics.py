@@ -0,0 +1,72 @@
+"""
+Testing the metrics registry and its Prometheus endpoint
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import aiohttp
+from src.metrics import Counter, Gauge, Histogram, Metric, MetricsServer, Registry
+
+
+def test_render_prometheus_text():
+    """Test counters, gauges and cumulative histogram buckets in the text format."""
+    registry = Registry()
+    requests = registry.register(Counter("requests_total", "Requests", ["api"]))
+    depth = registry.register(Gauge("queue_depth", "Depth"))
+    latency = registry.register(Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0)))
+
+    requests.inc(api="reddit")
+    requests.inc(2, api="reddit")
+    registry.on_scrape(lambda: depth.set(7))
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(3.0)
+
+    text = registry.render()
+    assert "# TYPE newstracker_requests_total counter" in text
+    assert 'newstracker_requests_total{api="reddit"} 3' in text
+    assert "newstracker_queue_depth 7" in text
+    assert 'newstracker_latency_seconds_bucket{le="0.1"} 1.0' in text
+    assert 'newstracker_latency_seconds_bucket{le="1.0"} 2.0' in text
+    assert 'newstracker_latency_seconds_bucket{le="+Inf"} 3.0' in text
+    assert "newstracker_latency_seconds_count 3.0" in text
+
+
+def test_register_returns_existing_and_checks_labels():
+    """Test that re-registering a name returns the same metric and mismatches raise."""
+    registry = Registry()
+    first = registry.register(Counter("events_total", "Events", ["kind"]))
+    assert registry.register(Counter("events_total", "Events", ["kind"])) is first
+    with pytest.raises(ValueError):
+        registry.register(Gauge("events_total", "Events", ["kind"]))
+    with pytest.raises(ValueError):
+        first.inc(other="x")
+    # The base class only defines the interface.
+    with pytest.raises(TypeError):
+        Metric("base", "Base")
+
+
+def test_server_serves_metrics():
+    """Test that GET /metrics returns the rendered registry."""
+    registry = Registry()
+    registry.register(Counter("hits_total", "Hits")).inc()
+
+    async def run():
+        server = MetricsServer(port=0, registry=registry)
+        await server.start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                url = f"http://127.0.0.1:{server.port}/metrics"
+                async with session.get(url) as resp:
+                    return resp.headers["Content-Type"], await resp.text()
+        finally:
+            await server.stop()
+
+    content_type, body = asyncio.run(run())
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert "newstracker_hits_total 1" in body
@@ -3,55 +3,210 @@ Testing the NewsService class
 """
 
 import sys
+import asyncio
 from pathlib import Path
 import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
+import redis.asyncio as aioredis
+from src.api.http_client import HttpError
+from src.cache.async_redis_cache import AsyncRedisCache
+from src.cache.local_cache import LocalCache
 from src.services.news_service import NewsService
 from src.services.company_parser_service import CompanyParserService
 
 
+class FakeProfileService:
+    async def enrich(self, articles):
+        for article in articles:
+            article["profiles"] = {}
+
+
+class FakeFinnhub:
+    """Returns ``items`` filtered by ``min_id`` and capped at ``max_items``, like fetch_news."""
+
+    def __init__(self, items):
+        self.items = items
+        self.calls = []
+
+    async def __call__(self, api_key, category="general", max_items=3, min_id=None):
+        self.calls.append({"category": category, "max_items": max_items, "min_id": min_id})
+        news = [dict(n) for n in self.items if not min_id or n["id"] > min_id]
+        return news[:max_items] if max_items is not None else news
+
+
+def make_cache(namespace):
+    # Nothing listens on port 1, so the cache answers from its L1 tier alone.
+    pool = aioredis.ConnectionPool(host="127.0.0.1", port=1)
+    return AsyncRedisCache(
+        namespace=namespace, local_cache=LocalCache(), retry_interval=3600, pool=pool
+    )
+
+
 @pytest.fixture
-def news_service() -> NewsService:
-    """Return a NewsService instance for testing."""
-    company_parser = CompanyParserService(companies={})
-    return NewsService(api_key="FAKE_KEY", max_items=3, company_parser=company_parser)
-
-
-@patch("src.api.finnhub_api.requests.get")
-def test_fetch_news_limits_to_max_items(mock_get, news_service: NewsService):
-    """Test that fetch_news respects max_items limit."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = [
-        {"headline": "News 1", "url": "url1"},
-        {"headline": "News 2", "url": "url2"},
-        {"headline": "News 3", "url": "url3"},
-        {"headline": "News 4", "url": "url4"},
+def news_service(checkpoint_repo, bot) -> NewsService:
+    """Return a NewsService with in-memory stand-ins for Redis, the DB and Discord."""
+    company_parser = CompanyParserService(db=None, workers=0)
+    company_parser.add_companies([("Nvidia", "NVDA"), ("Apple", "AAPL")])
+    service = NewsService(
+        company_parser=company_parser,
+        db=None,
+        bot=bot,
+        api_key="FAKE_KEY",
+        max_items=3,
+        categories=["general"],
+        news_cache=make_cache("news"),
+        company_cache=make_cache("company"),
+        profile_service=FakeProfileService(),
+        checkpoints=checkpoint_repo,
+    )
+    return service
+
+
+def make_news(count, start=1):
+    return [
+        {"id": i, "headline": f"Nvidia story {i}", "summary": "", "url": f"url{i}"}
+        for i in range(start + count - 1, start - 1, -1)
+    ]
+
+
+def test_first_fetch_limits_to_max_items(news_service: NewsService):
+    """Test that the first fetch (no checkpoint) is capped at max_items."""
+    finnhub = FakeFinnhub(make_news(5))
+
+    with patch("src.services.news_service.fetch_news", finnhub):
+        delivered = asyncio.run(news_service.fetch_news())
+
+    assert finnhub.calls == [{"category": "general", "max_items": 3, "min_id": None}]
+    assert [n["id"] for n in delivered] == [5, 4, 3]
+    assert news_service.news_checkpoint_repo.checkpoints["finnhub"] == "5"
+    assert len(news_service.bot.messages) == 3
+
+
+def test_later_fetch_resumes_from_checkpoint(news_service: NewsService):
+    """Test that the checkpoint is sent as minId and no cap is applied."""
+    news_service.news_checkpoint_repo.checkpoints["finnhub"] = "5"
+    finnhub = FakeFinnhub(make_news(8))
+
+    with patch("src.services.news_service.fetch_news", finnhub):
+        delivered = asyncio.run(news_service.fetch_news())
+
+    assert finnhub.calls[0]["min_id"] == 5 and finnhub.calls[0]["max_items"] is None
+    assert [n["id"] for n in delivered] == [8, 7, 6]
+
+
+def test_fetch_news_handles_empty_response(news_service: NewsService):
+    """Test that an empty upstream response delivers nothing."""
+    with patch("src.services.news_service.fetch_news", FakeFinnhub([])):
+        assert asyncio.run(news_service.fetch_news()) == []
+    assert news_service.bot.messages == []
+
+
+def test_validate_news_drops_seen_and_old_items(news_service: NewsService):
+    """Test that items at or below the checkpoint, or already seen, are dropped."""
+
+    async def run():
+        first = await news_service.validate_news(make_news(3), last_seen_id=1)
+        # Another feed re-delivers 3 under a lower checkpoint.
+        again = await news_service.validate_news(make_news(3), "finnhub_merger", 2)
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert [n["id"] for n in first] == [3, 2]
+    assert again == []
+
+
+def test_validate_company_keeps_only_tagged_items(news_service: NewsService):
+    """Test that tickers from headline and summary are attached, untagged items dropped."""
+    news = [
+        {"id": 1, "headline": "Apple earnings", "summary": "Nvidia also rose"},
+        {"id": 2, "headline": "Markets flat", "summary": ""},
+        {"id": 3, "headline": "Chips", "summary": "", "companies": ["AMD"]},
     ]
-    mock_response.raise_for_status.return_value = None
-    mock_get.return_value = mock_response
-
-    news = news_service.fetch_news()
-    # Ensure only max_items are returned
-    assert len(news) == news_service.max_items
-    headlines = [item["headline"] for item in news]
-    assert headlines == ["News 1", "News 2", "News 3"]
-
-
-@patch("src.api.finnhub_api.requests.get")
-def test_fetch_news_handles_timeout(mock_get, news_service: NewsService):
-    """Test that fetch_news returns empty list on exception."""
-    mock_get.side_effect = Exception("Timeout")
-    news = news_service.fetch_news()
-    assert news == []
-
-
-@patch("src.api.finnhub_api.requests.get")
-def test_fetch_news_handles_empty_response(mock_get, news_service: NewsService):
-    """Test that fetch_news returns empty list when API returns empty."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = []
-    mock_response.raise_for_status.return_value = None
-    mock_get.return_v
+    processed = asyncio.run(news_service.validate_company(news))
+    assert [(n["id"], n["companies"]) for n in processed] == [
+        (1, ["AAPL", "NVDA"]),
+        (3, ["AMD"]),
+    ]
+
+
+def test_failed_enrichment_still_delivers(news_service: NewsService):
+    """Test that a profile lookup failure sends the articles without profiles."""
+
+    class FailingProfileService:
+        async def enrich(self, articles):
+            raise RuntimeError("profile lookup down")
+
+    news_service.profile_service = FailingProfileService()
+    with patch("src.services.news_service.fetch_news", FakeFinnhub(make_news(2))):
+        delivered = asyncio.run(news_service.fetch_news())
+
+    assert [n["id"] for n in delivered] == [2, 1]
+    assert len(news_service.bot.messages) == 2
+
+
+def test_poll_fails_only_when_every_category_fails(news_service: NewsService):
+    """Test that one failed category is skipped but a total failure reaches the scheduler."""
+    finnhub = FakeFinnhub(make_news(2))
+
+    async def flaky(api_key, category="general", max_items=3, min_id=None):
+        if category == "merger":
+            raise HttpError("HTTP 502 from finnhub", 502)
+        return await finnhub(api_key, category, max_items, min_id)
+
+    news_service.categories = ["general", "merger"]
+    with patch("src.services.news_service.fetch_news", flaky):
+        batches = asyncio.run(news_service.fetch_batches())
+    assert [b.source for b in batches] == ["finnhub"]
+
+    news_service.categories = ["merger"]
+    with patch("src.services.news_service.fetch_news", flaky):
+        with pytest.raises(HttpError):
+            asyncio.run(news_service.poll_once())
+
+
+def test_validate_news_keeps_items_at_the_datetime_checkpoint(news_service: NewsService):
+    """Test that company news published in the checkpoint's second is not lost."""
+
+    async def run():
+        first = [{"id": 1, "datetime": 100, "headline": "a"}]
+        await news_service.validate_news(first, "finnhub_company_NVDA", 0, key="datetime")
+        # Item 2 shares item 1's timestamp but only shows up on the next poll.
+        later = first + [{"id": 2, "datetime": 100, "headline": "b"}]
+        return await news_service.validate_news(
+            later, "finnhub_company_NVDA", 100, key="datetime"
+        )
+
+    assert [n["id"] for n in asyncio.run(run())] == [2]
+
+
+def test_checkpoint_only_moves_forward(news_service: NewsService):
+    """Test that a stale or unchanged batch leaves the stored checkpoint alone."""
+    repo = news_service.news_checkpoint_repo
+    writes = []
+    update = repo.update_last_id
+
+    async def counting_update(source_name, last_id):
+        writes.append((source_name, last_id))
+        await update(source_name, last_id)
+
+    repo.update_last_id = counting_update
+
+    async def run():
+        source = "finnhub_company_NVDA"
+        await news_service.validate_news(
+            [{"id": 2, "datetime": 200, "headline": "b"}], source, 0, key="datetime"
+        )
+        # Re-polled with no new items, then a batch that finished out of order.
+        await news_service.validate_news(
+            [{"id": 2, "datetime": 200, "headline": "b"}], source, 200, key="datetime"
+        )
+        await news_service.validate_news(
+            [{"id": 1, "datetime": 100, "headline": "a"}], source, 0, key="datetime"
+        )
+
+    asyncio.run(run())
+    assert writes == [("finnhub_company_NVDA", "200")]
+    assert repo.checkpoints["finnhub_company_NVDA"] == "200"
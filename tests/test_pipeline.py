@@ -0,0 +1,74 @@
+"""
+Testing the staged ingestion Pipeline
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.pipeline import Batch, Pipeline
+
+
+def test_slow_stage_applies_backpressure():
+    """Test that a slow last stage blocks submit once the queues are full."""
+    delivered = []
+
+    async def double(batch):
+        batch.items = [i * 2 for i in batch.items]
+        return batch
+
+    async def drop_empty(batch):
+        batch.items = [i for i in batch.items if i]
+        return batch
+
+    async def slow_deliver(batch):
+        await asyncio.sleep(0.02)
+        delivered.extend(batch.items)
+        return batch
+
+    async def scenario():
+        pipeline = Pipeline(
+            "test",
+            [("double", double, 2), ("filter", drop_empty, 1), ("deliver", slow_deliver, 1)],
+            queue_size=1,
+        )
+        workers = asyncio.ensure_future(pipeline.run_async())
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for i in range(12):
+            await pipeline.submit(Batch("src", [i]))
+        submit_time = loop.time() - started
+        await pipeline.drain()
+        workers.cancel()
+        return pipeline.stats(), submit_time
+
+    stats, submit_time = asyncio.run(scenario())
+    assert sorted(delivered) == [i * 2 for i in range(1, 12)]
+    # Queues and workers hold 8 batches, so the last few submits waited on delivery.
+    assert submit_time > 0.04
+    stages = {s["stage"]: s for s in stats["stages"]}
+    assert stages["double"]["batches"] == 12
+    assert stages["filter"]["passed"] == 11
+    assert stages["deliver"]["avg_latency"] >= 0.02
+    assert stats["completed"] == 11
+
+
+def test_stage_error_drops_batch_and_is_counted():
+    """Test that a failing handler drops only its batch."""
+
+    async def explode(batch):
+        if batch.source == "bad":
+            raise ValueError("boom")
+        return batch
+
+    async def scenario():
+        pipeline = Pipeline("test", [("explode", explode, 1)])
+        bad = await pipeline.process(Batch("bad", [1]))
+        good = await pipeline.process(Batch("good", [2]))
+        return pipeline.stats(), bad, good
+
+    stats, bad, good = asyncio.run(scenario())
+    assert (bad, good) == ([], [2])
+    assert stats["stages"][0]["errors"] == 1
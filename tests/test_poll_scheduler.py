@@ -0,0 +1,66 @@
+"""
+Testing the adaptive PollScheduler
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utilities.poll_scheduler import PollScheduler, PollSource
+
+
+def make_source(**kwargs) -> PollSource:
+    async def poll():
+        return 0
+
+    options = {"interval": 30, "min_interval": 10, "max_interval": 300, **kwargs}
+    return PollSource("feed", poll, **options)
+
+
+def test_interval_adapts_within_bounds():
+    """Test speed-up on new items, back-off when quiet, doubling on failures."""
+    scheduler = PollScheduler(speedup=2, backoff=1.5)
+    source = make_source()
+
+    scheduler.adapt(source, 4)
+    assert source.interval == 15
+    scheduler.adapt(source, 4)
+    assert source.interval == 10  # clamped to min_interval
+    scheduler.adapt(source, 0)
+    assert source.interval == 15
+
+    for expected in (60, 120, 240, 300):
+        scheduler.adapt(source, None)
+        assert source.interval == expected
+    assert source.failures == 4
+    scheduler.adapt(source, 1)
+    assert source.failures == 0
+    assert source.interval == 150
+
+
+def test_ticks_are_fixed_rate():
+    """Test that poll latency does not stretch the period and failures are survived."""
+    calls = []
+
+    async def poll():
+        calls.append(asyncio.get_running_loop().time())
+        await asyncio.sleep(0.03)
+        if len(calls) == 2:
+            raise RuntimeError("upstream down")
+        if len(calls) == 4:
+            scheduler.stop()
+        return 1
+
+    scheduler = PollScheduler(speedup=1, jitter=0)
+    scheduler.add("feed", poll, interval=0.05, min_interval=0.05, max_interval=0.1)
+    asyncio.run(scheduler.run_async(report_interval=None))
+
+    gaps = [b - a for a, b in zip(calls, calls[1:])]
+    # One 0.05s tick despite 0.03s of work, then 0.1s once the failure doubled it.
+    assert abs(gaps[0] - 0.05) < 0.015
+    assert abs(gaps[1] - 0.1) < 0.015
+    cadence = scheduler.cadence()[0]
+    assert cadence["runs"] == 4
+    assert cadence["failures"] == 0
@@ -0,0 +1,98 @@
+"""
+Testing the on-demand CPU and memory profiler
+"""
+
+import sys
+import asyncio
+import pstats
+import time
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utilities.profiler import Profiler, ProfilerBusy
+
+
+async def _busy_loop(seconds):
+    """Keep the event loop thread busy in small steps."""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        _spin()
+        await asyncio.sleep(0)
+
+
+def _spin():
+    total = 0
+    for i in range(20_000):
+        total += i * i
+    return total
+
+
+def test_sampled_cpu_profile_writes_collapsed_stacks(tmp_path):
+    """Test that the sampler records the hot function on the loop thread."""
+    profiler = Profiler(output_dir=str(tmp_path))
+
+    async def run():
+        busy = asyncio.create_task(_busy_loop(0.5))
+        paths = await profiler.profile_cpu(0.3)
+        await busy
+        return paths
+
+    [path] = asyncio.run(run())
+    lines = Path(path).read_text().splitlines()
+    assert lines
+    assert any("_spin (test_profiler.py" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0 and ";" in stack
+
+
+def test_cprofile_mode_writes_pstats(tmp_path):
+    """Test that cprofile mode writes a loadable pstats file and a summary."""
+    profiler = Profiler(output_dir=str(tmp_path))
+
+    async def run():
+        busy = asyncio.create_task(_busy_loop(0.3))
+        paths = await profiler.profile_cpu(0.2, mode="cprofile")
+        await busy
+        return paths
+
+    stats_path, summary_path = asyncio.run(run())
+    functions = {name for _, _, name in pstats.Stats(stats_path).stats}
+    assert "_spin" in functions
+    assert "cumulative" in Path(summary_path).read_text()
+
+
+def test_memory_profile_reports_growth(tmp_path):
+    """Test that allocations kept during the window show up as top allocators."""
+    profiler = Profiler(output_dir=str(tmp_path))
+    kept = []
+
+    async def allocate():
+        await asyncio.sleep(0.05)
+        kept.append([str(i) * 10 for i in range(20_000)])
+
+    async def run():
+        task = asyncio.create_task(allocate())
+        paths = await profiler.profile_memory(0.2)
+        await task
+        return paths
+
+    report, snapshot = asyncio.run(run())
+    text = Path(report).read_text()
+    assert "test_profiler.py" in text
+    assert Path(snapshot).stat().st_size > 0
+
+
+def test_one_profile_per_kind(tmp_path):
+    """Test that a second CPU profile is refused while one runs."""
+    profiler = Profiler(output_dir=str(tmp_path))
+
+    async def run():
+        first = asyncio.create_task(profiler.profile_cpu(0.2))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ProfilerBusy):
+            await profiler.profile_cpu(0.2)
+        await first
+
+    asyncio.run(run())
@@ -0,0 +1,121 @@
+"""
+Testing the RedditService pagination and feeds
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from unittest.mock import patch
+from src.api.http_client import HttpError
+from src.services.reddit_service import RedditService, parse_feeds
+
+
+class FakeReddit:
+    """Serves ``posts`` (newest first) in pages, like Reddit's listings."""
+
+    def __init__(self, posts, fail_after=None):
+        self.posts = posts
+        self.fail_after = fail_after
+        self.requests = []
+
+    async def __call__(self, subreddit, flair=None, limit=100, after=None, before=None):
+        self.requests.append((subreddit, flair, after))
+        if after is not None and after == self.fail_after:
+            raise HttpError("HTTP 503 from reddit", 503)
+        start = 0
+        if after:
+            start = next(i for i, p in enumerate(self.posts) if p["name"] == after) + 1
+        page = [dict(p) for p in self.posts[start:start + limit]]
+        more = start + limit < len(self.posts)
+        return page, page[-1]["name"] if more else None
+
+
+class FakeParser:
+    async def extract_companies_batch_async(self, texts):
+        return [["NVDA"] if "nvidia" in t.lower() else [] for t in texts]
+
+
+def make_posts(count, newest=1000):
+    return [
+        {"id": str(i), "name": f"t3_{i}", "created_utc": newest - i, "title": f"Post {i}"}
+        for i in range(count)
+    ]
+
+
+def make_service(checkpoint_repo, bot, checkpoints, **kwargs):
+    checkpoint_repo.checkpoints.update(checkpoints)
+    return RedditService(
+        db=None, discord_bot=bot, page_size=3, checkpoints=checkpoint_repo, **kwargs
+    )
+
+
+def test_pages_back_to_checkpoint(checkpoint_repo, bot):
+    """Test that more than a page of new posts is delivered, oldest first."""
+    reddit = FakeReddit(make_posts(10))
+    service = make_service(checkpoint_repo, bot, {"reddit_wsb": "993"})  # posts 0..6 are newer
+
+    with patch("src.services.reddit_service.fetch_posts", reddit):
+        batches = asyncio.run(service.fetch_batches())
+
+    assert [p["id"] for p in batches[0].items] == ["6", "5", "4", "3", "2", "1", "0"]
+    assert [r[2] for r in reddit.requests] == [None, "t3_2", "t3_5"]
+    assert service.checkpoint_repo.checkpoints["reddit_wsb"] == "1000"
+
+
+def test_feeds_have_own_checkpoints_and_tickers(checkpoint_repo, bot):
+    """Test per-feed checkpoints, cross-feed dedupe and tickers in the messages."""
+    posts = make_posts(2)
+    posts[0]["title"] = "Nvidia to the moon"
+    reddit = FakeReddit(posts)
+    service = make_service(
+        checkpoint_repo,
+        bot,
+        {"reddit_wsb": "998", "reddit_stocks": "999"},
+        feeds=parse_feeds("wallstreetbets:DD, stocks"),
+        company_parser=FakeParser(),
+    )
+
+    async def poll():
+        delivered = []
+        for batch in await service.fetch_batches():
+            delivered.extend(await service.pipeline.process(batch))
+        return delivered
+
+    with patch("src.services.reddit_service.fetch_posts", reddit):
+        delivered = asyncio.run(poll())
+
+    assert {(r[0], r[1]) for r in reddit.requests} == {
+        ("wallstreetbets", "DD"), ("stocks", None)
+    }
+    assert [(p["id"], p["feed"], p["companies"]) for p in delivered] == [
+        ("1", "r/wallstreetbets DD", []),
+        ("0", "r/wallstreetbets DD", ["NVDA"]),
+    ]
+    assert bot.messages[1][0].startswith(
+        "New post (r/wallstreetbets DD): Nvidia to the moon (NVDA)"
+    )
+    assert service.checkpoint_repo.checkpoints == {
+        "reddit_wsb": "1000", "reddit_stocks": "1000"
+    }
+
+
+def test_failed_page_keeps_checkpoint(checkpoint_repo, bot):
+    """Test that a failing middle page delivers nothing and leaves the checkpoint."""
+    reddit = FakeReddit(make_posts(10), fail_after="t3_2")
+    service = make_service(checkpoint_repo, bot, {"reddit_wsb": "993"})
+
+    with patch("src.services.reddit_service.fetch_posts", reddit):
+        with pytest.raises(HttpError):
+            asyncio.run(service.fetch_batches())
+    assert service.checkpoint_repo.checkpoints["reddit_wsb"] == "993"
+
+    # Once Reddit recovers the next poll delivers every post, none skipped.
+    reddit.fail_after = None
+    with patch("src.services.reddit_service.fetch_posts", reddit):
+        batches = asyncio.run(service.fetch_batches())
+    assert [p["id"] for p in batches[0].items] == ["6", "5", "4", "3", "2", "1", "0"]
+    assert service.checkpoint_repo.checkpoints["reddit_wsb"] == "1000"
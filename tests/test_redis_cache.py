@@ -0,0 +1,102 @@
+"""
+Testing the synchronous RedisCache batch APIs against an in-memory Redis
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from unittest.mock import patch
+from src.cache.local_cache import LocalCache
+from src.cache.redis_cache import RedisCache
+
+
+@pytest.fixture
+def server():
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeServer()
+
+
+def make_cache(server, local_cache=None) -> RedisCache:
+    import fakeredis
+
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    with patch("src.cache.redis_cache.redis.Redis", return_value=client):
+        return RedisCache(namespace="test", seen_mode="zset", local_cache=local_cache)
+
+
+def test_seen_many_round_trip(server):
+    """Test that marks are visible to another client and only L1 misses go to Redis."""
+    writer = make_cache(server, LocalCache())
+    reader = make_cache(server)
+
+    assert writer.is_seen_many([1, 2, 3]) == [False, False, False]
+    writer.mark_seen_many([1, 3])
+    writer.mark_seen_many([])
+    assert reader.is_seen_many([1, 2, 3]) == [True, False, True]
+    assert reader.is_seen(3) and not reader.is_seen(4)
+
+    with patch.object(writer.client, "pipeline") as pipeline:
+        assert writer.is_seen_many([1, 3]) == [True, True]
+    pipeline.assert_not_called()
+
+
+def test_get_and_set_many(server):
+    """Test MGET-backed reads with missing keys and namespaced storage."""
+    writer = make_cache(server)
+    reader = make_cache(server, LocalCache())
+
+    writer.set_many({"a": "1", "b": "2"})
+    writer.set("c", "3")
+    assert reader.get_many(["a", "missing", "c"]) == ["1", None, "3"]
+    assert reader.get("b") == "2"
+    assert sorted(writer.client.keys()) == ["test:a", "test:b", "test:c"]
+
+    # Values are now in reader's L1 and are served without an MGET.
+    with patch.object(reader.client, "mget") as mget:
+        assert reader.get_many(["a", "c"]) == ["1", "3"]
+    mget.assert_not_called()
+
+
+def test_set_many_uses_mset_only_without_expiry(server):
+    """Test the MSET path when ``ex`` is None and the per-key SET EX pipeline otherwise."""
+    cache = make_cache(server)
+
+    with patch.object(cache.client, "mset", wraps=cache.client.mset) as mset:
+        cache.set_many({"plain": "1"})
+        mset.assert_called_once()
+        cache.set_many({"expiring": "2", "other": "3"}, ex=60)
+        mset.assert_called_once()
+
+    assert cache.client.ttl("test:plain") == -1
+    assert 0 < cache.client.ttl("test:expiring") <= 60
+    assert 0 < cache.client.ttl("test:other") <= 60
+    assert cache.get_many(["plain", "expiring", "other"]) == ["1", "2", "3"]
+
+
+def test_redis_outage_falls_back_to_local_cache(server):
+    """Test that batch calls survive a dropped connection and L1 keeps answering."""
+    cache = make_cache(server, LocalCache())
+    server.connected = False
+
+    cache.mark_seen_many([1])
+    cache.set_many({"k": "v"}, ex=60)
+    assert cache.is_seen_many([1, 2]) == [True, False]
+    assert cache.get_many(["k", "missing"]) == ["v", None]
+
+
+def test_legacy_seen_set_is_dropped_on_connect(server):
+    """Test that the unbounded SET of older releases is removed, the new index kept."""
+    import fakeredis
+
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    client.sadd("test:seen", *range(1000))
+
+    cache = make_cache(server)
+    cache.mark_seen_many([1])
+    make_cache(server)
+
+    assert not client.exists("test:seen")
+    assert cache.is_seen_many([1, 2]) == [True, False]
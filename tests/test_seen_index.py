@@ -0,0 +1,100 @@
+"""
+Testing the sorted-set and Bloom seen indexes against a Redis stand-in
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from unittest.mock import patch
+from src.cache.seen_index import BloomSeenIndex, SortedSetSeenIndex, build_seen_index
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+def contains(client, index, keys):
+    pipe = client.pipeline()
+    index.queue_contains(pipe, keys)
+    return index.parse_contains(pipe.execute(), keys)
+
+
+def add(client, index, keys):
+    pipe = client.pipeline()
+    index.queue_add(pipe, keys)
+    pipe.execute()
+
+
+@pytest.fixture
+def fake_client():
+    """In-memory Redis; enough for the sorted-set index."""
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+
+
+@pytest.fixture(scope="module")
+def lua_client(tmp_path_factory):
+    """A real embedded Redis server, needed to run the Bloom index's Lua scripts."""
+    redislite = pytest.importorskip("redislite")
+    client = redislite.Redis(str(tmp_path_factory.mktemp("redis") / "seen.db"))
+    yield client
+    client.shutdown()
+
+
+def test_zset_index_expires_and_trims_past_retention(fake_client):
+    """Test that marks expire after ``retention`` and old members are trimmed on add."""
+    clock = FakeClock()
+    index = build_seen_index("zset", "news:seen", retention=60)
+    assert isinstance(index, SortedSetSeenIndex)
+
+    with patch("src.cache.seen_index.time", clock):
+        add(fake_client, index, [1, 2])
+        assert contains(fake_client, index, [1, 2, 3]) == [True, True, False]
+
+        clock.now += 30
+        add(fake_client, index, [3])
+        assert contains(fake_client, index, [1, 3]) == [True, True]
+
+        # 1 and 2 are now past retention: unseen even before they are trimmed.
+        clock.now += 31
+        assert contains(fake_client, index, [1, 2, 3]) == [False, False, True]
+        add(fake_client, index, [4])
+
+    assert fake_client.zrange("news:seen:z", 0, -1) == ["3", "4"]
+    assert 0 < fake_client.ttl("news:seen:z") <= 60
+
+
+def test_bloom_index_remembers_for_one_to_two_buckets(lua_client):
+    """Test that Bloom marks survive into the next bucket and are gone after that."""
+    clock = FakeClock(now=60 * 1000)
+    index = build_seen_index("bloom", "news:seen", retention=60, capacity=10_000)
+    assert isinstance(index, BloomSeenIndex)
+    marked = [f"id-{i}" for i in range(1000)]
+    unmarked = [f"other-{i}" for i in range(1000)]
+
+    with patch("src.cache.seen_index.time", clock):
+        add(lua_client, index, marked)
+        # No false negatives, and false positives near the error rate.
+        assert all(contains(lua_client, index, marked))
+        assert sum(contains(lua_client, index, unmarked)) <= 10
+
+        clock.now += 90  # next bucket: the previous one is still checked
+        assert all(contains(lua_client, index, marked))
+
+        clock.now += 60  # two buckets later: forgotten
+        assert not any(contains(lua_client, index, marked))
+
+    ttl = lua_client.ttl(f"news:seen:bloom:{60 * 1000 // 60}")
+    assert 0 < ttl <= 120
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        build_seen_index("hyperloglog", "news:seen", retention=60)
@@ -0,0 +1,151 @@
+"""
+Testing the SubscriberRegistry class
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from unittest.mock import AsyncMock
+from src.services.subscriber_registry import SubscriberRegistry
+
+
+@pytest.fixture
+def repo() -> AsyncMock:
+    """Return a mocked SubscriberRepository."""
+    mock_repo = AsyncMock()
+    mock_repo.get_all.return_value = [1, 2]
+    return mock_repo
+
+
+def test_get_all_does_not_query_after_load(repo: AsyncMock):
+    """Test that reads are served from memory once loaded."""
+    registry = SubscriberRegistry(repo)
+    asyncio.run(registry.load())
+    registry.get_all()
+    registry.get_all()
+    assert repo.get_all.call_count == 1
+    assert sorted(registry.get_all()) == [1, 2]
+
+
+def test_add_and_remove_update_in_place(repo: AsyncMock):
+    """Test that add/remove persist and update the in-memory set."""
+    registry = SubscriberRegistry(repo)
+
+    async def run():
+        await registry.load()
+        await registry.add(3)
+        await registry.add(3)
+        await registry.remove(1)
+
+    asyncio.run(run())
+    repo.add.assert_awaited_once_with(3)
+    repo.remove.assert_awaited_once_with(1)
+    assert 3 in registry
+    assert 1 not in registry
+    assert sorted(registry.get_all()) == [2, 3]
+
+
+def test_follow_routes_only_to_matching_users(repo: AsyncMock):
+    """Test the ticker index: followers get their tickers, others get everything."""
+    ticker_repo = AsyncMock()
+    # User 9 unsubscribed but still has a row in SubscriberTickers.
+    ticker_repo.get_all.return_value = [(1, "NVDA"), (9, "NVDA")]
+    registry = SubscriberRegistry(repo, ticker_repo=ticker_repo)
+
+    async def run():
+        await registry.load()
+        assert registry.route(["NVDA"]) == {1, 2}
+        assert registry.route(["AAPL"]) == {2}
+
+        await registry.follow(2, "aapl")
+        with pytest.raises(ValueError):
+            await registry.follow(3, "AAPL")
+        await registry.add(3)
+        await registry.follow(3, "AAPL")
+        assert registry.route(["AAPL"]) == {2, 3}
+        assert registry.route(["TSLA"]) == set()
+        assert registry.follower_count("AAPL") == 2
+
+        await registry.unfollow(2, "AAPL")
+        assert registry.route(["TSLA"]) == {2}
+        await registry.remove(1)
+        assert registry.route(["NVDA"]) == {2}
+
+    asyncio.run(run())
+    ticker_repo.follow.assert_any_await(2, "AAPL")
+    ticker_repo.unfollow_all.assert_awaited_once_with(1)
+    assert registry.watchlist(3) == ["AAPL"]
+    assert registry.follower_count("NVDA") == 0
+
+
+def test_changes_during_load_survive_the_reload(repo: AsyncMock):
+    """Test that add/follow/remove made while load() awaits the tables are kept."""
+    ticker_repo = AsyncMock()
+    ticker_repo.get_all.return_value = [(1, "NVDA")]
+    registry = SubscriberRegistry(repo, ticker_repo=ticker_repo)
+
+    async def run():
+        await registry.load()
+        release = asyncio.Event()
+
+        async def stale_snapshot():
+            # Read before the changes below reach the database.
+            await release.wait()
+            return [1, 2]
+
+        repo.get_all.side_effect = stale_snapshot
+        reload = asyncio.create_task(registry.load())
+        await asyncio.sleep(0)
+
+        await registry.add(3)
+        await registry.follow(3, "AAPL")
+        await registry.unfollow(1, "NVDA")
+        await registry.remove(2)
+        release.set()
+        await reload
+
+    asyncio.run(run())
+    assert sorted(registry.get_all()) == [1, 3]
+    assert registry.route(["AAPL"]) == {1, 3}
+    assert registry.route(["NVDA"]) == {1}
+    assert registry.watchlist(3) == ["AAPL"]
+
+
+def test_remove_before_load_deletes_watchlist(repo: AsyncMock):
+    """Test that followed tickers are deleted even when they are not in memory yet."""
+    ticker_repo = AsyncMock()
+    registry = SubscriberRegistry(repo, ticker_repo=ticker_repo)
+    asyncio.run(registry.remove(7))
+    ticker_repo.unfollow_all.assert_awaited_once_with(7)
+
+
+def test_concurrent_adds_insert_once(repo: AsyncMock):
+    """Test that two adds racing on the same user write one row; a failed insert is undone."""
+    registry = SubscriberRegistry(repo)
+
+    async def run():
+        await registry.load()
+        await asyncio.gather(registry.add(3), registry.add(3))
+        repo.add.side_effect = RuntimeError("database down")
+        with pytest.raises(RuntimeError):
+            await registry.add(4)
+
+    asyncio.run(run())
+    repo.add.assert_any_await(3)
+    assert repo.add.await_count == 2  # once for 3, once for the failed 4
+    assert 3 in registry and 4 not in registry
+    assert registry.route([]) == {1, 2, 3}
+
+
+def test_split_mentions_respects_message_limit():
+    """Test that large recipient lists are split into messages Discord accepts."""
+    from src.services.discord_bot_service import MAX_MESSAGE_LENGTH, split_mentions
+
+    messages = split_mentions(range(10**17, 10**17 + 300), "**Headline**")
+    assert len(messages) > 1
+    assert all(len(m) <= MAX_MESSAGE_LENGTH for m in messages)
+    assert sum(m.count("<@") for m in messages) == 300
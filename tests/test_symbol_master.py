@@ -0,0 +1,57 @@
+"""
+Testing the streaming symbol master loader
+"""
+
+import sys
+import asyncio
+import json
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.datalayer.seed.symbol_master import iter_symbol_master, load_symbol_master
+from src.services.company_parser_service import CompanyParserService
+
+
+class FakeCompanyRepository:
+    def __init__(self):
+        self.batches = []
+
+    async def bulk_upsert(self, companies):
+        self.batches.append(companies)
+        return {"inserted": len(companies), "updated": 0}
+
+
+def test_csv_rows_are_chunked_with_aliases(tmp_path):
+    """Test that names and aliases become rows, yielded in bounded chunks."""
+    path = tmp_path / "symbols.csv"
+    path.write_text(
+        "ticker,name,aliases\n"
+        "aapl,Apple Inc.,Apple|iPhone maker\n"
+        ",Missing Ticker,\n"
+        "TSLA,\"Tesla, Inc.\",\n"
+    )
+    chunks = list(iter_symbol_master(str(path), chunk_size=2))
+    assert chunks == [
+        [("Apple Inc.", "AAPL"), ("Apple", "AAPL"), ("iPhone maker", "AAPL")],
+        [("Tesla, Inc.", "TSLA")],
+    ]
+
+
+def test_jsonl_load_into_repo_and_parser(tmp_path):
+    """Test that a JSONL master reaches both the repository and the parser."""
+    path = tmp_path / "symbols.jsonl"
+    lines = [
+        json.dumps({"symbol": "MSFT", "company_name": "Microsoft", "aliases": ["Redmond"]}),
+        "not json",
+        json.dumps({"ticker": "NVDA", "name": "Nvidia"}),
+    ]
+    path.write_text("\n".join(lines) + "\n")
+
+    repo = FakeCompanyRepository()
+    parser = CompanyParserService(db=None, index_path=str(tmp_path / "index.pkl"))
+    totals = asyncio.run(load_symbol_master(str(path), repo, parser, chunk_size=2))
+
+    assert totals == {"rows": 3, "inserted": 3, "updated": 0}
+    assert repo.batches == [{"Microsoft": "MSFT", "Redmond": "MSFT"}, {"Nvidia": "NVDA"}]
+    assert parser.extract_companies("Redmond and Nvidia") == ["MSFT", "NVDA"]
@@ -0,0 +1,54 @@
+"""
+Testing the TokenBucket rate limiter
+"""
+
+import sys
+import asyncio
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utilities.token_bucket import TokenBucket
+
+
+def test_burst_then_steady_rate():
+    """Test that a full bucket serves its capacity at once, then ``rate`` per second."""
+    bucket = TokenBucket(rate=50, capacity=3)
+
+    async def run():
+        started = time.monotonic()
+        stamps = []
+        for _ in range(6):
+            await bucket.acquire()
+            stamps.append(time.monotonic() - started)
+        return stamps
+
+    stamps = asyncio.run(run())
+    assert stamps[2] < 0.015
+    # Three more tokens at 50/s take at least 60 ms.
+    assert stamps[5] >= 0.055
+
+
+def test_waiters_are_served_in_order():
+    """Test that concurrent callers get tokens in the order they asked."""
+    bucket = TokenBucket(rate=100, capacity=1)
+    order = []
+
+    async def take(i):
+        await bucket.acquire()
+        order.append(i)
+
+    async def run():
+        await asyncio.gather(*(take(i) for i in range(5)))
+
+    asyncio.run(run())
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_per_minute_and_default_capacity():
+    """Test the per-minute constructor and the one-second default burst."""
+    bucket = TokenBucket.per_minute(120)
+    assert bucket.rate == 2
+    assert bucket.capacity == 2
+    assert TokenBucket(0.5).capacity == 1